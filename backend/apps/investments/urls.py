@@ -8,11 +8,13 @@ from .views import (
     InvestmentDetailView,
     InvestmentCreateView,
     InvestmentProjectionView,
+    InvestmentExportView,
 )
 
 urlpatterns = [
     path('', InvestmentListView.as_view(), name='investment_list'),
     path('create/', InvestmentCreateView.as_view(), name='investment_create'),
+    path('export/', InvestmentExportView.as_view(), name='investment_export'),
     path('<uuid:pk>/', InvestmentDetailView.as_view(), name='investment_detail'),
     path('<uuid:pk>/projection/', InvestmentProjectionView.as_view(), name='investment_projection'),
 ]
@@ -1,10 +1,12 @@
 """
 Investment views for SomosRentable API.
 """
+from django.core.exceptions import ValidationError
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from core.exports import streaming_export, queryset_rows
 from .models import Investment
 from .serializers import (
     InvestmentSerializer,
@@ -13,6 +15,7 @@ from .serializers import (
 )
 from apps.projects.models import Project
 from apps.users.models import User
+from apps.users.views import IsAdmin
 
 
 class InvestorPermission(permissions.BasePermission):
@@ -122,3 +125,55 @@ class InvestmentProjectionView(APIView):
             )
 
         return Response(investment.get_projection())
+
+
+class InvestmentExportView(APIView):
+    """
+    Exportar inversiones en streaming (admin).
+    Filtros: ?status=, ?project=, ?user=; formato ?output=csv|ndjson.
+    """
+    permission_classes = [IsAdmin]
+
+    EXPORT_FIELDS = (
+        ('id', 'id'),
+        ('investor_email', 'user__email'),
+        ('project_id', 'project_id'),
+        ('project_title', 'project__title'),
+        ('amount', 'amount'),
+        ('status', 'status'),
+        ('annual_return_rate', 'annual_return_rate_snapshot'),
+        ('duration_months', 'duration_months_snapshot'),
+        ('expected_return', 'expected_return'),
+        ('actual_return', 'actual_return'),
+        ('activated_at', 'activated_at'),
+        ('expected_end_date', 'expected_end_date'),
+        ('created_at', 'created_at'),
+    )
+
+    def get_queryset(self):
+        queryset = Investment.objects.all()
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+
+        project = self.request.query_params.get('project')
+        if project:
+            queryset = queryset.filter(project_id=project)
+
+        user = self.request.query_params.get('user')
+        if user:
+            queryset = queryset.filter(user_id=user)
+
+        return queryset.order_by('-created_at')
+
+    def get(self, request):
+        columns, fields = zip(*self.EXPORT_FIELDS)
+        try:
+            rows = queryset_rows(self.get_queryset(), fields)
+            return streaming_export(request, 'inversiones', columns, rows)
+        except ValidationError:
+            return Response(
+                {'error': 'Filtro inválido.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
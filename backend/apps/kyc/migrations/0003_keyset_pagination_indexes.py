@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:32
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('kyc', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='kycsubmission',
+            index=models.Index(fields=['created_at', 'id'], name='kyc_submissions_keyset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='kycsubmission',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='kyc_status_keyset_idx'),
+        ),
+    ]
@@ -77,6 +77,11 @@ class KYCSubmission(BaseModel):
         verbose_name = 'Solicitud KYC'
         verbose_name_plural = 'Solicitudes KYC'
         ordering = ['-created_at']
+        indexes = [
+            # Paginación por cursor (core.pagination)
+            models.Index(fields=['created_at', 'id'], name='kyc_submissions_keyset_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='kyc_status_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"KYC - {self.user.email} - {self.get_status_display()}"
@@ -2,6 +2,7 @@
 KYC Service - Lógica de negocio para verificación KYC.
 """
 import random
+from django.db import transaction
 from django.utils import timezone
 
 
@@ -26,6 +27,7 @@ class KYCService:
             bool: True si aprobado, False si rechazado
         """
         from apps.kyc.models import KYCSubmission
+        from apps.statistics.events import EventLogService
 
         # Simular verificación con probabilidad 80/20
         is_approved = random.random() < cls.APPROVAL_PROBABILITY
@@ -33,22 +35,53 @@ class KYCService:
         submission.auto_processed = True
         submission.reviewed_at = timezone.now()
 
-        if is_approved:
-            submission.status = KYCSubmission.Status.APPROVED
-            # Marcar usuario como verificado
-            submission.user.is_kyc_verified = True
-            submission.user.save()
-        else:
-            submission.status = KYCSubmission.Status.REJECTED
-            submission.rejection_reason = (
-                "La verificación automática no pudo confirmar su identidad. "
-                "Por favor, intente nuevamente con una foto más clara de su documento."
-            )
-
-        submission.save()
+        with transaction.atomic():
+            if is_approved:
+                submission.status = KYCSubmission.Status.APPROVED
+                # Marcar usuario como verificado
+                cls._verify_user(submission)
+            else:
+                submission.status = KYCSubmission.Status.REJECTED
+                submission.rejection_reason = (
+                    "La verificación automática no pudo confirmar su identidad. "
+                    "Por favor, intente nuevamente con una foto más clara de su documento."
+                )
+                EventLogService.record(
+                    EventLogService.KYC_REJECTED,
+                    submission,
+                    {'user_id': str(submission.user_id), 'auto_processed': True},
+                    submission.reviewed_at
+                )
+
+            submission.save()
 
         return is_approved
 
+    @classmethod
+    def _verify_user(cls, submission):
+        """
+        Marca al usuario como verificado. El evento kyc.approved solo se
+        registra cuando el usuario pasa de no verificado a verificado.
+        """
+        from apps.statistics.events import EventLogService
+
+        user = submission.user
+        newly_verified = not user.is_kyc_verified
+        user.is_kyc_verified = True
+        user.save()
+
+        if newly_verified:
+            EventLogService.record(
+                EventLogService.KYC_APPROVED,
+                user,
+                {
+                    'user_id': str(user.id),
+                    'submission_id': str(submission.id),
+                    'auto_processed': submission.auto_processed,
+                },
+                submission.reviewed_at
+            )
+
     @classmethod
     def can_submit_kyc(cls, user):
         """
@@ -88,15 +121,15 @@ class KYCService:
         """
         from apps.kyc.models import KYCSubmission
 
-        submission.status = KYCSubmission.Status.APPROVED
-        submission.reviewed_by = reviewer
-        submission.reviewed_at = timezone.now()
-        submission.auto_processed = False
-        submission.save()
+        with transaction.atomic():
+            submission.status = KYCSubmission.Status.APPROVED
+            submission.reviewed_by = reviewer
+            submission.reviewed_at = timezone.now()
+            submission.auto_processed = False
+            submission.save()
 
-        # Marcar usuario como verificado
-        submission.user.is_kyc_verified = True
-        submission.user.save()
+            # Marcar usuario como verificado
+            cls._verify_user(submission)
 
     @classmethod
     def manual_reject(cls, submission, reviewer, reason):
@@ -109,10 +142,19 @@ class KYCService:
             reason: Razón del rechazo
         """
         from apps.kyc.models import KYCSubmission
+        from apps.statistics.events import EventLogService
 
-        submission.status = KYCSubmission.Status.REJECTED
-        submission.reviewed_by = reviewer
-        submission.reviewed_at = timezone.now()
-        submission.rejection_reason = reason
-        submission.auto_processed = False
-        submission.save()
+        with transaction.atomic():
+            submission.status = KYCSubmission.Status.REJECTED
+            submission.reviewed_by = reviewer
+            submission.reviewed_at = timezone.now()
+            submission.rejection_reason = reason
+            submission.auto_processed = False
+            submission.save()
+
+            EventLogService.record(
+                EventLogService.KYC_REJECTED,
+                submission,
+                {'user_id': str(submission.user_id), 'auto_processed': False},
+                submission.reviewed_at
+            )
@@ -5,6 +5,7 @@ from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from core.pagination import KeysetPagination
 from .models import KYCSubmission
 from .serializers import (
     KYCSubmissionSerializer,
@@ -87,9 +88,11 @@ class KYCSubmitView(generics.CreateAPIView):
 class KYCSubmissionListView(generics.ListAPIView):
     """
     Listar solicitudes KYC (admin/ejecutivo).
+    Paginación por cursor opcional con ?pagination=cursor.
     """
     serializer_class = KYCSubmissionSerializer
     permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = KYCSubmission.objects.select_related('user')
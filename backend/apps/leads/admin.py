@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Lead, LeadInteraction
+from .models import (
+    ExecutiveAssignmentProfile, Lead, LeadInteraction, LeadIntake, WebhookIdempotencyKey
+)
 
 
 class LeadInteractionInline(admin.TabularInline):
@@ -34,3 +36,35 @@ class LeadInteractionAdmin(admin.ModelAdmin):
     list_filter = ('interaction_type', 'created_at')
     search_fields = ('lead__email', 'description')
     raw_id_fields = ('lead', 'executive')
+
+
+@admin.register(LeadIntake)
+class LeadIntakeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'attempts', 'lead', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    readonly_fields = ('payload', 'lead', 'attempts', 'error', 'created_at', 'processed_at')
+    raw_id_fields = ('lead',)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(WebhookIdempotencyKey)
+class WebhookIdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('key', 'endpoint', 'response_status', 'created_at', 'expires_at')
+    list_filter = ('endpoint', 'response_status')
+    search_fields = ('key',)
+    readonly_fields = (
+        'endpoint', 'key', 'request_hash', 'response_status', 'response_body',
+        'created_at', 'expires_at'
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ExecutiveAssignmentProfile)
+class ExecutiveAssignmentProfileAdmin(admin.ModelAdmin):
+    list_display = ('executive', 'capacity_weight', 'sources', 'work_start', 'work_end')
+    search_fields = ('executive__email',)
+    raw_id_fields = ('executive',)
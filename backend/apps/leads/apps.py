@@ -5,3 +5,7 @@ class LeadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.leads'
     verbose_name = 'Leads'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
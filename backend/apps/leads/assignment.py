@@ -0,0 +1,387 @@
+"""
+Estrategias de asignación de leads y plan de despacho en memoria.
+
+El plan (DispatchPlan) es una foto de los ejecutivos activos con su carga
+(User.active_leads_count) y su ExecutiveAssignmentProfile. La estrategia
+ordena a los candidatos en memoria sobre el plan; el plan suma localmente
+los leads que va repartiendo y el contador en la base lo mantienen los
+signals de Lead como siempre.
+
+Como cada proceso tiene su propio plan, la decisión final se toma contra
+la base:
+- Un lead (LeadDispatcher.claim): se bloquean con SELECT ... FOR UPDATE
+  SKIP LOCKED los CANDIDATES mejores del plan y se elige entre los libres
+  con su contador actual. Asignaciones concurrentes de cualquier proceso
+  saltan al ejecutivo bloqueado hasta el commit.
+- Un lote (LeadDispatcher.assign): la carga del plan se actualiza desde
+  la base (una consulta) antes de repartir el lote en memoria.
+
+El plan se reconstruye (una consulta) cuando:
+- cambia la configuración: perfiles de asignación, altas, bajas o cambios
+  de rol de ejecutivos y la reconciliación de contadores incrementan una
+  generación en el cache (compartida entre procesos con Redis);
+- pasa PLAN_TTL desde su construcción, para recoger la carga que cambió
+  por otras vías (leads cerrados, reasignados o repartidos por otro
+  proceso).
+
+La estrategia se elige con LEAD_ASSIGNMENT_STRATEGY (ver STRATEGIES).
+simulate() reproduce leads históricos con una estrategia para comparar
+balance y rendimiento (comando simulate_lead_assignment).
+"""
+import heapq
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+class ExecutiveSlot:
+    """Ejecutivo dentro del plan, con su carga y configuración."""
+
+    __slots__ = ('id', 'load', 'weight', 'sources', 'work_days', 'work_start', 'work_end')
+
+    def __init__(self, id, load, weight=1, sources=(), work_days=(), work_start=None, work_end=None):
+        self.id = id
+        self.load = load
+        self.weight = weight
+        self.sources = frozenset(source.lower() for source in sources)
+        self.work_days = frozenset(work_days)
+        self.work_start = work_start
+        self.work_end = work_end
+
+    def is_working(self, moment):
+        """True si `moment` (aware) cae en su horario laboral."""
+        local = timezone.localtime(moment)
+        if self.work_days and local.weekday() not in self.work_days:
+            return False
+        if self.work_start is None or self.work_end is None:
+            return True
+        now = local.time()
+        if self.work_start <= self.work_end:
+            return self.work_start <= now < self.work_end
+        # Turno que cruza la medianoche
+        return now >= self.work_start or now < self.work_end
+
+    def prefers(self, lead):
+        """True si la fuente o el proveedor del lead está entre sus preferidas."""
+        return bool(self.sources) and (
+            (lead.source or '').lower() in self.sources
+            or (lead.source_detail or '').lower() in self.sources
+        )
+
+
+class AssignmentStrategy:
+    """
+    Estrategia base: entre los candidatos con peso > 0 elige el de menor
+    score(). Las subclases redefinen candidates() y/o score().
+    """
+
+    name = None
+
+    def candidates(self, slots, lead, moment):
+        return slots
+
+    def score(self, slot):
+        return (slot.load, slot.id)
+
+    def choose(self, slots, lead, moment):
+        """
+        Returns:
+            ExecutiveSlot o None si no hay ejecutivos disponibles
+        """
+        available = [slot for slot in slots if slot.weight > 0]
+        return min(self.candidates(available, lead, moment), key=self.score, default=None)
+
+    def rank(self, slots, lead, moment, limit):
+        """
+        Returns:
+            list: Los `limit` mejores ExecutiveSlot, del mejor al peor
+        """
+        available = [slot for slot in slots if slot.weight > 0]
+        return heapq.nsmallest(limit, self.candidates(available, lead, moment), key=self.score)
+
+
+class LeastLoadedStrategy(AssignmentStrategy):
+    """El ejecutivo con menos leads activos (comportamiento histórico)."""
+
+    name = 'least_loaded'
+
+
+class WeightedCapacityStrategy(AssignmentStrategy):
+    """Menor carga relativa a capacity_weight: un peso 2 recibe el doble."""
+
+    name = 'weighted'
+
+    def score(self, slot):
+        return (slot.load / slot.weight, slot.id)
+
+
+class RoutedStrategy(WeightedCapacityStrategy):
+    """
+    Prioriza a los ejecutivos que prefieren la fuente del lead y, entre
+    ellos, a los que están en horario; si ningún candidato cumple una
+    condición, esa condición se ignora. Desempata por carga ponderada.
+    """
+
+    name = 'routed'
+
+    def candidates(self, slots, lead, moment):
+        preferred = [slot for slot in slots if slot.prefers(lead)]
+        pool = preferred or slots
+        working = [slot for slot in pool if slot.is_working(moment)]
+        return working or pool
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (LeastLoadedStrategy, WeightedCapacityStrategy, RoutedStrategy)
+}
+
+
+def get_strategy(name=None):
+    """Instancia la estrategia `name` (por defecto LEAD_ASSIGNMENT_STRATEGY)."""
+    name = name or settings.LEAD_ASSIGNMENT_STRATEGY
+    if name not in STRATEGIES:
+        raise ValueError(f"Estrategia de asignación desconocida: {name}")
+    return STRATEGIES[name]()
+
+
+class DispatchPlan:
+    """Foto de los ejecutivos disponibles para asignar leads."""
+
+    def __init__(self, slots, generation=None, built_at=None):
+        self.slots = list(slots)
+        self.generation = generation
+        self.built_at = built_at if built_at is not None else time.monotonic()
+
+    @classmethod
+    def build(cls, generation=None):
+        """Construye el plan desde la base (una consulta)."""
+        from apps.users.models import User
+
+        executives = User.objects.filter(
+            role=User.Role.EXECUTIVE,
+            is_active=True
+        ).select_related('assignment_profile').order_by('id')
+
+        slots = []
+        for executive in executives:
+            profile = getattr(executive, 'assignment_profile', None)
+            if profile is None:
+                slots.append(ExecutiveSlot(executive.id, executive.active_leads_count))
+            else:
+                slots.append(ExecutiveSlot(
+                    executive.id,
+                    executive.active_leads_count,
+                    weight=profile.capacity_weight,
+                    sources=profile.sources,
+                    work_days=profile.work_days,
+                    work_start=profile.work_start,
+                    work_end=profile.work_end,
+                ))
+        return cls(slots, generation)
+
+    def refresh_loads(self):
+        """Actualiza la carga de cada ejecutivo del plan desde la base (una consulta)."""
+        from apps.users.models import User
+
+        loads = dict(
+            User.objects.filter(pk__in=[slot.id for slot in self.slots]).values_list(
+                'id', 'active_leads_count'
+            )
+        )
+        for slot in self.slots:
+            slot.load = loads.get(slot.id, slot.load)
+
+    def assign(self, lead, strategy, moment=None):
+        """
+        Elige ejecutivo para el lead y suma 1 a su carga en el plan.
+
+        Returns:
+            UUID del ejecutivo o None
+        """
+        slot = strategy.choose(self.slots, lead, moment or timezone.now())
+        if slot is None:
+            return None
+        slot.load += 1
+        return slot.id
+
+
+class LeadDispatcher:
+    """Plan de despacho compartido por el proceso."""
+
+    CACHE_KEY = 'leads:assignment:gen'
+    PLAN_TTL = 30
+    # Mejores candidatos del plan que claim() valida contra la base
+    CANDIDATES = 3
+
+    _plan = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def generation(cls):
+        value = cache.get(cls.CACHE_KEY)
+        if value is None:
+            cache.add(cls.CACHE_KEY, time.time_ns(), timeout=None)
+            value = cache.get(cls.CACHE_KEY)
+        return value
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Fuerza la reconstrucción del plan en todos los procesos, de
+        inmediato y nuevamente al hacer commit.
+        """
+        cls._bump()
+        transaction.on_commit(cls._bump)
+
+    @classmethod
+    def _bump(cls):
+        try:
+            cache.incr(cls.CACHE_KEY)
+        except ValueError:
+            cache.add(cls.CACHE_KEY, time.time_ns(), timeout=None)
+
+    @classmethod
+    def _current_plan(cls):
+        generation = cls.generation()
+        plan = cls._plan
+        if (
+            plan is None
+            or plan.generation != generation
+            or time.monotonic() - plan.built_at > cls.PLAN_TTL
+        ):
+            plan = cls._plan = DispatchPlan.build(generation)
+        return plan
+
+    @classmethod
+    def claim(cls, lead, moment=None):
+        """
+        Elige y bloquea al ejecutivo para un lead. Debe llamarse dentro de
+        la transacción que guarda el lead: el bloqueo dura hasta el commit.
+
+        Entre los CANDIDATES mejores del plan se bloquean los que no estén
+        bloqueados por otra asignación y se elige el mejor según la
+        estrategia con su carga actual en la base. Si todos están
+        bloqueados, se espera al mejor.
+
+        Returns:
+            User: Ejecutivo elegido (bloqueado) o None
+        """
+        from apps.users.models import User
+
+        strategy = get_strategy()
+        moment = moment or timezone.now()
+        with cls._lock:
+            candidates = strategy.rank(cls._current_plan().slots, lead, moment, cls.CANDIDATES)
+        if not candidates:
+            return None
+
+        slots = {slot.id: slot for slot in candidates}
+        executives = User.objects.filter(
+            pk__in=slots, role=User.Role.EXECUTIVE, is_active=True
+        ).order_by('id')
+        locked = list(executives.select_for_update(skip_locked=True))
+        if not locked:
+            locked = list(executives.filter(pk=candidates[0].id).select_for_update())
+        if not locked:
+            return None
+
+        with cls._lock:
+            for executive in locked:
+                slots[executive.id].load = executive.active_leads_count
+            chosen = min((slots[executive.id] for executive in locked), key=strategy.score)
+            chosen.load += 1
+        return next(executive for executive in locked if executive.id == chosen.id)
+
+    @classmethod
+    def assign(cls, leads, moment=None):
+        """
+        Elige ejecutivo para cada lead con la estrategia configurada,
+        partiendo de la carga actual en la base. No guarda los leads.
+
+        Args:
+            leads: Iterable de Lead
+            moment: Instante de la asignación (por defecto ahora)
+
+        Returns:
+            list: UUID del ejecutivo (o None) por lead, en el mismo orden
+        """
+        strategy = get_strategy()
+        moment = moment or timezone.now()
+        with cls._lock:
+            plan = cls._current_plan()
+            plan.refresh_loads()
+            return [plan.assign(lead, strategy, moment) for lead in leads]
+
+
+def simulate(leads, slots, strategy):
+    """
+    Reparte `leads` con `strategy` sobre copias de `slots` con carga 0,
+    usando la fecha de creación de cada lead como instante de asignación.
+    No modela cierres de leads: mide cómo se reparte el flujo entrante.
+
+    Args:
+        leads: Iterable de Lead (o de objetos con source, source_detail
+            y created_at), en orden cronológico
+        slots: ExecutiveSlot del plan (no se modifican)
+        strategy: Instancia de AssignmentStrategy
+
+    Returns:
+        dict: Resultado con las claves strategy, leads, unassigned,
+            seconds, leads_per_second, per_executive (id -> leads),
+            balance (max_min_ratio, stddev, share_error), preferred_hits
+            y off_hours
+    """
+    slots = [
+        ExecutiveSlot(
+            slot.id, 0, slot.weight, slot.sources, slot.work_days,
+            slot.work_start, slot.work_end
+        )
+        for slot in slots
+    ]
+    plan = DispatchPlan(slots)
+    total = unassigned = preferred_hits = off_hours = 0
+
+    started = time.perf_counter()
+    for lead in leads:
+        total += 1
+        slot = strategy.choose(plan.slots, lead, lead.created_at)
+        if slot is None:
+            unassigned += 1
+            continue
+        slot.load += 1
+        if slot.prefers(lead):
+            preferred_hits += 1
+        if not slot.is_working(lead.created_at):
+            off_hours += 1
+    seconds = time.perf_counter() - started
+
+    eligible = [slot for slot in slots if slot.weight > 0]
+    loads = [slot.load for slot in eligible]
+    assigned = sum(loads)
+    total_weight = sum(slot.weight for slot in eligible)
+
+    return {
+        'strategy': strategy.name,
+        'leads': total,
+        'unassigned': unassigned,
+        'seconds': round(seconds, 6),
+        'leads_per_second': round(total / seconds) if seconds else None,
+        'per_executive': {str(slot.id): slot.load for slot in slots},
+        'balance': {
+            # Mayor / menor cantidad de leads entre ejecutivos con peso > 0
+            'max_min_ratio': round(max(loads) / min(loads), 3) if loads and min(loads) else None,
+            'stddev': round(statistics.pstdev(loads), 3) if loads else None,
+            # Máxima diferencia entre la fracción recibida y la que corresponde por peso
+            'share_error': round(max(
+                abs(slot.load / assigned - slot.weight / total_weight) for slot in eligible
+            ), 4) if assigned else None,
+        },
+        'preferred_hits': preferred_hits,
+        'off_hours': off_hours,
+    }
@@ -0,0 +1,154 @@
+"""
+Pre-filtro en memoria de emails de leads existentes.
+
+Un filtro de Bloom con los email_normalized de todos los leads, construido
+al iniciar cada proceso web (config/wsgi.py, en segundo plano) o en su
+primer uso, y alimentado por los signals de creación.
+Si el filtro dice que un email no está, es nuevo para este proceso y se
+omite la búsqueda de duplicados; la restricción única de email_normalized
+(INSERT ... ON CONFLICT) sigue siendo la garantía final, por lo que un
+filtro desactualizado (leads creados por otro proceso) solo hace caer al
+camino lento, nunca crea duplicados.
+
+También las claves de bloqueo con que LeadDeduplicationService busca
+leads de la misma persona: dos leads son candidatos solo si comparten
+clave, por lo que cada lead nuevo se compara con unos pocos por índice y
+no con todos los demás.
+"""
+import re
+import threading
+import unicodedata
+
+from core.bloom import BloomFilter
+
+
+class LeadEmailFilter:
+    """Filtro de Bloom de emails normalizados de leads (por proceso)."""
+
+    ERROR_RATE = 0.01
+    MIN_CAPACITY = 10000
+    # Holgura para las altas posteriores a la construcción
+    GROWTH_FACTOR = 2
+    BATCH_SIZE = 5000
+
+    _filter = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def build(cls):
+        """
+        Construye el filtro a partir de los leads existentes.
+
+        Returns:
+            BloomFilter
+        """
+        from apps.leads.models import Lead
+
+        emails = Lead.objects.exclude(email_normalized__isnull=True)
+        bloom = BloomFilter(
+            capacity=max(cls.MIN_CAPACITY, emails.count() * cls.GROWTH_FACTOR),
+            error_rate=cls.ERROR_RATE
+        )
+        bloom.update(emails.values_list('email_normalized', flat=True).iterator(cls.BATCH_SIZE))
+        return bloom
+
+    @classmethod
+    def _get(cls):
+        bloom = cls._filter
+        if bloom is None or bloom.is_saturated:
+            with cls._lock:
+                bloom = cls._filter
+                if bloom is None or bloom.is_saturated:
+                    bloom = cls._filter = cls.build()
+        return bloom
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Construye el filtro en un thread aparte, para que la primera entrega
+        del webhook no pague la lectura de todos los emails. Las entregas
+        que llegan antes esperan la construcción en curso.
+
+        Returns:
+            Thread iniciado
+        """
+        from django.db import DatabaseError, connection
+
+        def build():
+            try:
+                cls._get()
+            except DatabaseError:
+                # Base aún no disponible o sin migrar: se construye en el primer uso
+                pass
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=build, name='lead-email-filter', daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def might_exist(cls, email_normalized):
+        """False si el email seguro no pertenece a un lead conocido."""
+        return email_normalized in cls._get()
+
+    @classmethod
+    def add(cls, emails):
+        """Agrega emails normalizados (sin efecto si aún no se construyó)."""
+        bloom = cls._filter
+        if bloom is not None:
+            bloom.update(email for email in emails if email not in bloom)
+
+    @classmethod
+    def reset(cls):
+        """Descarta el filtro; se reconstruye en el próximo uso."""
+        with cls._lock:
+            cls._filter = None
+
+
+# Dominios cuyo proveedor ignora los puntos de la parte local
+GMAIL_DOMAINS = ('gmail.com', 'googlemail.com')
+# Dígitos finales del teléfono que se comparan (sin código de país)
+PHONE_KEY_DIGITS = 9
+PHONE_MIN_DIGITS = 8
+
+
+def email_blocking_key(email):
+    """
+    Email canónico de la persona: minúsculas, sin sufijo +etiqueta y, en
+    Gmail, sin puntos en la parte local (a.b+x@googlemail.com -> ab@gmail.com).
+    """
+    local, _, domain = (email or '').strip().lower().rpartition('@')
+    if not local:
+        return domain
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local = local.replace('.', '')
+        domain = GMAIL_DOMAINS[0]
+    return f'{local}@{domain}'
+
+
+def phone_blocking_key(phone):
+    """
+    Últimos PHONE_KEY_DIGITS dígitos del teléfono ('+56 9 1234 5678' y
+    '912345678' comparten clave); vacío si tiene menos de PHONE_MIN_DIGITS.
+    """
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) < PHONE_MIN_DIGITS:
+        return ''
+    return digits[-PHONE_KEY_DIGITS:]
+
+
+def name_tokens(name):
+    """Palabras del nombre en minúsculas y sin tildes."""
+    plain = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    return set(re.findall(r'[a-z]+', plain.lower()))
+
+
+def names_compatible(first, second):
+    """
+    True si los nombres pueden ser de la misma persona: alguno está vacío
+    o comparten una palabra. Evita fusionar familiares con un mismo teléfono.
+    """
+    first, second = name_tokens(first), name_tokens(second)
+    return not first or not second or bool(first & second)
@@ -0,0 +1,42 @@
+"""
+Detecta y fusiona leads duplicados (mismo email con otra forma o mismo
+teléfono). Incremental: cada ejecución revisa solo los leads nuevos o
+modificados desde la anterior. La primera revisa todos.
+Pensado como job periódico.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.leads.services import LeadDeduplicationService
+
+
+class Command(BaseCommand):
+    help = 'Fusiona leads duplicados creados o modificados desde la última ejecución'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LeadDeduplicationService.BATCH_SIZE,
+            help='Leads pendientes por lote'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta los grupos encontrados, sin fusionar'
+        )
+
+    def handle(self, *args, **options):
+        result = LeadDeduplicationService.run(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+
+        if options['dry_run'] or options['verbosity'] > 1:
+            for emails in result['groups']:
+                self.stdout.write(f"  {', '.join(emails)}")
+
+        action = 'a fusionar' if options['dry_run'] else 'fusionados'
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['checked']} leads revisados, {len(result['groups'])} grupos, "
+            f"{result['merged']} leads {action}, {result['skipped']} grupos omitidos."
+        ))
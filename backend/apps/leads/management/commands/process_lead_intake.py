@@ -0,0 +1,69 @@
+"""
+Worker del webhook asíncrono: convierte en leads las entregas encoladas.
+Toma lotes con SKIP LOCKED, por lo que pueden correr varios en paralelo.
+Sin --once queda escuchando la cola y duerme --interval segundos cuando
+está vacía.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.leads.services import LeadIntakeService
+
+
+class Command(BaseCommand):
+    help = 'Procesa las entregas pendientes del webhook asíncrono'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LeadIntakeService.BATCH_SIZE,
+            help='Entregas por transacción'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Vacía la cola una vez y termina'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Segundos de espera con la cola vacía'
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            help='Elimina entregas procesadas hace más de N días'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor que 0')
+
+        if options['purge_days'] is not None:
+            purged = LeadIntakeService.purge(timezone.now() - timedelta(days=options['purge_days']))
+            self.stdout.write(f'  {purged} entregas antiguas eliminadas')
+
+        try:
+            while True:
+                started = time.monotonic()
+                processed = LeadIntakeService.drain(batch_size=options['batch_size'])
+                if processed:
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f'  {processed} entregas procesadas ({processed / elapsed:.0f}/s)'
+                    )
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        metrics = LeadIntakeService.metrics()
+        self.stdout.write(self.style.SUCCESS(
+            f"Cola: {metrics['queue_depth']} pendientes, retraso {metrics['lag_seconds']}s."
+        ))
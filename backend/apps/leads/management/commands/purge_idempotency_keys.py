@@ -0,0 +1,14 @@
+"""
+Elimina las claves de idempotencia del webhook ya vencidas.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.leads.services import WebhookIdempotencyService
+
+
+class Command(BaseCommand):
+    help = 'Elimina las claves de idempotencia vencidas del webhook'
+
+    def handle(self, *args, **options):
+        deleted = WebhookIdempotencyService.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} claves vencidas eliminadas.'))
@@ -0,0 +1,28 @@
+"""
+Comando para corregir desviaciones de User.active_leads_count respecto de
+los leads realmente asignados y abiertos.
+Útil tras cargas masivas, cambios directos en la base o como job periódico.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.leads.services import LeadService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de leads activos por ejecutivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo reporta las desviaciones, sin corregirlas'
+        )
+
+    def handle(self, *args, **options):
+        drift = LeadService.reconcile_workload_counters(dry_run=options['dry_run'])
+
+        for user_id, (stored, expected) in sorted(drift.items(), key=lambda item: str(item[0])):
+            self.stdout.write(f'  {user_id}: {stored} -> {expected}')
+
+        action = 'detectadas' if options['dry_run'] else 'corregidas'
+        self.stdout.write(self.style.SUCCESS(f'{len(drift)} desviaciones {action}.'))
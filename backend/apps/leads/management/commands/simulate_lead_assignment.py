@@ -0,0 +1,82 @@
+"""
+Simula la asignación de leads históricos con cada estrategia
+(apps.leads.assignment.STRATEGIES) sobre los ejecutivos activos y sus
+perfiles actuales, sin escribir en la base. Reporta el reparto por
+ejecutivo, el balance y el rendimiento (leads/s) de cada estrategia.
+"""
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.leads.assignment import STRATEGIES, DispatchPlan, simulate
+from apps.leads.models import Lead
+
+
+class Command(BaseCommand):
+    help = 'Compara estrategias de asignación reproduciendo leads históricos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strategy',
+            action='append',
+            choices=sorted(STRATEGIES),
+            help='Estrategia a simular (repetible); por defecto todas'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Solo leads creados en los últimos N días'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Máximo de leads (los más recientes)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Imprime los resultados como JSON'
+        )
+
+    def handle(self, *args, **options):
+        leads = Lead.objects.only('source', 'source_detail', 'created_at')
+        if options['days']:
+            leads = leads.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
+        leads = leads.order_by('-created_at')
+        if options['limit']:
+            leads = leads[:options['limit']]
+        # Se cargan una vez: el rendimiento medido es solo el de la estrategia
+        leads = list(leads)[::-1]
+
+        slots = DispatchPlan.build().slots
+        if not slots:
+            raise CommandError('No hay ejecutivos activos.')
+
+        results = [
+            simulate(leads, slots, STRATEGIES[name]())
+            for name in options['strategy'] or STRATEGIES
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for result in results:
+            balance = result['balance']
+            self.stdout.write(self.style.SUCCESS(f"{result['strategy']}"))
+            self.stdout.write(
+                f"  {result['leads']} leads, {result['unassigned']} sin asignar, "
+                f"{result['leads_per_second']} leads/s"
+            )
+            self.stdout.write(
+                f"  balance: max/min {balance['max_min_ratio']}, "
+                f"desv. estándar {balance['stddev']}, error de cuota {balance['share_error']}"
+            )
+            self.stdout.write(
+                f"  fuente preferida: {result['preferred_hits']}, "
+                f"fuera de horario: {result['off_hours']}"
+            )
+            for executive_id, count in result['per_executive'].items():
+                self.stdout.write(f'    {executive_id}: {count}')
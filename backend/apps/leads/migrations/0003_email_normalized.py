@@ -0,0 +1,121 @@
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Lower, Trim
+from django.utils import timezone
+
+
+CLOSED_STATUSES = ('converted', 'not_interested', 'invalid')
+FILLABLE_FIELDS = (
+    'name', 'phone', 'interested_project_id', 'assigned_to_id', 'assigned_at', 'source_detail',
+)
+
+
+def merge_duplicate_leads(apps, schema_editor):
+    """
+    Completa email_normalized y fusiona los leads con el mismo email
+    normalizado. Se conserva el lead convertido (o el más antiguo); los
+    demás le traspasan interacciones, reservas y datos faltantes y se
+    eliminan. Los contadores derivados se ajustan aquí porque los modelos
+    históricos no disparan signals.
+
+    Si más de un lead del grupo está convertido a usuarios distintos, el
+    sobreviviente conserva el suyo; el de cada duplicado queda en el
+    payload de su evento lead.merged (converted_user_id, converted_at)
+    para poder revisarlo.
+    """
+    Lead = apps.get_model('leads', 'Lead')
+    LeadInteraction = apps.get_model('leads', 'LeadInteraction')
+    Reservation = apps.get_model('reservations', 'Reservation')
+    User = apps.get_model('users', 'User')
+    PlatformStatistics = apps.get_model('statistics', 'PlatformStatistics')
+    DomainEvent = apps.get_model('statistics', 'DomainEvent')
+
+    Lead.objects.update(email_normalized=Lower(Trim('email')))
+    duplicated = list(
+        Lead.objects.values('email_normalized').annotate(total=Count('id')).filter(
+            total__gt=1
+        ).order_by().values_list('email_normalized', flat=True)
+    )
+
+    if not duplicated:
+        return
+
+    merged_at = timezone.now()
+    removed_total = 0
+    removed_converted = 0
+    for key in duplicated:
+        leads = list(Lead.objects.filter(email_normalized=key).order_by('created_at', 'id'))
+        survivor = next((lead for lead in leads if lead.status == 'converted'), leads[0])
+        duplicates = [lead for lead in leads if lead.pk != survivor.pk]
+        duplicate_ids = [lead.pk for lead in duplicates]
+
+        LeadInteraction.objects.filter(lead_id__in=duplicate_ids).update(lead_id=survivor.pk)
+        Reservation.objects.filter(lead_id__in=duplicate_ids).update(lead_id=survivor.pk)
+
+        dropped_conversions = {}
+        for duplicate in duplicates:
+            for field in FILLABLE_FIELDS:
+                if not getattr(survivor, field) and getattr(duplicate, field):
+                    setattr(survivor, field, getattr(duplicate, field))
+            if survivor.converted_user_id is None and duplicate.converted_user_id:
+                survivor.converted_user_id = duplicate.converted_user_id
+                survivor.converted_at = duplicate.converted_at
+                Lead.objects.filter(pk=duplicate.pk).update(converted_user=None)
+            elif duplicate.converted_user_id and duplicate.converted_user_id != survivor.converted_user_id:
+                dropped_conversions[duplicate.pk] = {
+                    'converted_user_id': str(duplicate.converted_user_id),
+                    'converted_at': duplicate.converted_at.isoformat() if duplicate.converted_at else None,
+                }
+
+        removed_total += len(duplicates)
+        removed_converted += sum(1 for lead in duplicates if lead.status == 'converted')
+        DomainEvent.objects.bulk_create([
+            DomainEvent(
+                event_type='lead.merged',
+                aggregate_type='lead',
+                aggregate_id=duplicate.pk,
+                payload={
+                    'into': str(survivor.pk),
+                    'source': duplicate.source,
+                    'converted': duplicate.status == 'converted',
+                    **dropped_conversions.get(duplicate.pk, {}),
+                },
+                occurred_at=merged_at,
+            )
+            for duplicate in duplicates
+        ])
+
+        Lead.objects.filter(id__in=duplicate_ids).delete()
+        survivor.save()
+
+    PlatformStatistics.objects.update(
+        total_leads=F('total_leads') - removed_total,
+        converted_leads=F('converted_leads') - removed_converted,
+    )
+
+    # Recalcular la carga de los ejecutivos tras la fusión
+    User.objects.filter(active_leads_count__gt=0).update(active_leads_count=0)
+    rows = Lead.objects.filter(assigned_to__isnull=False).exclude(
+        status__in=CLOSED_STATUSES
+    ).values('assigned_to').annotate(total=Count('id')).order_by()
+    for row in rows:
+        User.objects.filter(pk=row['assigned_to']).update(active_leads_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0002_initial'),
+        ('users', '0002_executive_workload_counter'),
+        ('reservations', '0002_initial'),
+        ('statistics', '0004_domain_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='email_normalized',
+            field=models.CharField(editable=False, max_length=254, null=True, verbose_name='Email normalizado'),
+        ),
+        migrations.RunPython(merge_duplicate_leads, migrations.RunPython.noop),
+    ]
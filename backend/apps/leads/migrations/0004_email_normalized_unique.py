@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Índice único en una migración aparte: PostgreSQL no permite alterar la
+    tabla en la misma transacción que la fusión de duplicados de 0003.
+    """
+
+    dependencies = [
+        ('leads', '0003_email_normalized'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lead',
+            name='email_normalized',
+            field=models.CharField(editable=False, max_length=254, unique=True, verbose_name='Email normalizado'),
+        ),
+    ]
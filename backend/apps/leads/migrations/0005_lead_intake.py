@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0004_email_normalized_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadIntake',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('payload', models.JSONField(verbose_name='Datos recibidos')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('created', 'Lead creado'), ('duplicate', 'Lead existente'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Procesado en')),
+                ('lead', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='intakes', to='leads.lead', verbose_name='Lead')),
+            ],
+            options={
+                'verbose_name': 'Entrega de webhook',
+                'verbose_name_plural': 'Entregas de webhook',
+                'db_table': 'lead_intake',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='lead_intake_pending_idx'), models.Index(fields=['processed_at'], name='lead_intake_processed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:21
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0005_lead_intake'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookIdempotencyKey',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('endpoint', models.CharField(max_length=50, verbose_name='Endpoint')),
+                ('key', models.CharField(max_length=255, verbose_name='Clave de idempotencia')),
+                ('request_hash', models.CharField(max_length=64, verbose_name='Hash del request')),
+                ('response_status', models.PositiveSmallIntegerField(verbose_name='Código de respuesta')),
+                ('response_body', models.JSONField(verbose_name='Respuesta')),
+                ('expires_at', models.DateTimeField(verbose_name='Vence en')),
+            ],
+            options={
+                'verbose_name': 'Clave de idempotencia',
+                'verbose_name_plural': 'Claves de idempotencia',
+                'db_table': 'lead_webhook_idempotency_keys',
+                'indexes': [models.Index(fields=['expires_at'], name='webhook_idempotency_exp_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='webhookidempotencykey',
+            constraint=models.UniqueConstraint(fields=('endpoint', 'key'), name='unique_webhook_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:27
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('leads', '0006_webhook_idempotency_keys'),
+        ('projects', '0004_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='lead',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='leads_email_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='leads_name_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('phone'), name='gin_trgm_ops'), name='leads_phone_trgm_idx'),
+        ),
+    ]
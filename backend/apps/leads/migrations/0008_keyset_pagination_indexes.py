@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:32
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('leads', '0007_search_trigram_indexes'),
+        ('projects', '0004_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='lead',
+            index=models.Index(fields=['created_at', 'id'], name='leads_keyset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=models.Index(fields=['assigned_to', 'created_at', 'id'], name='leads_assigned_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, Max, OuterRef, Subquery
+
+
+def populate_last_interaction_at(apps, schema_editor):
+    """Completa last_interaction_at con la interacción más reciente de cada lead."""
+    Lead = apps.get_model('leads', 'Lead')
+    LeadInteraction = apps.get_model('leads', 'LeadInteraction')
+
+    interactions = LeadInteraction.objects.filter(lead=OuterRef('pk'))
+    Lead.objects.filter(Exists(interactions)).update(
+        last_interaction_at=Subquery(
+            interactions.order_by().values('lead').annotate(last=Max('created_at')).values('last')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0008_keyset_pagination_indexes'),
+        ('projects', '0004_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='last_interaction_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Última interacción'),
+        ),
+        migrations.RunPython(populate_last_interaction_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['last_interaction_at'], name='leads_last_interaction_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leadinteraction',
+            index=models.Index(fields=['lead', 'created_at', 'id'], name='lead_interactions_timeline_idx'),
+        ),
+    ]
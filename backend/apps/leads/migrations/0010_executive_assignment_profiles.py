@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:38
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0009_lead_interaction_timeline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutiveAssignmentProfile',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('capacity_weight', models.PositiveSmallIntegerField(default=1, help_text='Proporción de leads respecto a los demás (0 = no recibe leads)', verbose_name='Peso de capacidad')),
+                ('sources', models.JSONField(blank=True, default=list, help_text='Fuente o proveedor (source_detail) de los leads que recibe con prioridad', verbose_name='Fuentes preferidas')),
+                ('work_days', models.JSONField(blank=True, default=list, help_text='Días de la semana (0 = lunes); vacío = todos', verbose_name='Días laborales')),
+                ('work_start', models.TimeField(blank=True, null=True, verbose_name='Inicio de jornada')),
+                ('work_end', models.TimeField(blank=True, null=True, verbose_name='Fin de jornada')),
+                ('executive', models.OneToOneField(limit_choices_to={'role': 'executive'}, on_delete=django.db.models.deletion.CASCADE, related_name='assignment_profile', to=settings.AUTH_USER_MODEL, verbose_name='Ejecutivo')),
+            ],
+            options={
+                'verbose_name': 'Perfil de asignación',
+                'verbose_name_plural': 'Perfiles de asignación',
+                'db_table': 'lead_assignment_profiles',
+            },
+        ),
+    ]
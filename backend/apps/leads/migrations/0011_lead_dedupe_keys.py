@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:46
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('leads', '0010_executive_assignment_profiles'),
+        ('projects', '0004_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='dedupe_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Revisión de duplicados'),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='dedupe_email_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=254, verbose_name='Clave de duplicado (email)'),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='dedupe_phone_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20, verbose_name='Clave de duplicado (teléfono)'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=models.Index(fields=['dedupe_email_key'], name='leads_dedupe_email_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=models.Index(fields=['dedupe_phone_key'], name='leads_dedupe_phone_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('dedupe_checked_at__isnull', True)), fields=['created_at', 'id'], name='leads_dedupe_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0011_lead_dedupe_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='webhookidempotencykey',
+            name='response_body',
+            field=models.JSONField(blank=True, null=True, verbose_name='Respuesta'),
+        ),
+        migrations.AlterField(
+            model_name='webhookidempotencykey',
+            name='response_status',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Código de respuesta'),
+        ),
+    ]
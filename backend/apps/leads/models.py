@@ -1,7 +1,9 @@
 """
 Lead models for SomosRentable.
 """
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from core.models import BaseModel
 
 
@@ -26,10 +28,20 @@ class Lead(BaseModel):
         NOT_INTERESTED = 'not_interested', 'No Interesado'
         INVALID = 'invalid', 'Inválido'
 
+    # Estados que ya no cuentan en la carga de trabajo del ejecutivo
+    CLOSED_STATUSES = (Status.CONVERTED, Status.NOT_INTERESTED, Status.INVALID)
+
     # Información de contacto
     email = models.EmailField(
         verbose_name='Correo electrónico'
     )
+    # Clave de unicidad: email sin espacios y en minúsculas
+    email_normalized = models.CharField(
+        max_length=254,
+        unique=True,
+        editable=False,
+        verbose_name='Email normalizado'
+    )
     name = models.CharField(
         max_length=255,
         blank=True,
@@ -115,15 +127,105 @@ class Lead(BaseModel):
         verbose_name='Datos del webhook'
     )
 
+    # Mantenido por signals de LeadInteraction (apps.leads.signals) con
+    # UPDATE directos; save() no lo escribe en leads existentes
+    last_interaction_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Última interacción'
+    )
+
+    # Detección de duplicados (LeadDeduplicationService). Las claves de
+    # bloqueo las calcula el job; dedupe_checked_at nulo = pendiente de revisar
+    dedupe_email_key = models.CharField(
+        max_length=254,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Clave de duplicado (email)'
+    )
+    dedupe_phone_key = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Clave de duplicado (teléfono)'
+    )
+    dedupe_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Revisión de duplicados'
+    )
+
+    # Columnas de la búsqueda ?q= (índice trigram sobre UPPER de cada una)
+    SEARCH_FIELDS = ('email', 'name', 'phone')
+    # Campos que, al cambiar, vuelven a dejar el lead pendiente de revisión
+    DEDUPE_FIELDS = ('email', 'phone')
+    # Campos que solo se escriben con UPDATE directos: un save() completo
+    # sobre una instancia leída antes los dejaría con un valor viejo
+    UPDATE_ONLY_FIELDS = ('last_interaction_at',)
+
     class Meta:
         db_table = 'leads'
         verbose_name = 'Lead'
         verbose_name_plural = 'Leads'
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='leads_email_trgm_idx'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='leads_name_trgm_idx'),
+            GinIndex(OpClass(Upper('phone'), name='gin_trgm_ops'), name='leads_phone_trgm_idx'),
+            # Paginación por cursor (core.pagination)
+            models.Index(fields=['created_at', 'id'], name='leads_keyset_idx'),
+            models.Index(fields=['assigned_to', 'created_at', 'id'], name='leads_assigned_keyset_idx'),
+            models.Index(fields=['last_interaction_at'], name='leads_last_interaction_idx'),
+            models.Index(fields=['dedupe_email_key'], name='leads_dedupe_email_idx'),
+            models.Index(fields=['dedupe_phone_key'], name='leads_dedupe_phone_idx'),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(dedupe_checked_at__isnull=True),
+                name='leads_dedupe_pending_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.email} - {self.get_status_display()}"
 
+    @staticmethod
+    def normalize_email(email):
+        """Forma canónica de un email para detectar leads duplicados."""
+        return (email or '').strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.email_normalized = self.normalize_email(self.email)
+        deferred = self.get_deferred_fields()
+        if (
+            deferred and not self._state.adding and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert') and not args
+        ):
+            # Como Django (solo los campos cargados), sin los UPDATE_ONLY_FIELDS
+            skipped = deferred | set(self.UPDATE_ONLY_FIELDS)
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_normalized'}
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(self.DEDUPE_FIELDS) & set(update_fields):
+            # apps.leads.signals la reinicia si el email o el teléfono cambiaron
+            kwargs['update_fields'] = {*update_fields, 'dedupe_checked_at'}
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Un save() completo no escribe los UPDATE_ONLY_FIELDS. Si la fila ya
+        # no existe, Django sigue insertando con todos los campos
+        if update_fields is None:
+            values = [value for value in values if value[0].attname not in self.UPDATE_ONLY_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
 
 class LeadInteraction(BaseModel):
     """
@@ -170,6 +272,180 @@ class LeadInteraction(BaseModel):
         verbose_name = 'Interacción con lead'
         verbose_name_plural = 'Interacciones con leads'
         ordering = ['-created_at']
+        indexes = [
+            # Últimas interacciones y paginación por cursor de un lead
+            models.Index(fields=['lead', 'created_at', 'id'], name='lead_interactions_timeline_idx'),
+        ]
 
     def __str__(self):
         return f"{self.lead.email} - {self.get_interaction_type_display()}"
+
+
+class LeadIntake(BaseModel):
+    """
+    Entrega del webhook externo pendiente de procesar (modo asíncrono).
+    El webhook solo valida y guarda la fila; el worker process_lead_intake
+    la convierte en lead. El id es el recibo que se entrega al proveedor.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendiente'
+        CREATED = 'created', 'Lead creado'
+        DUPLICATE = 'duplicate', 'Lead existente'
+        FAILED = 'failed', 'Fallido'
+
+    payload = models.JSONField(
+        verbose_name='Datos recibidos'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Estado'
+    )
+    lead = models.ForeignKey(
+        Lead,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='intakes',
+        verbose_name='Lead'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Intentos'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Error'
+    )
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Procesado en'
+    )
+
+    class Meta:
+        db_table = 'lead_intake'
+        verbose_name = 'Entrega de webhook'
+        verbose_name_plural = 'Entregas de webhook'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='pending'),
+                name='lead_intake_pending_idx'
+            ),
+            models.Index(fields=['processed_at'], name='lead_intake_processed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} - {self.get_status_display()}"
+
+
+class WebhookIdempotencyKey(BaseModel):
+    """
+    Respuesta guardada de una entrega del webhook con header Idempotency-Key.
+    Mientras no venza (WEBHOOK_IDEMPOTENCY_TTL_HOURS), los reintentos con la
+    misma clave reciben la misma respuesta sin volver a procesarse.
+    Sin respuesta (response_status nulo) la clave está reservada por un
+    request en curso.
+    """
+
+    endpoint = models.CharField(
+        max_length=50,
+        verbose_name='Endpoint'
+    )
+    key = models.CharField(
+        max_length=255,
+        verbose_name='Clave de idempotencia'
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        verbose_name='Hash del request'
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Código de respuesta'
+    )
+    response_body = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='Respuesta'
+    )
+    expires_at = models.DateTimeField(
+        verbose_name='Vence en'
+    )
+
+    class Meta:
+        db_table = 'lead_webhook_idempotency_keys'
+        verbose_name = 'Clave de idempotencia'
+        verbose_name_plural = 'Claves de idempotencia'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['endpoint', 'key'], name='unique_webhook_idempotency_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='webhook_idempotency_exp_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint} - {self.key}"
+
+    @property
+    def is_pending(self):
+        return self.response_status is None
+
+
+class ExecutiveAssignmentProfile(BaseModel):
+    """
+    Configuración de asignación de leads de un ejecutivo.
+    La usan las estrategias de apps.leads.assignment: peso de capacidad,
+    fuentes preferidas y horario laboral. Sin perfil, el ejecutivo recibe
+    leads de cualquier fuente, a cualquier hora y con peso 1.
+    """
+
+    executive = models.OneToOneField(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='assignment_profile',
+        limit_choices_to={'role': 'executive'},
+        verbose_name='Ejecutivo'
+    )
+    capacity_weight = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name='Peso de capacidad',
+        help_text='Proporción de leads respecto a los demás (0 = no recibe leads)'
+    )
+    sources = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Fuentes preferidas',
+        help_text='Fuente o proveedor (source_detail) de los leads que recibe con prioridad'
+    )
+    work_days = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Días laborales',
+        help_text='Días de la semana (0 = lunes); vacío = todos'
+    )
+    work_start = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name='Inicio de jornada'
+    )
+    work_end = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name='Fin de jornada'
+    )
+
+    class Meta:
+        db_table = 'lead_assignment_profiles'
+        verbose_name = 'Perfil de asignación'
+        verbose_name_plural = 'Perfiles de asignación'
+
+    def __str__(self):
+        return f"{self.executive} - peso {self.capacity_weight}"
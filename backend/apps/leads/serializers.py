@@ -1,6 +1,8 @@
 """
 Lead serializers for SomosRentable API.
 """
+from django.conf import settings
+from django.db.models import Count
 from rest_framework import serializers
 from .models import Lead, LeadInteraction
 
@@ -34,23 +36,50 @@ class LeadSerializer(serializers.ModelSerializer):
             'id', 'email', 'name', 'phone', 'source', 'source_display',
             'source_detail', 'status', 'status_display', 'assigned_to',
             'assigned_to_name', 'assigned_at', 'interested_project',
-            'project_title', 'notes', 'created_at', 'updated_at'
+            'project_title', 'notes', 'last_interaction_at', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'source', 'assigned_to', 'assigned_at', 'created_at', 'updated_at']
 
 
 class LeadDetailSerializer(LeadSerializer):
-    """Serializer para detalle de lead con interacciones."""
+    """
+    Serializer para detalle de lead con sus últimas RECENT_INTERACTIONS
+    interacciones y el conteo por tipo. El historial completo se pagina en
+    /leads/<id>/interactions/.
+    """
 
-    interactions = LeadInteractionSerializer(many=True, read_only=True)
+    RECENT_INTERACTIONS = 10
+
+    interactions = serializers.SerializerMethodField()
+    interaction_counts = serializers.SerializerMethodField()
     converted_user_email = serializers.EmailField(source='converted_user.email', read_only=True)
 
     class Meta(LeadSerializer.Meta):
         fields = LeadSerializer.Meta.fields + [
-            'interactions', 'converted_user', 'converted_user_email',
-            'converted_at', 'webhook_data'
+            'interactions', 'interaction_counts', 'converted_user',
+            'converted_user_email', 'converted_at', 'webhook_data'
         ]
 
+    def get_interactions(self, obj):
+        recent = obj.interactions.select_related('executive').order_by(
+            '-created_at', '-id'
+        )[:self.RECENT_INTERACTIONS]
+        return LeadInteractionSerializer(recent, many=True).data
+
+    def get_interaction_counts(self, obj):
+        counts = dict(
+            obj.interactions.order_by().values('interaction_type').annotate(
+                total=Count('id')
+            ).values_list('interaction_type', 'total')
+        )
+        return {
+            'total': sum(counts.values()),
+            'by_type': {
+                interaction_type: counts.get(interaction_type, 0)
+                for interaction_type in LeadInteraction.InteractionType.values
+            },
+        }
+
 
 class LeadUpdateSerializer(serializers.ModelSerializer):
     """Serializer para actualizar lead."""
@@ -71,6 +100,22 @@ class LeadWebhookSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
 
 
+class LeadWebhookBatchSerializer(serializers.Serializer):
+    """
+    Serializer para recibir leads en lote desde webhook.
+    Cada ítem se valida después por separado con LeadWebhookSerializer.
+    """
+
+    leads = serializers.ListField(child=serializers.JSONField(), allow_empty=False)
+
+    def validate_leads(self, value):
+        if len(value) > settings.WEBHOOK_BATCH_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Máximo {settings.WEBHOOK_BATCH_MAX_SIZE} leads por request.'
+            )
+        return value
+
+
 class LeadAssignSerializer(serializers.Serializer):
     """Serializer para asignar lead a ejecutivo."""
 
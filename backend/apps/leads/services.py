@@ -1,8 +1,15 @@
 """
 Lead Service - Lógica de negocio para gestión de leads.
 """
+import hashlib
+import json
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Avg, Case, Count, F, Max, Q, Subquery, Value, When
 
 
 class LeadService:
@@ -11,11 +18,19 @@ class LeadService:
     Implementa asignación round-robin a ejecutivos.
     """
 
+    # Filas por sentencia INSERT en insert_leads
+    INSERT_BATCH_SIZE = 1000
+
     @classmethod
     def assign_lead_to_executive(cls, lead):
         """
-        Asigna un lead a un ejecutivo usando round-robin.
-        Asigna al ejecutivo con menos leads activos.
+        Asigna un lead a un ejecutivo según la estrategia configurada
+        (LEAD_ASSIGNMENT_STRATEGY; por defecto, el de menos leads activos).
+
+        El plan de despacho (apps.leads.assignment) propone los mejores
+        candidatos y la elección final se hace contra la base: la fila del
+        ejecutivo elegido queda bloqueada hasta el commit, por lo que las
+        asignaciones concurrentes (de cualquier proceso) toman a otro.
 
         Args:
             lead: Instancia de Lead
@@ -23,32 +38,216 @@ class LeadService:
         Returns:
             User: Ejecutivo asignado o None
         """
-        from apps.users.models import User
-        from apps.leads.models import Lead
+        from apps.leads.assignment import LeadDispatcher
 
-        # Obtener ejecutivos ordenados por cantidad de leads activos
-        executives = User.objects.filter(
-            role=User.Role.EXECUTIVE,
-            is_active=True
-        ).annotate(
-            active_leads_count=Count(
-                'assigned_leads',
-                filter=~Q(assigned_leads__status__in=[
-                    Lead.Status.CONVERTED,
-                    Lead.Status.NOT_INTERESTED,
-                    Lead.Status.INVALID
-                ])
-            )
-        ).order_by('active_leads_count')
+        with transaction.atomic():
+            executive = LeadDispatcher.claim(lead)
+            if executive is None:
+                return None
 
-        if executives.exists():
-            executive = executives.first()
             lead.assigned_to = executive
             lead.assigned_at = timezone.now()
             lead.save()
-            return executive
 
-        return None
+        return executive
+
+    @classmethod
+    def apply_workload_deltas(cls, deltas):
+        """
+        Aplica variaciones a User.active_leads_count.
+
+        Args:
+            deltas: dict executive_id -> variación (se omiten los ceros)
+        """
+        from apps.users.models import User
+
+        deltas = {executive_id: delta for executive_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        # Una sola sentencia para todos los ejecutivos afectados
+        User.objects.filter(pk__in=deltas.keys()).update(
+            active_leads_count=F('active_leads_count') + Case(
+                *[When(pk=executive_id, then=Value(delta)) for executive_id, delta in deltas.items()],
+                default=Value(0)
+            )
+        )
+
+    @classmethod
+    def touch_last_interaction(cls, lead_id, at):
+        """
+        Adelanta Lead.last_interaction_at a `at` si es más reciente.
+        Un solo UPDATE condicional, sin leer el lead.
+        """
+        from apps.leads.models import Lead
+
+        Lead.objects.filter(pk=lead_id).filter(
+            Q(last_interaction_at__isnull=True) | Q(last_interaction_at__lt=at)
+        ).update(last_interaction_at=at)
+
+    @classmethod
+    def refresh_last_interaction(cls, lead_id):
+        """Recalcula Lead.last_interaction_at desde sus interacciones."""
+        from apps.leads.models import Lead, LeadInteraction
+
+        Lead.objects.filter(pk=lead_id).update(
+            last_interaction_at=Subquery(
+                LeadInteraction.objects.filter(lead_id=lead_id).order_by(
+                    '-created_at'
+                ).values('created_at')[:1]
+            )
+        )
+
+    @classmethod
+    def reconcile_workload_counters(cls, dry_run=False):
+        """
+        Recalcula User.active_leads_count desde la tabla de leads y corrige
+        los ejecutivos con desviación.
+
+        Args:
+            dry_run: Solo reportar, sin corregir
+
+        Returns:
+            dict: executive_id -> (valor guardado, valor real) de los corregidos
+        """
+        from apps.users.models import User
+        from apps.leads.models import Lead
+
+        drift = {}
+        with transaction.atomic():
+            # Bloquear primero los contadores: las variaciones de
+            # transacciones en curso esperan y se aplican sobre el valor corregido
+            stored = dict(
+                User.objects.select_for_update().filter(
+                    Q(role=User.Role.EXECUTIVE) | Q(active_leads_count__gt=0)
+                ).values_list('id', 'active_leads_count')
+            )
+            actual = dict(
+                Lead.objects.filter(assigned_to__isnull=False).exclude(
+                    status__in=Lead.CLOSED_STATUSES
+                ).values('assigned_to').annotate(total=Count('id')).order_by().values_list(
+                    'assigned_to', 'total'
+                )
+            )
+
+            for user_id in stored.keys() | actual.keys():
+                count, expected = stored.get(user_id, 0), actual.get(user_id, 0)
+                if count != expected:
+                    drift[user_id] = (count, expected)
+
+            if not dry_run:
+                for user_id, (_, expected) in drift.items():
+                    User.objects.filter(pk=user_id).update(active_leads_count=expected)
+
+        if drift and not dry_run:
+            from apps.leads.assignment import LeadDispatcher
+
+            LeadDispatcher.invalidate()
+
+        return drift
+
+    @classmethod
+    def insert_leads(cls, leads):
+        """
+        Inserta leads nuevos con una sola sentencia
+        INSERT ... ON CONFLICT (email_normalized) DO NOTHING RETURNING id.
+        Los que chocan con un lead existente (o en inserción concurrente)
+        se omiten sin error.
+
+        Los insertados quedan marcados como persistidos, se registra su
+        evento lead.created y se emite leads_bulk_created para que
+        estadísticas y contadores los incluyan. Debe llamarse dentro de
+        una transacción.
+
+        Args:
+            leads: Instancias de Lead sin guardar
+
+        Returns:
+            list: Leads efectivamente insertados, en el orden recibido
+        """
+        from apps.leads.models import Lead
+        from apps.leads.signals import leads_bulk_created
+        from apps.statistics.events import EventLogService
+        from core import tracking
+
+        if not leads:
+            return []
+
+        meta = Lead._meta
+        fields = meta.concrete_fields
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in fields)
+        row = '(' + ', '.join(['%s'] * len(fields)) + ')'
+
+        inserted_ids = set()
+        with connection.cursor() as cursor:
+            for start in range(0, len(leads), cls.INSERT_BATCH_SIZE):
+                chunk = leads[start:start + cls.INSERT_BATCH_SIZE]
+                params = []
+                for lead in chunk:
+                    lead.email_normalized = Lead.normalize_email(lead.email)
+                    params.extend(
+                        field.get_db_prep_save(field.pre_save(lead, True), connection)
+                        for field in fields
+                    )
+                cursor.execute(
+                    f'INSERT INTO {quote(meta.db_table)} ({columns}) '
+                    f'VALUES {", ".join([row] * len(chunk))} '
+                    f'ON CONFLICT ({quote("email_normalized")}) DO NOTHING '
+                    f'RETURNING {quote(meta.pk.column)}',
+                    params
+                )
+                inserted_ids.update(pk for pk, in cursor.fetchall())
+
+        inserted = [lead for lead in leads if lead.pk in inserted_ids]
+        for lead in inserted:
+            tracking.mark_persisted(lead)
+
+        EventLogService.record_many(
+            EventLogService.build(
+                EventLogService.LEAD_CREATED, lead, {'source': lead.source}, lead.created_at
+            )
+            for lead in inserted
+        )
+        if inserted:
+            leads_bulk_created.send(sender=Lead, leads=inserted)
+
+        return inserted
+
+    @classmethod
+    def upsert_lead(cls, lead):
+        """
+        Inserta un lead o retorna el existente con el mismo email
+        normalizado. Sin condiciones de carrera: si otra transacción
+        inserta el mismo email, el INSERT espera su commit y cae al SELECT.
+        Los leads nuevos se asignan a un ejecutivo.
+
+        Si el pre-filtro de emails indica que el email puede existir (los
+        reintentos de proveedores), se busca primero con una lectura y se
+        evita abrir el INSERT; si indica que seguro es nuevo, se inserta
+        directamente.
+
+        Args:
+            lead: Instancia de Lead sin guardar
+
+        Returns:
+            tuple: (Lead, bool) - (lead, es_nuevo)
+        """
+        from apps.leads.dedupe import LeadEmailFilter
+        from apps.leads.models import Lead
+
+        lead.email_normalized = Lead.normalize_email(lead.email)
+        if LeadEmailFilter.might_exist(lead.email_normalized):
+            existing = Lead.objects.filter(email_normalized=lead.email_normalized).first()
+            if existing is not None:
+                return existing, False
+
+        with transaction.atomic():
+            if cls.insert_leads([lead]):
+                cls.assign_lead_to_executive(lead)
+                return lead, True
+
+        return Lead.objects.get(email_normalized=lead.email_normalized), False
 
     @classmethod
     def create_lead_from_reservation(cls, reservation):
@@ -63,31 +262,22 @@ class LeadService:
         """
         from apps.leads.models import Lead
 
-        # Verificar si ya existe lead con este email
-        existing_lead = Lead.objects.filter(email=reservation.email).first()
-
-        if existing_lead:
-            # Actualizar lead existente si no está convertido
-            if existing_lead.status != Lead.Status.CONVERTED:
-                existing_lead.interested_project = reservation.project
-                if not existing_lead.name and reservation.name:
-                    existing_lead.name = reservation.name
-                if not existing_lead.phone and reservation.phone:
-                    existing_lead.phone = reservation.phone
-                existing_lead.save()
-            return existing_lead
-
-        # Crear nuevo lead
-        lead = Lead.objects.create(
+        lead, created = cls.upsert_lead(Lead(
             email=reservation.email,
             name=reservation.name,
             phone=reservation.phone,
             source=Lead.Source.RESERVATION,
             interested_project=reservation.project
-        )
-
-        # Asignar a ejecutivo
-        cls.assign_lead_to_executive(lead)
+        ))
+
+        # Actualizar lead existente si no está convertido
+        if not created and lead.status != Lead.Status.CONVERTED:
+            lead.interested_project = reservation.project
+            if not lead.name and reservation.name:
+                lead.name = reservation.name
+            if not lead.phone and reservation.phone:
+                lead.phone = reservation.phone
+            lead.save()
 
         return lead
 
@@ -104,12 +294,7 @@ class LeadService:
         """
         from apps.leads.models import Lead
 
-        # Verificar si ya existe
-        existing = Lead.objects.filter(email=data['email']).first()
-        if existing:
-            return existing, False
-
-        lead = Lead.objects.create(
+        return cls.upsert_lead(Lead(
             email=data['email'],
             name=data.get('name', ''),
             phone=data.get('phone', ''),
@@ -117,11 +302,95 @@ class LeadService:
             source_detail=data.get('source', ''),
             webhook_data=data,
             notes=data.get('notes', '')
-        )
+        ))
+
+    @classmethod
+    def create_leads_from_webhook_batch(cls, items):
+        """
+        Crea leads en lote desde el webhook externo.
 
-        cls.assign_lead_to_executive(lead)
+        Los emails normalizados se comparan contra los leads existentes en
+        una sola consulta, que omite los que el pre-filtro de emails
+        descarta como seguro nuevos; los nuevos se reparten con el plan de
+        despacho (misma estrategia que assign_lead_to_executive) y se
+        insertan con insert_leads. Los que otra
+        transacción insertó entre medio se reportan como duplicados.
+
+        Args:
+            items: Lista de dicts ya validados, o None para ítems inválidos
+                (se conservan para mantener la posición de cada resultado)
 
-        return lead, True
+        Returns:
+            list: Por ítem, (estado, lead o None) con estado
+                'created', 'duplicate' o 'invalid'
+        """
+        from apps.leads.assignment import LeadDispatcher
+        from apps.leads.dedupe import LeadEmailFilter
+        from apps.leads.models import Lead
+
+        keys = {
+            key for key in (
+                Lead.normalize_email(data['email']) for data in items if data is not None
+            )
+            if LeadEmailFilter.might_exist(key)
+        }
+
+        with transaction.atomic():
+            known = {
+                lead.email_normalized: lead
+                for lead in Lead.objects.filter(email_normalized__in=keys)
+            } if keys else {}
+
+            results = []
+            new_leads = []
+            for data in items:
+                key = Lead.normalize_email(data['email']) if data is not None else None
+                if data is None:
+                    results.append(('invalid', None))
+                elif key in known:
+                    results.append(('duplicate', known[key]))
+                else:
+                    lead = Lead(
+                        email=data['email'],
+                        name=data.get('name', ''),
+                        phone=data.get('phone', ''),
+                        source=Lead.Source.WEBHOOK,
+                        source_detail=data.get('source', ''),
+                        webhook_data=data,
+                        notes=data.get('notes', '')
+                    )
+                    known[key] = lead
+                    new_leads.append(lead)
+                    results.append(('created', lead))
+
+            if not new_leads:
+                return results
+
+            # Reparto en memoria con el plan de despacho (carga leída de la base)
+            now = timezone.now()
+            assignments = LeadDispatcher.assign(new_leads, now)
+            for lead, executive_id in zip(new_leads, assignments):
+                if executive_id is not None:
+                    lead.assigned_to_id = executive_id
+                    lead.assigned_at = now
+
+            inserted = {lead.pk for lead in cls.insert_leads(new_leads)}
+
+            lost = [lead for lead in new_leads if lead.pk not in inserted]
+            if lost:
+                winners = {
+                    lead.email_normalized: lead
+                    for lead in Lead.objects.filter(
+                        email_normalized__in=[lead.email_normalized for lead in lost]
+                    )
+                }
+                results = [
+                    ('duplicate', winners[lead.email_normalized])
+                    if outcome == 'created' and lead.pk not in inserted else (outcome, lead)
+                    for outcome, lead in results
+                ]
+
+        return results
 
     @classmethod
     def convert_lead_to_investor(cls, lead, user):
@@ -136,16 +405,34 @@ class LeadService:
             Lead: Lead actualizado
         """
         from apps.leads.models import Lead
+        from apps.statistics.events import EventLogService
+        from apps.statistics.leaderboard import LeaderboardService
+
+        already_converted = lead.status == Lead.Status.CONVERTED
 
-        lead.converted_user = user
-        lead.converted_at = timezone.now()
-        lead.status = Lead.Status.CONVERTED
-        lead.save()
+        with transaction.atomic():
+            lead.converted_user = user
+            lead.converted_at = timezone.now()
+            lead.status = Lead.Status.CONVERTED
+            lead.save()
 
-        # Si el usuario no tiene ejecutivo asignado, asignar el del lead
-        if not user.assigned_executive and lead.assigned_to:
-            user.assigned_executive = lead.assigned_to
-            user.save()
+            if not already_converted:
+                LeaderboardService.record_conversion(lead.assigned_to_id, lead.converted_at)
+                EventLogService.record(
+                    EventLogService.LEAD_CONVERTED,
+                    lead,
+                    {
+                        'source': lead.source,
+                        'executive_id': str(lead.assigned_to_id) if lead.assigned_to_id else None,
+                        'user_id': str(user.id),
+                    },
+                    lead.converted_at
+                )
+
+            # Si el usuario no tiene ejecutivo asignado, asignar el del lead
+            if not user.assigned_executive and lead.assigned_to:
+                user.assigned_executive = lead.assigned_to
+                user.save()
 
         return lead
 
@@ -164,17 +451,509 @@ class LeadService:
         """
         from apps.leads.models import Lead
 
-        lead, created = Lead.objects.get_or_create(
+        return cls.upsert_lead(Lead(
             email=email,
-            defaults={
-                'source': source,
-                'name': kwargs.get('name', ''),
-                'phone': kwargs.get('phone', ''),
-                'source_detail': kwargs.get('source_detail', ''),
-            }
+            source=source,
+            name=kwargs.get('name', ''),
+            phone=kwargs.get('phone', ''),
+            source_detail=kwargs.get('source_detail', ''),
+        ))
+
+    @classmethod
+    def merge_leads(cls, survivor, duplicates):
+        """
+        Fusiona leads duplicados en `survivor`.
+
+        Las interacciones, reservas y entregas del webhook de los
+        duplicados pasan al sobreviviente; este completa sus campos vacíos
+        (nombre, teléfono, proyecto, ejecutivo) con los de los duplicados,
+        avanza al estado abierto más avanzado, conserva la última
+        interacción más reciente y anota en sus notas los emails
+        fusionados. Luego los duplicados se eliminan: los contadores de
+        carga se ajustan con los signals de Lead y cada duplicado queda
+        registrado como evento lead.merged (como en la migración 0003),
+        para que las estadísticas a una fecha dejen de contarlo.
+
+        Debe llamarse dentro de una transacción, con las filas bloqueadas.
+
+        Args:
+            survivor: Lead que se conserva
+            duplicates: Leads a fusionar y eliminar
+
+        Returns:
+            Lead: El sobreviviente actualizado
+        """
+        from apps.leads.models import Lead, LeadIntake, LeadInteraction
+        from apps.reservations.models import Reservation
+        from apps.statistics.events import EventLogService
+
+        progress = [Lead.Status.NEW, Lead.Status.CONTACTED, Lead.Status.INTERESTED]
+        duplicate_ids = [lead.pk for lead in duplicates]
+
+        LeadInteraction.objects.filter(lead_id__in=duplicate_ids).update(lead=survivor)
+        Reservation.objects.filter(lead_id__in=duplicate_ids).update(lead=survivor)
+        LeadIntake.objects.filter(lead_id__in=duplicate_ids).update(lead=survivor)
+
+        notes = [survivor.notes] if survivor.notes else []
+        for lead in duplicates:
+            for field in ('name', 'phone', 'interested_project_id'):
+                if not getattr(survivor, field) and getattr(lead, field):
+                    setattr(survivor, field, getattr(lead, field))
+            if survivor.assigned_to_id is None and lead.assigned_to_id is not None:
+                survivor.assigned_to_id = lead.assigned_to_id
+                survivor.assigned_at = lead.assigned_at
+            if (
+                survivor.status in progress and lead.status in progress
+                and progress.index(lead.status) > progress.index(survivor.status)
+            ):
+                survivor.status = lead.status
+            if lead.last_interaction_at and (
+                survivor.last_interaction_at is None
+                or lead.last_interaction_at > survivor.last_interaction_at
+            ):
+                survivor.last_interaction_at = lead.last_interaction_at
+
+            note = f"Fusionado con {lead.email} (creado el {lead.created_at:%Y-%m-%d})"
+            notes.append(f"{note}: {lead.notes}" if lead.notes else note)
+        survivor.notes = '\n'.join(notes)
+
+        for lead in duplicates:
+            EventLogService.record(EventLogService.LEAD_MERGED, lead, {
+                'into': str(survivor.pk),
+                'source': lead.source,
+                'converted': lead.status == Lead.Status.CONVERTED,
+            })
+            lead.delete()
+        survivor.save()
+        if survivor.last_interaction_at:
+            # save() no escribe last_interaction_at (Lead.UPDATE_ONLY_FIELDS)
+            cls.touch_last_interaction(survivor.pk, survivor.last_interaction_at)
+
+        return survivor
+
+
+class LeadIntakeService:
+    """
+    Cola durable de entregas del webhook (modo asíncrono).
+    El webhook solo guarda la entrega; el worker las toma en lotes con
+    SELECT ... FOR UPDATE SKIP LOCKED (varios workers no se pisan) y las
+    procesa con LeadService.create_leads_from_webhook_batch.
+    """
+
+    BATCH_SIZE = 200
+    MAX_ATTEMPTS = 5
+    METRICS_WINDOW = timedelta(hours=1)
+
+    @classmethod
+    def enqueue(cls, data):
+        """
+        Guarda una entrega validada.
+
+        Returns:
+            LeadIntake: Entrega pendiente (su id es el recibo)
+        """
+        from apps.leads.models import LeadIntake
+
+        return LeadIntake.objects.create(payload=data)
+
+    @classmethod
+    def process_batch(cls, batch_size=None):
+        """
+        Procesa un lote de entregas pendientes en una transacción.
+        Si el lote falla, se reintenta ítem por ítem para aislar la
+        entrega problemática; tras MAX_ATTEMPTS queda como fallida.
+
+        Returns:
+            int: Entregas tomadas (0 si la cola está vacía)
+        """
+        from apps.leads.models import LeadIntake
+
+        with transaction.atomic():
+            intakes = list(
+                LeadIntake.objects.select_for_update(skip_locked=True).filter(
+                    status=LeadIntake.Status.PENDING
+                ).order_by('created_at')[:batch_size or cls.BATCH_SIZE]
+            )
+            if not intakes:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    outcomes = LeadService.create_leads_from_webhook_batch(
+                        [intake.payload for intake in intakes]
+                    )
+            except Exception:
+                outcomes = [cls._process_one(intake) for intake in intakes]
+
+            now = timezone.now()
+            for intake, (outcome, result) in zip(intakes, outcomes):
+                intake.attempts += 1
+                if outcome is None:
+                    intake.error = str(result)
+                    if intake.attempts >= cls.MAX_ATTEMPTS:
+                        intake.status = LeadIntake.Status.FAILED
+                        intake.processed_at = now
+                else:
+                    intake.status = outcome
+                    intake.lead = result
+                    intake.error = ''
+                    intake.processed_at = now
+
+            LeadIntake.objects.bulk_update(
+                intakes, ['status', 'lead', 'attempts', 'error', 'processed_at', 'updated_at']
+            )
+
+        return len(intakes)
+
+    @staticmethod
+    def _process_one(intake):
+        try:
+            with transaction.atomic():
+                lead, created = LeadService.create_lead_from_webhook(intake.payload)
+        except Exception as e:
+            return None, e
+        return ('created' if created else 'duplicate'), lead
+
+    @classmethod
+    def drain(cls, batch_size=None, max_batches=None):
+        """
+        Procesa lotes hasta vaciar la cola (o hasta max_batches).
+
+        Returns:
+            int: Entregas procesadas
+        """
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            processed = cls.process_batch(batch_size)
+            if not processed:
+                break
+            total += processed
+            batches += 1
+        return total
+
+    @classmethod
+    def metrics(cls):
+        """
+        Profundidad de la cola, retraso de la entrega más antigua y
+        rendimiento de la última hora.
+
+        Returns:
+            dict
+        """
+        from apps.leads.models import LeadIntake
+
+        now = timezone.now()
+        pending = LeadIntake.objects.filter(status=LeadIntake.Status.PENDING)
+        oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+
+        recent = LeadIntake.objects.filter(processed_at__gte=now - cls.METRICS_WINDOW).aggregate(
+            processed=Count('id'),
+            failed=Count('id', filter=Q(status=LeadIntake.Status.FAILED)),
+            avg_latency=Avg(F('processed_at') - F('created_at')),
+            max_latency=Max(F('processed_at') - F('created_at')),
+        )
+        window_minutes = cls.METRICS_WINDOW.total_seconds() / 60
+
+        return {
+            'queue_depth': pending.count(),
+            'lag_seconds': round((now - oldest).total_seconds(), 3) if oldest else 0,
+            'processed_last_hour': recent['processed'],
+            'failed_last_hour': recent['failed'],
+            'throughput_per_minute': round(recent['processed'] / window_minutes, 2),
+            'avg_latency_seconds': (
+                round(recent['avg_latency'].total_seconds(), 3) if recent['avg_latency'] else None
+            ),
+            'max_latency_seconds': (
+                round(recent['max_latency'].total_seconds(), 3) if recent['max_latency'] else None
+            ),
+        }
+
+    @classmethod
+    def purge(cls, older_than):
+        """
+        Elimina entregas ya procesadas antes de older_than.
+
+        Returns:
+            int: Entregas eliminadas
+        """
+        from apps.leads.models import LeadIntake
+
+        deleted, _ = LeadIntake.objects.exclude(
+            status=LeadIntake.Status.PENDING
+        ).filter(processed_at__lt=older_than).delete()
+        return deleted
+
+
+class WebhookIdempotencyService:
+    """
+    Claves de idempotencia del webhook (header Idempotency-Key).
+    La primera respuesta (< 500) para una clave se guarda y se repite a los
+    reintentos durante WEBHOOK_IDEMPOTENCY_TTL_HOURS. Reusar la clave con
+    otro cuerpo es un error del proveedor.
+    """
+
+    # Vigencia de la reserva de una clave mientras se procesa su request
+    PENDING_SECONDS = 300
+
+    @staticmethod
+    def fingerprint(data):
+        """Hash estable del cuerpo del request."""
+        encoded = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def reserve(cls, endpoint, key, request_hash):
+        """
+        Reserva la clave antes de procesar el request. La restricción única
+        hace que entre requests concurrentes con la misma clave solo uno la
+        obtenga; se confirma en su propia transacción para que los demás la
+        vean de inmediato. La reserva vence a los PENDING_SECONDS, por si el
+        proceso muere sin completarla.
+
+        Returns:
+            tuple: (WebhookIdempotencyKey, bool) - (registro vigente,
+                reservada por este request)
+        """
+        from apps.leads.models import WebhookIdempotencyKey
+
+        now = timezone.now()
+        with transaction.atomic():
+            WebhookIdempotencyKey.objects.filter(
+                endpoint=endpoint, key=key, expires_at__lte=now
+            ).delete()
+            return WebhookIdempotencyKey.objects.get_or_create(
+                endpoint=endpoint,
+                key=key,
+                defaults={
+                    'request_hash': request_hash,
+                    'expires_at': now + timedelta(seconds=cls.PENDING_SECONDS),
+                }
+            )
+
+    @classmethod
+    def complete(cls, record, response_status, response_body):
+        """Guarda la respuesta de una clave reservada (vigente por el TTL)."""
+        from apps.leads.models import WebhookIdempotencyKey
+
+        WebhookIdempotencyKey.objects.filter(pk=record.pk).update(
+            response_status=response_status,
+            response_body=response_body,
+            expires_at=timezone.now() + timedelta(hours=settings.WEBHOOK_IDEMPOTENCY_TTL_HOURS),
         )
 
-        if created:
-            cls.assign_lead_to_executive(lead)
+    @classmethod
+    def release(cls, record):
+        """Libera una clave reservada cuyo request falló, para que el reintento se procese."""
+        from apps.leads.models import WebhookIdempotencyKey
+
+        WebhookIdempotencyKey.objects.filter(pk=record.pk, response_status__isnull=True).delete()
+
+    @classmethod
+    def purge_expired(cls):
+        """
+        Elimina las claves vencidas.
+
+        Returns:
+            int: Claves eliminadas
+        """
+        from apps.leads.models import WebhookIdempotencyKey
+
+        deleted, _ = WebhookIdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class LeadDeduplicationService:
+    """
+    Detección y fusión de leads duplicados (comando dedupe_leads).
+
+    Solo revisa los leads pendientes (dedupe_checked_at nulo: nuevos desde
+    la última ejecución o con email/teléfono modificado), por lotes en
+    orden de creación. Para cada lote calcula las claves de bloqueo
+    (apps.leads.dedupe) y trae por índice los leads ya revisados que
+    comparten alguna: cada lead se compara solo con los de su bloque, no
+    con toda la tabla.
+
+    Comparten persona los leads con la misma clave de email, o con la
+    misma clave de teléfono y nombres compatibles. Los grupos se fusionan
+    con LeadService.merge_leads; sobrevive el lead convertido o, si no
+    hay, el más antiguo.
+    """
+
+    BATCH_SIZE = 1000
+    # Claves compartidas por más leads se ignoran (teléfonos genéricos, etc.)
+    MAX_BLOCK_SIZE = 50
+    CANDIDATE_FIELDS = (
+        'id', 'created_at', 'email', 'name', 'phone', 'dedupe_email_key', 'dedupe_phone_key'
+    )
+
+    @classmethod
+    def run(cls, batch_size=None, dry_run=False):
+        """
+        Revisa los leads pendientes y fusiona los duplicados.
+
+        Args:
+            batch_size: Leads pendientes por lote
+            dry_run: Revierte todos los cambios al terminar (solo reporta)
+
+        Returns:
+            dict: checked (leads revisados), groups (emails de cada grupo
+                encontrado), merged (leads eliminados por fusión) y
+                skipped (grupos con más de un lead convertido, no fusionados)
+        """
+        from apps.leads.dedupe import email_blocking_key, phone_blocking_key
+        from apps.leads.models import Lead
+
+        batch_size = batch_size or cls.BATCH_SIZE
+        result = {'checked': 0, 'groups': [], 'merged': 0, 'skipped': 0}
+        pending = Lead.objects.filter(dedupe_checked_at__isnull=True).only(
+            *cls.CANDIDATE_FIELDS
+        ).order_by('created_at', 'id')
+
+        # En simulación todo corre en una transacción que se revierte al final
+        with transaction.atomic() if dry_run else nullcontext():
+            position = None
+            while True:
+                batch = pending
+                if position is not None:
+                    created_at, pk = position
+                    batch = batch.filter(
+                        Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                    )
+                batch = list(batch[:batch_size])
+                if not batch:
+                    break
+                position = (batch[-1].created_at, batch[-1].pk)
+
+                now = timezone.now()
+                for lead in batch:
+                    lead.dedupe_email_key = email_blocking_key(lead.email)
+                    lead.dedupe_phone_key = phone_blocking_key(lead.phone)
+                    lead.dedupe_checked_at = now
+
+                with transaction.atomic():
+                    cls.store_keys(batch, now)
+                    for group in cls.find_groups(batch):
+                        result['groups'].append([lead.email for lead in group])
+                        merged = cls.merge_group([lead.pk for lead in group])
+                        if merged:
+                            result['merged'] += merged
+                        else:
+                            result['skipped'] += 1
+
+                result['checked'] += len(batch)
+
+            if dry_run:
+                transaction.set_rollback(True)
+
+        return result
+
+    @classmethod
+    def store_keys(cls, batch, checked_at):
+        """
+        Guarda las claves de bloqueo del lote y lo marca revisado con un
+        solo UPDATE ... FROM (VALUES ...) (bulk_update genera un CASE por
+        fila, mucho más lento en lotes grandes).
+        """
+        from apps.leads.models import Lead
+
+        quote = connection.ops.quote_name
+        params = []
+        for lead in batch:
+            params.extend([lead.pk, lead.dedupe_email_key, lead.dedupe_phone_key])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {quote(Lead._meta.db_table)} AS lead '
+                f'SET {quote("dedupe_email_key")} = keys.email_key, '
+                f'{quote("dedupe_phone_key")} = keys.phone_key, '
+                f'{quote("dedupe_checked_at")} = %s '
+                f'FROM (VALUES {", ".join(["(%s::uuid, %s, %s)"] * len(batch))}) '
+                f'AS keys (id, email_key, phone_key) '
+                f'WHERE lead.{quote("id")} = keys.id',
+                [checked_at, *params]
+            )
+
+    @classmethod
+    def find_groups(cls, batch):
+        """
+        Agrupa los leads del lote con los ya revisados de la misma persona.
+
+        Args:
+            batch: Leads del lote con sus claves de bloqueo calculadas
+
+        Returns:
+            list: Grupos (listas de Lead, de 2 o más) en orden de creación
+        """
+        from apps.leads.dedupe import names_compatible
+        from apps.leads.models import Lead
+
+        email_keys = {lead.dedupe_email_key for lead in batch}
+        phone_keys = {lead.dedupe_phone_key for lead in batch} - {''}
+        known = Lead.objects.filter(dedupe_checked_at__isnull=False).filter(
+            Q(dedupe_email_key__in=email_keys) | Q(dedupe_phone_key__in=phone_keys)
+        ).exclude(pk__in=[lead.pk for lead in batch]).only(*cls.CANDIDATE_FIELDS).order_by()
+
+        leads = {lead.pk: lead for lead in known}
+        leads.update((lead.pk, lead) for lead in batch)
+        email_blocks, phone_blocks = {}, {}
+        for lead in leads.values():
+            email_blocks.setdefault(lead.dedupe_email_key, []).append(lead)
+            if lead.dedupe_phone_key:
+                phone_blocks.setdefault(lead.dedupe_phone_key, []).append(lead)
+
+        # Union-find sobre los pares del lote con su bloque
+        parent = {}
+
+        def root(pk):
+            while parent.get(pk, pk) != pk:
+                pk = parent[pk]
+            return pk
+
+        for lead in batch:
+            candidates = [
+                (email_blocks[lead.dedupe_email_key], False),
+                (phone_blocks.get(lead.dedupe_phone_key, ()), True),
+            ]
+            for block, check_name in candidates:
+                if len(block) > cls.MAX_BLOCK_SIZE:
+                    continue
+                for other in block:
+                    if other.pk == lead.pk:
+                        continue
+                    if check_name and not names_compatible(lead.name, other.name):
+                        continue
+                    parent[root(other.pk)] = root(lead.pk)
+
+        groups = {}
+        for pk in parent.keys() | set(parent.values()):
+            groups.setdefault(root(pk), set()).add(pk)
+        return [
+            sorted((leads[pk] for pk in members), key=lambda lead: (lead.created_at, lead.pk))
+            for members in groups.values()
+            if len(members) > 1
+        ]
+
+    @classmethod
+    def merge_group(cls, lead_ids):
+        """
+        Fusiona un grupo de leads de la misma persona.
+
+        Returns:
+            int: Leads fusionados (0 si el grupo ya no existe o tiene más
+                de un lead convertido, que podrían ser personas distintas)
+        """
+        from apps.leads.models import Lead
+
+        with transaction.atomic():
+            leads = list(
+                Lead.objects.select_for_update().filter(pk__in=lead_ids).order_by('created_at', 'id')
+            )
+            converted = [lead for lead in leads if lead.converted_user_id is not None]
+            if len(leads) < 2 or len(converted) > 1:
+                return 0
+
+            survivor = converted[0] if converted else leads[0]
+            duplicates = [lead for lead in leads if lead is not survivor]
+            LeadService.merge_leads(survivor, duplicates)
 
-        return lead, created
+        return len(duplicates)
@@ -0,0 +1,195 @@
+"""
+Signals que mantienen User.active_leads_count.
+
+Un lead aporta 1 al contador de su ejecutivo mientras esté asignado y no
+esté en un estado cerrado (Lead.CLOSED_STATUSES). Al guardar o eliminar
+un lead se aplica la diferencia entre el aporte anterior y el nuevo con
+UPDATE ... SET active_leads_count = active_leads_count + delta, en la
+misma transacción.
+
+leads_bulk_created se emite tras insertar leads con bulk_create (que no
+dispara post_save), con los leads creados en `leads`.
+
+Los leads nuevos también se agregan al pre-filtro de emails
+(apps.leads.dedupe.LeadEmailFilter).
+
+Un lead cuyo email o teléfono cambia vuelve a quedar pendiente de la
+revisión de duplicados (dedupe_checked_at = NULL).
+
+Lead.last_interaction_at se adelanta al crear una LeadInteraction y se
+recalcula al eliminarla.
+
+El plan de despacho (apps.leads.assignment.LeadDispatcher) se invalida
+cuando cambia la configuración de asignación (perfiles, alta, baja o
+cambio de rol de ejecutivos) y cuando un ejecutivo pierde leads (cierre o
+reasignación), que el plan no ve al repartir.
+"""
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal
+
+from core import tracking
+from apps.leads.assignment import LeadDispatcher
+from apps.leads.dedupe import LeadEmailFilter
+from apps.leads.models import ExecutiveAssignmentProfile, Lead, LeadInteraction
+from apps.users.models import User
+
+TRACKED_FIELDS = ('assigned_to_id', 'status')
+USER_TRACKED_FIELDS = ('role', 'is_active')
+
+leads_bulk_created = Signal()
+
+
+def workload(values):
+    """Aporte de un lead a la carga de trabajo: {executive_id: 1} o {}."""
+    executive_id = values.get('assigned_to_id')
+    if executive_id is None or values.get('status') in Lead.CLOSED_STATUSES:
+        return Counter()
+    return Counter({executive_id: 1})
+
+
+def _current_values(instance):
+    return {name: getattr(instance, name) for name in TRACKED_FIELDS}
+
+
+def apply_workload_deltas(new, old):
+    """Aplica la diferencia entre dos aportes a los contadores de ejecutivos."""
+    from apps.leads.services import LeadService
+
+    deltas = Counter(new)
+    deltas.subtract(old)
+    LeadService.apply_workload_deltas(deltas)
+    if any(delta < 0 for delta in deltas.values()):
+        LeadDispatcher.invalidate()
+
+
+def update_workload_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = tracking.previous_values(instance)
+    old = workload(previous) if previous is not None else Counter()
+    apply_workload_deltas(workload(_current_values(instance)), old)
+
+
+def update_workload_on_delete(sender, instance, **kwargs):
+    loaded = tracking.loaded_values(instance)
+    values = loaded if loaded is not None else _current_values(instance)
+    apply_workload_deltas(Counter(), workload(values))
+
+
+def update_workload_on_bulk_create(sender, leads, **kwargs):
+    new = Counter()
+    for lead in leads:
+        new.update(workload(_current_values(lead)))
+    apply_workload_deltas(new, Counter())
+
+
+def add_to_email_filter_on_save(sender, instance, raw=False, **kwargs):
+    # También al editar: el email pudo cambiar
+    if not raw:
+        LeadEmailFilter.add([instance.email_normalized])
+
+
+def add_to_email_filter_on_bulk_create(sender, leads, **kwargs):
+    LeadEmailFilter.add(lead.email_normalized for lead in leads)
+
+
+def reset_dedupe_check_on_change(sender, instance, raw=False, **kwargs):
+    # Corre después del pre_save de core.tracking, que deja previous_values
+    previous = None if raw else tracking.previous_values(instance)
+    if previous and any(
+        previous.get(name) != getattr(instance, name) for name in Lead.DEDUPE_FIELDS
+    ):
+        instance.dedupe_checked_at = None
+
+
+def update_last_interaction_on_save(sender, instance, created=False, raw=False, **kwargs):
+    from apps.leads.services import LeadService
+
+    if created and not raw:
+        LeadService.touch_last_interaction(instance.lead_id, instance.created_at)
+
+
+def update_last_interaction_on_delete(sender, instance, **kwargs):
+    from apps.leads.services import LeadService
+
+    LeadService.refresh_last_interaction(instance.lead_id)
+
+
+def invalidate_dispatch_on_executive_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = tracking.previous_values(instance)
+    if previous is None:
+        changed = instance.role == User.Role.EXECUTIVE
+    else:
+        changed = any(
+            previous.get(name) != getattr(instance, name) for name in USER_TRACKED_FIELDS
+        ) and User.Role.EXECUTIVE in (previous.get('role'), instance.role)
+    if changed:
+        LeadDispatcher.invalidate()
+
+
+def invalidate_dispatch_on_executive_delete(sender, instance, **kwargs):
+    if instance.role == User.Role.EXECUTIVE:
+        LeadDispatcher.invalidate()
+
+
+def invalidate_dispatch_on_profile_change(sender, raw=False, **kwargs):
+    if not raw:
+        LeadDispatcher.invalidate()
+
+
+def connect():
+    """Registra el seguimiento de campos y los receivers de Lead."""
+    tracking.track_fields(Lead, TRACKED_FIELDS + Lead.DEDUPE_FIELDS)
+    post_save.connect(
+        update_workload_on_save, sender=Lead,
+        dispatch_uid='leads_workload_save'
+    )
+    pre_delete.connect(
+        update_workload_on_delete, sender=Lead,
+        dispatch_uid='leads_workload_delete'
+    )
+    leads_bulk_created.connect(
+        update_workload_on_bulk_create, sender=Lead,
+        dispatch_uid='leads_workload_bulk_create'
+    )
+    post_save.connect(
+        add_to_email_filter_on_save, sender=Lead,
+        dispatch_uid='leads_email_filter_save'
+    )
+    leads_bulk_created.connect(
+        add_to_email_filter_on_bulk_create, sender=Lead,
+        dispatch_uid='leads_email_filter_bulk_create'
+    )
+    pre_save.connect(
+        reset_dedupe_check_on_change, sender=Lead,
+        dispatch_uid='leads_dedupe_reset'
+    )
+    post_save.connect(
+        update_last_interaction_on_save, sender=LeadInteraction,
+        dispatch_uid='leads_last_interaction_save'
+    )
+    post_delete.connect(
+        update_last_interaction_on_delete, sender=LeadInteraction,
+        dispatch_uid='leads_last_interaction_delete'
+    )
+    tracking.track_fields(User, USER_TRACKED_FIELDS)
+    post_save.connect(
+        invalidate_dispatch_on_executive_save, sender=User,
+        dispatch_uid='leads_dispatch_executive_save'
+    )
+    post_delete.connect(
+        invalidate_dispatch_on_executive_delete, sender=User,
+        dispatch_uid='leads_dispatch_executive_delete'
+    )
+    post_save.connect(
+        invalidate_dispatch_on_profile_change, sender=ExecutiveAssignmentProfile,
+        dispatch_uid='leads_dispatch_profile_save'
+    )
+    post_delete.connect(
+        invalidate_dispatch_on_profile_change, sender=ExecutiveAssignmentProfile,
+        dispatch_uid='leads_dispatch_profile_delete'
+    )
@@ -5,17 +5,22 @@ from django.urls import path
 
 from .views import (
     LeadListView,
+    LeadExportView,
     MyLeadsView,
     LeadDetailView,
     LeadAssignView,
     LeadInteractionCreateView,
     LeadInteractionListView,
     LeadWebhookView,
+    LeadWebhookBatchView,
+    LeadIntakeStatusView,
+    LeadIntakeMetricsView,
 )
 
 urlpatterns = [
     path('', LeadListView.as_view(), name='lead_list'),
     path('my/', MyLeadsView.as_view(), name='my_leads'),
+    path('export/', LeadExportView.as_view(), name='lead_export'),
     path('<uuid:pk>/', LeadDetailView.as_view(), name='lead_detail'),
     path('<uuid:pk>/assign/', LeadAssignView.as_view(), name='lead_assign'),
     path('<uuid:pk>/interactions/', LeadInteractionListView.as_view(), name='lead_interactions'),
@@ -23,4 +28,7 @@ urlpatterns = [
 
     # Webhook externo
     path('webhook/', LeadWebhookView.as_view(), name='lead_webhook'),
+    path('webhook/batch/', LeadWebhookBatchView.as_view(), name='lead_webhook_batch'),
+    path('webhook/intake/metrics/', LeadIntakeMetricsView.as_view(), name='lead_intake_metrics'),
+    path('webhook/intake/<uuid:pk>/', LeadIntakeStatusView.as_view(), name='lead_intake_status'),
 ]
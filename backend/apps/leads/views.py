@@ -1,32 +1,43 @@
 """
 Lead views for SomosRentable API.
 """
+from datetime import timedelta
+
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import APIException
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.conf import settings
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 
-from .models import Lead, LeadInteraction
+from core import search
+from core.exports import streaming_export, queryset_rows
+from core.pagination import KeysetPagination
+from .models import Lead, LeadInteraction, LeadIntake
 from .serializers import (
     LeadSerializer,
     LeadDetailSerializer,
     LeadUpdateSerializer,
     LeadWebhookSerializer,
+    LeadWebhookBatchSerializer,
     LeadInteractionSerializer,
     LeadAssignSerializer,
 )
-from .services import LeadService
+from .services import LeadService, LeadIntakeService, WebhookIdempotencyService
 from apps.users.models import User
 from apps.users.views import IsAdminOrExecutive, IsAdmin
 
 
-class LeadListView(generics.ListAPIView):
+class LeadFilterMixin(search.SearchMixin):
     """
-    Listar leads (admin/ejecutivo).
+    Queryset de leads visible para el usuario, con los filtros ?status=,
+    ?source= y ?stale_days= (abiertos sin interacciones en N días, según
+    last_interaction_at) y la búsqueda ?q= (email, nombre o teléfono,
+    ordenada por relevancia, ver core.search). Compartido por el listado y
+    la exportación.
     """
-    serializer_class = LeadSerializer
-    permission_classes = [IsAdminOrExecutive]
 
     def get_queryset(self):
         queryset = Lead.objects.select_related(
@@ -46,9 +57,63 @@ class LeadListView(generics.ListAPIView):
         if source:
             queryset = queryset.filter(source=source)
 
+        stale_days = self.request.query_params.get('stale_days')
+        if stale_days and stale_days.isdigit():
+            cutoff = timezone.now() - timedelta(days=int(stale_days))
+            queryset = queryset.exclude(status__in=Lead.CLOSED_STATUSES).filter(
+                Q(last_interaction_at__lt=cutoff)
+                | Q(last_interaction_at__isnull=True, created_at__lt=cutoff)
+            )
+
+        query = self.request.query_params.get('q')
+        if query:
+            return self.apply_search(
+                queryset, query, Lead.SEARCH_FIELDS, ('-search_rank', '-created_at')
+            )
+
         return queryset.order_by('-created_at')
 
 
+class LeadListView(LeadFilterMixin, generics.ListAPIView):
+    """
+    Listar leads (admin/ejecutivo).
+    Con ?pagination=cursor pagina por (created_at, id) sin COUNT ni OFFSET
+    (en ese modo ?q= filtra pero no reordena por relevancia).
+    """
+    serializer_class = LeadSerializer
+    permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
+
+
+class LeadExportView(LeadFilterMixin, APIView):
+    """
+    Exportar leads en streaming (admin/ejecutivo).
+    Mismos filtros que el listado; ?output=csv|ndjson.
+    """
+    permission_classes = [IsAdminOrExecutive]
+
+    EXPORT_FIELDS = (
+        ('id', 'id'),
+        ('email', 'email'),
+        ('name', 'name'),
+        ('phone', 'phone'),
+        ('source', 'source'),
+        ('source_detail', 'source_detail'),
+        ('status', 'status'),
+        ('assigned_to', 'assigned_to__email'),
+        ('assigned_at', 'assigned_at'),
+        ('interested_project', 'interested_project__title'),
+        ('converted_at', 'converted_at'),
+        ('created_at', 'created_at'),
+    )
+
+    def get(self, request):
+        columns, fields = zip(*self.EXPORT_FIELDS)
+        return streaming_export(
+            request, 'leads', columns, queryset_rows(self.search_results(), fields)
+        )
+
+
 class MyLeadsView(generics.ListAPIView):
     """
     Listar mis leads asignados (ejecutivo).
@@ -69,7 +134,7 @@ class LeadDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAdminOrExecutive]
     queryset = Lead.objects.select_related(
         'assigned_to', 'interested_project', 'converted_user'
-    ).prefetch_related('interactions')
+    )
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -132,14 +197,18 @@ class LeadInteractionCreateView(generics.CreateAPIView):
 
 class LeadInteractionListView(generics.ListAPIView):
     """
-    Ver interacciones de un lead.
+    Ver interacciones de un lead (más recientes primero).
+    Paginación por cursor opcional con ?pagination=cursor.
     """
     serializer_class = LeadInteractionSerializer
     permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         lead_id = self.kwargs.get('pk')
-        return LeadInteraction.objects.filter(lead_id=lead_id).order_by('-created_at')
+        return LeadInteraction.objects.filter(lead_id=lead_id).select_related(
+            'executive'
+        ).order_by('-created_at', '-id')
 
 
 class WebhookAPIKeyPermission(permissions.BasePermission):
@@ -150,16 +219,89 @@ class WebhookAPIKeyPermission(permissions.BasePermission):
         return api_key == settings.WEBHOOK_API_KEY
 
 
-class LeadWebhookView(APIView):
+class IdempotentWebhookMixin:
+    """
+    Soporte del header Idempotency-Key en los webhooks.
+    La clave se reserva antes de procesar el request: un reintento
+    concurrente recibe 409 (con Retry-After) mientras el primero sigue en
+    curso. La primera respuesta (< 500) se guarda y los reintentos la
+    reciben de nuevo (con header Idempotent-Replayed) sin reprocesarse;
+    también los errores 4xx de DRF (p. ej. ValidationError).
+    Si el request falla (otra excepción o 5xx) la clave se libera.
+    Las vistas implementan handle_post() en lugar de post().
+    """
+    idempotency_endpoint = None
+
+    def post(self, request):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return self.handle_post(request)
+        if len(key) > 255:
+            return Response(
+                {'error': 'Idempotency-Key no puede superar 255 caracteres.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        request_hash = WebhookIdempotencyService.fingerprint(request.data)
+        record, reserved = WebhookIdempotencyService.reserve(
+            self.idempotency_endpoint, key, request_hash
+        )
+        if reserved:
+            try:
+                response = self.handle_post(request)
+            except APIException as exc:
+                if exc.status_code >= 500:
+                    WebhookIdempotencyService.release(record)
+                    raise
+                response = self.handle_exception(exc)
+            except Exception:
+                WebhookIdempotencyService.release(record)
+                raise
+            if response.status_code >= 500:
+                WebhookIdempotencyService.release(record)
+            else:
+                WebhookIdempotencyService.complete(record, response.status_code, response.data)
+            return response
+
+        if record.request_hash != request_hash:
+            return Response(
+                {'error': 'Idempotency-Key ya fue usada con otro contenido.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        if record.is_pending:
+            response = Response(
+                {'error': 'Hay un request en curso con esta Idempotency-Key.'},
+                status=status.HTTP_409_CONFLICT
+            )
+            response['Retry-After'] = '1'
+            return response
+
+        response = Response(record.response_body, status=record.response_status)
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+
+class LeadWebhookView(IdempotentWebhookMixin, APIView):
     """
     Recibir leads desde webhook externo.
+    Con WEBHOOK_ASYNC_INTAKE solo se valida y encola la entrega, y se
+    responde 202 con un recibo consultable.
     """
     permission_classes = [WebhookAPIKeyPermission]
+    idempotency_endpoint = 'webhook'
 
-    def post(self, request):
+    def handle_post(self, request):
         serializer = LeadWebhookSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        if settings.WEBHOOK_ASYNC_INTAKE:
+            intake = LeadIntakeService.enqueue(serializer.validated_data)
+            return Response({
+                'message': 'Lead recibido para procesamiento.',
+                'receipt_id': str(intake.id),
+                'status_url': reverse('lead_intake_status', kwargs={'pk': intake.id}),
+            }, status=status.HTTP_202_ACCEPTED)
+
         lead, created = LeadService.create_lead_from_webhook(serializer.validated_data)
 
         if created:
@@ -172,3 +314,79 @@ class LeadWebhookView(APIView):
                 'message': 'Lead ya existe.',
                 'lead_id': str(lead.id)
             }, status=status.HTTP_409_CONFLICT)
+
+
+class LeadIntakeStatusView(APIView):
+    """
+    Estado de una entrega del webhook asíncrono (por su recibo).
+    """
+    permission_classes = [WebhookAPIKeyPermission]
+
+    def get(self, request, pk):
+        intake = LeadIntake.objects.filter(pk=pk).first()
+        if intake is None:
+            return Response(
+                {'error': 'Recibo no encontrado.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            'receipt_id': str(intake.id),
+            'status': intake.status,
+            'lead_id': str(intake.lead_id) if intake.lead_id else None,
+            'attempts': intake.attempts,
+            'error': intake.error,
+            'received_at': intake.created_at,
+            'processed_at': intake.processed_at,
+        })
+
+
+class LeadIntakeMetricsView(APIView):
+    """
+    Métricas de la cola del webhook asíncrono (admin):
+    profundidad, retraso y rendimiento de la última hora.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(LeadIntakeService.metrics())
+
+
+class LeadWebhookBatchView(IdempotentWebhookMixin, APIView):
+    """
+    Recibir leads en lote desde webhook externo.
+    Body: {"leads": [{email, name, phone, source, notes}, ...]}
+    Retorna el resultado de cada ítem en el mismo orden:
+    created, duplicate o invalid.
+    """
+    permission_classes = [WebhookAPIKeyPermission]
+    idempotency_endpoint = 'webhook_batch'
+
+    def handle_post(self, request):
+        serializer = LeadWebhookBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        items = []
+        errors = {}
+        for index, raw in enumerate(serializer.validated_data['leads']):
+            item = LeadWebhookSerializer(data=raw if isinstance(raw, dict) else {})
+            if item.is_valid():
+                items.append(item.validated_data)
+            else:
+                items.append(None)
+                errors[index] = item.errors
+
+        outcomes = LeadService.create_leads_from_webhook_batch(items)
+
+        results = []
+        summary = {'created': 0, 'duplicate': 0, 'invalid': 0}
+        for index, (outcome, lead) in enumerate(outcomes):
+            summary[outcome] += 1
+            result = {'index': index, 'status': outcome}
+            if lead is not None:
+                result['lead_id'] = str(lead.id)
+            if index in errors:
+                result['errors'] = errors[index]
+            results.append(result)
+
+        return Response({**summary, 'results': results})
@@ -88,6 +88,10 @@ class PaymentProof(BaseModel):
         verbose_name = 'Comprobante de Pago'
         verbose_name_plural = 'Comprobantes de Pago'
         ordering = ['-created_at']
+        indexes = [
+            # Paginación por cursor de pendientes (core.pagination)
+            models.Index(fields=['status', 'created_at', 'id'], name='payment_proofs_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"Pago {self.investment.user.email} - ${self.amount}"
@@ -1,6 +1,7 @@
 """
 Payment Service - Lógica de negocio para gestión de pagos.
 """
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -24,26 +25,50 @@ class PaymentService:
         """
         from apps.payments.models import PaymentProof
         from apps.investments.models import Investment
-
-        # Actualizar comprobante
-        payment_proof.status = PaymentProof.Status.APPROVED
-        payment_proof.reviewed_by = reviewer
-        payment_proof.reviewed_at = timezone.now()
-        payment_proof.save()
-
-        # Activar inversión
-        investment = payment_proof.investment
-        investment.status = Investment.Status.ACTIVE
-        investment.activated_at = timezone.now()
-        investment.expected_end_date = (
-            timezone.now() + timedelta(days=30 * investment.duration_months_snapshot)
-        ).date()
-        investment.save()
-
-        # Actualizar monto recaudado del proyecto
-        project = investment.project
-        project.current_amount += investment.amount
-        project.save()
+        from apps.statistics.events import EventLogService
+        from apps.statistics.leaderboard import LeaderboardService
+
+        # Comprobante, inversión, proyecto y contadores de estadísticas
+        # se actualizan en una sola transacción
+        with transaction.atomic():
+            # Actualizar comprobante
+            payment_proof.status = PaymentProof.Status.APPROVED
+            payment_proof.reviewed_by = reviewer
+            payment_proof.reviewed_at = timezone.now()
+            payment_proof.save()
+
+            # Activar inversión
+            investment = payment_proof.investment
+            already_active = investment.status == Investment.Status.ACTIVE
+            investment.status = Investment.Status.ACTIVE
+            investment.activated_at = timezone.now()
+            investment.expected_end_date = (
+                timezone.now() + timedelta(days=30 * investment.duration_months_snapshot)
+            ).date()
+            investment.save()
+
+            # Actualizar monto recaudado del proyecto
+            project = investment.project
+            project.current_amount += investment.amount
+            project.save()
+
+            if not already_active:
+                LeaderboardService.record_investment(
+                    investment.user.assigned_executive_id,
+                    investment.amount,
+                    investment.activated_at
+                )
+                EventLogService.record(
+                    EventLogService.INVESTMENT_ACTIVATED,
+                    investment,
+                    {
+                        'project_id': str(project.id),
+                        'user_id': str(investment.user_id),
+                        'amount': investment.amount,
+                        'expected_return': investment.expected_return,
+                    },
+                    investment.activated_at
+                )
 
         return investment
 
@@ -59,17 +84,26 @@ class PaymentService:
         """
         from apps.payments.models import PaymentProof
         from apps.investments.models import Investment
-
-        payment_proof.status = PaymentProof.Status.REJECTED
-        payment_proof.reviewed_by = reviewer
-        payment_proof.reviewed_at = timezone.now()
-        payment_proof.rejection_reason = reason
-        payment_proof.save()
-
-        # Volver inversión a estado pendiente de pago
-        investment = payment_proof.investment
-        investment.status = Investment.Status.PENDING_PAYMENT
-        investment.save()
+        from apps.statistics.events import EventLogService
+
+        with transaction.atomic():
+            payment_proof.status = PaymentProof.Status.REJECTED
+            payment_proof.reviewed_by = reviewer
+            payment_proof.reviewed_at = timezone.now()
+            payment_proof.rejection_reason = reason
+            payment_proof.save()
+
+            # Volver inversión a estado pendiente de pago
+            investment = payment_proof.investment
+            investment.status = Investment.Status.PENDING_PAYMENT
+            investment.save()
+
+            EventLogService.record(
+                EventLogService.PAYMENT_REJECTED,
+                payment_proof,
+                {'investment_id': str(investment.id), 'amount': payment_proof.amount},
+                payment_proof.reviewed_at
+            )
 
     @classmethod
     def upload_payment_proof(cls, investment, proof_image, amount, **kwargs):
@@ -5,6 +5,7 @@ from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from core.pagination import ASCENDING, KeysetPagination
 from .models import PaymentProof
 from .serializers import (
     PaymentProofSerializer,
@@ -65,9 +66,12 @@ class PaymentProofUploadView(APIView):
 class PendingPaymentsView(generics.ListAPIView):
     """
     Listar comprobantes pendientes de revisión (admin/ejecutivo).
+    Paginación por cursor opcional con ?pagination=cursor (más antiguos primero).
     """
     serializer_class = PaymentProofSerializer
     permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
+    cursor_ordering = ASCENDING
 
     def get_queryset(self):
         return PaymentProof.objects.filter(
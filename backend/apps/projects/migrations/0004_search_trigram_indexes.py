@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:27
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('projects', '0003_project_main_image_url_alter_project_main_image'),
+        ('users', '0003_search_trigram_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='projects_title_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('location'), name='gin_trgm_ops'), name='projects_location_trgm_idx'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 """
 Project models for SomosRentable.
 """
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from decimal import Decimal
 from core.models import BaseModel
@@ -138,11 +140,18 @@ class Project(BaseModel):
         verbose_name='Destacado'
     )
 
+    # Columnas de la búsqueda ?q= (índice trigram sobre UPPER de cada una)
+    SEARCH_FIELDS = ('title', 'location')
+
     class Meta:
         db_table = 'projects'
         verbose_name = 'Proyecto'
         verbose_name_plural = 'Proyectos'
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='projects_title_trgm_idx'),
+            GinIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='projects_location_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.title
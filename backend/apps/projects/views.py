@@ -6,6 +6,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from decimal import Decimal
 
+from core import search
 from .models import Project, ProjectImage
 from .serializers import (
     ProjectListSerializer,
@@ -18,9 +19,10 @@ from .serializers import (
 from apps.users.views import IsAdmin
 
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(search.SearchMixin, generics.ListAPIView):
     """
     Listar proyectos disponibles (público).
+    Búsqueda por título o ubicación con ?q=, ordenada por relevancia.
     """
     serializer_class = ProjectListSerializer
     permission_classes = [permissions.AllowAny]
@@ -39,6 +41,13 @@ class ProjectListView(generics.ListAPIView):
         if location:
             queryset = queryset.filter(location__icontains=location)
 
+        query = self.request.query_params.get('q')
+        if query:
+            return self.apply_search(
+                queryset, query, Project.SEARCH_FIELDS,
+                ('-search_rank', '-is_featured', '-created_at')
+            )
+
         return queryset.order_by('-is_featured', '-created_at')
 
 
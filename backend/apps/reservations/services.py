@@ -1,6 +1,7 @@
 """
 Reservation Service - Lógica de negocio para gestión de reservas.
 """
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
@@ -34,6 +35,7 @@ class ReservationService:
         """
         from apps.reservations.models import Reservation
         from apps.leads.services import LeadService
+        from apps.statistics.events import EventLogService
 
         # Validar monto mínimo
         if amount < project.minimum_investment:
@@ -46,20 +48,22 @@ class ReservationService:
         if project.status != Project.Status.FUNDING:
             raise ValueError("El proyecto no está disponible para inversión")
 
-        # Crear reserva
-        reservation = Reservation.objects.create(
-            email=email,
-            name=name,
-            phone=phone,
-            project=project,
-            amount=amount,
-            expires_at=timezone.now() + timedelta(days=cls.RESERVATION_VALIDITY_DAYS)
-        )
+        with transaction.atomic():
+            # Crear reserva
+            reservation = Reservation.objects.create(
+                email=email,
+                name=name,
+                phone=phone,
+                project=project,
+                amount=amount,
+                expires_at=timezone.now() + timedelta(days=cls.RESERVATION_VALIDITY_DAYS)
+            )
+            cls._record(EventLogService.RESERVATION_CREATED, reservation, reservation.created_at)
 
-        # Crear/actualizar lead
-        lead = LeadService.create_lead_from_reservation(reservation)
-        reservation.lead = lead
-        reservation.save()
+            # Crear/actualizar lead
+            lead = LeadService.create_lead_from_reservation(reservation)
+            reservation.lead = lead
+            reservation.save()
 
         return reservation
 
@@ -81,6 +85,7 @@ class ReservationService:
         from apps.investments.models import Investment
         from apps.reservations.models import Reservation
         from apps.leads.services import LeadService
+        from apps.statistics.events import EventLogService
 
         # Validaciones
         if not user.is_kyc_verified:
@@ -90,32 +95,36 @@ class ReservationService:
             raise ValueError("La reserva no está disponible para conversión")
 
         if reservation.is_expired:
-            reservation.status = Reservation.Status.EXPIRED
-            reservation.save()
+            with transaction.atomic():
+                reservation.status = Reservation.Status.EXPIRED
+                reservation.save()
+                cls._record(EventLogService.RESERVATION_EXPIRED, reservation)
             raise ValueError("La reserva ha expirado")
 
         # Verificar que el email coincida
         if reservation.email.lower() != user.email.lower():
             raise ValueError("El email de la reserva no coincide con su cuenta")
 
-        # Crear inversión
-        investment = Investment.objects.create(
-            user=user,
-            project=reservation.project,
-            amount=reservation.amount,
-            annual_return_rate_snapshot=reservation.project.annual_return_rate,
-            duration_months_snapshot=reservation.project.duration_months
-        )
+        with transaction.atomic():
+            # Crear inversión
+            investment = Investment.objects.create(
+                user=user,
+                project=reservation.project,
+                amount=reservation.amount,
+                annual_return_rate_snapshot=reservation.project.annual_return_rate,
+                duration_months_snapshot=reservation.project.duration_months
+            )
 
-        # Actualizar reserva
-        reservation.status = Reservation.Status.CONVERTED
-        reservation.converted_user = user
-        reservation.converted_investment = investment
-        reservation.save()
+            # Actualizar reserva
+            reservation.status = Reservation.Status.CONVERTED
+            reservation.converted_user = user
+            reservation.converted_investment = investment
+            reservation.save()
+            cls._record(EventLogService.RESERVATION_CONVERTED, reservation)
 
-        # Actualizar lead si existe
-        if reservation.lead:
-            LeadService.convert_lead_to_investor(reservation.lead, user)
+            # Actualizar lead si existe
+            if reservation.lead:
+                LeadService.convert_lead_to_investor(reservation.lead, user)
 
         return investment
 
@@ -164,10 +173,13 @@ class ReservationService:
             reservation: Reserva a cancelar
         """
         from apps.reservations.models import Reservation
+        from apps.statistics.events import EventLogService
 
         if reservation.status == Reservation.Status.PENDING:
-            reservation.status = Reservation.Status.CANCELLED
-            reservation.save()
+            with transaction.atomic():
+                reservation.status = Reservation.Status.CANCELLED
+                reservation.save()
+                cls._record(EventLogService.RESERVATION_CANCELLED, reservation)
 
     @classmethod
     def expire_old_reservations(cls):
@@ -179,10 +191,45 @@ class ReservationService:
             int: Número de reservas expiradas
         """
         from apps.reservations.models import Reservation
+        from apps.statistics.events import EventLogService
+
+        now = timezone.now()
+        with transaction.atomic():
+            # Bloquear las filas para registrar exactamente las que expiran
+            expired = list(
+                Reservation.objects.select_for_update(skip_locked=True).filter(
+                    status=Reservation.Status.PENDING,
+                    expires_at__lt=now
+                ).only('id', 'project_id', 'amount')
+            )
+            if not expired:
+                return 0
+
+            Reservation.objects.filter(
+                id__in=[reservation.id for reservation in expired]
+            ).update(status=Reservation.Status.EXPIRED, updated_at=now)
+
+            EventLogService.record_many(
+                EventLogService.build(
+                    EventLogService.RESERVATION_EXPIRED,
+                    reservation,
+                    cls._event_payload(reservation),
+                    now
+                )
+                for reservation in expired
+            )
+
+        return len(expired)
 
-        expired_count = Reservation.objects.filter(
-            status=Reservation.Status.PENDING,
-            expires_at__lt=timezone.now()
-        ).update(status=Reservation.Status.EXPIRED)
+    @staticmethod
+    def _event_payload(reservation):
+        return {'project_id': str(reservation.project_id), 'amount': reservation.amount}
 
-        return expired_count
+    @classmethod
+    def _record(cls, event_type, reservation, occurred_at=None):
+        """Registra un evento de la reserva en el registro de dominio."""
+        from apps.statistics.events import EventLogService
+
+        EventLogService.record(
+            event_type, reservation, cls._event_payload(reservation), occurred_at
+        )
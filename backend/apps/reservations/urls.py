@@ -9,11 +9,13 @@ from .views import (
     MyReservationsView,
     ReservationConvertView,
     ReservationCancelView,
+    ReservationExportView,
 )
 
 urlpatterns = [
     path('', ReservationCreateView.as_view(), name='reservation_create'),
     path('my/', MyReservationsView.as_view(), name='my_reservations'),
+    path('export/', ReservationExportView.as_view(), name='reservation_export'),
     path('<str:token>/', ReservationByTokenView.as_view(), name='reservation_by_token'),
     path('<str:token>/convert/', ReservationConvertView.as_view(), name='reservation_convert'),
     path('<str:token>/cancel/', ReservationCancelView.as_view(), name='reservation_cancel'),
@@ -1,10 +1,12 @@
 """
 Reservation views for SomosRentable API.
 """
+from django.core.exceptions import ValidationError
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from core.exports import streaming_export, queryset_rows
 from .models import Reservation
 from .serializers import (
     ReservationSerializer,
@@ -15,6 +17,7 @@ from .serializers import (
 from .services import ReservationService
 from apps.projects.models import Project
 from apps.investments.serializers import InvestmentSerializer
+from apps.users.views import IsAdmin
 
 
 class ReservationCreateView(APIView):
@@ -128,3 +131,54 @@ class ReservationCancelView(APIView):
         ReservationService.cancel_reservation(reservation)
 
         return Response({'message': 'Reserva cancelada.'})
+
+
+class ReservationExportView(APIView):
+    """
+    Exportar reservas en streaming (admin).
+    Filtros: ?status=, ?project=, ?email=; formato ?output=csv|ndjson.
+    """
+    permission_classes = [IsAdmin]
+
+    EXPORT_FIELDS = (
+        ('id', 'id'),
+        ('email', 'email'),
+        ('name', 'name'),
+        ('phone', 'phone'),
+        ('project_id', 'project_id'),
+        ('project_title', 'project__title'),
+        ('amount', 'amount'),
+        ('status', 'status'),
+        ('lead_id', 'lead_id'),
+        ('converted_investment_id', 'converted_investment_id'),
+        ('expires_at', 'expires_at'),
+        ('created_at', 'created_at'),
+    )
+
+    def get_queryset(self):
+        queryset = Reservation.objects.all()
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+
+        project = self.request.query_params.get('project')
+        if project:
+            queryset = queryset.filter(project_id=project)
+
+        email = self.request.query_params.get('email')
+        if email:
+            queryset = queryset.filter(email__iexact=email)
+
+        return queryset.order_by('-created_at')
+
+    def get(self, request):
+        columns, fields = zip(*self.EXPORT_FIELDS)
+        try:
+            rows = queryset_rows(self.get_queryset(), fields)
+            return streaming_export(request, 'reservas', columns, rows)
+        except ValidationError:
+            return Response(
+                {'error': 'Filtro inválido.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
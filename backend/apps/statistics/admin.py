@@ -1,4 +1,69 @@
 from django.contrib import admin
+from .models import (
+    PlatformStatistics, DailyPlatformRollup, DailyLeadSourceRollup, WeeklyLeadCohortConversion,
+    DomainEvent, StatisticsCheckpoint
+)
 
-# Statistics app no tiene modelos propios
-# Las estadísticas se calculan en tiempo real
+
+@admin.register(PlatformStatistics)
+class PlatformStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('scope', 'total_investors', 'total_projects', 'active_investments_count', 'total_leads', 'updated_at')
+    readonly_fields = PlatformStatistics.COUNTER_FIELDS + ('scope', 'created_at', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(DailyPlatformRollup)
+class DailyPlatformRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'new_investors', 'activated_investments_count', 'activated_investments_amount', 'updated_at')
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(DailyLeadSourceRollup)
+class DailyLeadSourceRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'source', 'new_leads', 'conversions', 'updated_at')
+    list_filter = ('source',)
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(WeeklyLeadCohortConversion)
+class WeeklyLeadCohortConversionAdmin(admin.ModelAdmin):
+    list_display = ('cohort_week', 'source', 'weeks_to_convert', 'conversions', 'updated_at')
+    list_filter = ('source',)
+    date_hierarchy = 'cohort_week'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(DomainEvent)
+class DomainEventAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'aggregate_type', 'aggregate_id', 'occurred_at', 'recorded_at')
+    list_filter = ('event_type', 'aggregate_type')
+    search_fields = ('aggregate_id',)
+    date_hierarchy = 'occurred_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StatisticsCheckpoint)
+class StatisticsCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('as_of', 'events_count', 'created_at')
+    date_hierarchy = 'as_of'
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,143 @@
+"""
+Cache de resultados de StatisticsService.
+
+Cada entrada pertenece a un grupo (platform, executives, projects,
+lead_sources, timeseries, cohorts). Las claves incluyen la generación actual del
+grupo, de modo que invalidar un grupo solo requiere incrementar su
+generación; funciona igual con Redis y con el backend de memoria local.
+
+Protección contra estampidas: ante un miss, solo el proceso que obtiene
+el lock (cache.add) calcula el valor; los demás esperan a que aparezca.
+"""
+import functools
+import hashlib
+import time
+import uuid
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+
+
+class StatisticsCache:
+    """Operaciones sobre el cache de estadísticas."""
+
+    PREFIX = 'statistics'
+    POLL_INTERVAL = 0.05
+
+    _MISSING = object()
+
+    @classmethod
+    def ttl(cls, group):
+        return settings.STATISTICS_CACHE_TTLS.get(group, 0)
+
+    @classmethod
+    def generation(cls, group):
+        """
+        Generación actual del grupo. Se inicializa con un valor basado en el
+        reloj para que una clave expulsada no reutilice generaciones antiguas.
+        """
+        key = f'{cls.PREFIX}:gen:{group}'
+        value = cache.get(key)
+        if value is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            value = cache.get(key)
+        return value
+
+    @classmethod
+    def invalidate(cls, *groups):
+        """
+        Invalida los grupos indicados de inmediato y nuevamente al hacer commit,
+        para descartar valores calculados con datos aún no confirmados.
+        """
+        cls._bump(groups)
+        transaction.on_commit(lambda: cls._bump(groups))
+
+    @classmethod
+    def _bump(cls, groups):
+        for group in groups:
+            key = f'{cls.PREFIX}:gen:{group}'
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), timeout=None)
+
+    @classmethod
+    def get_or_compute(cls, group, name, compute):
+        """
+        Retorna el valor en cache o lo calcula una sola vez.
+
+        Args:
+            group: Grupo de invalidación
+            name: Identificador de la entrada dentro del grupo
+            compute: Función sin argumentos que calcula el valor
+
+        Returns:
+            El valor cacheado o recién calculado
+        """
+        ttl = cls.ttl(group)
+        if not ttl:
+            return compute()
+
+        key = f'{cls.PREFIX}:{group}:{cls.generation(group)}:{name}'
+        value = cache.get(key, cls._MISSING)
+        if value is not cls._MISSING:
+            return value
+
+        lock_key = f'{key}:lock'
+        lock_timeout = settings.STATISTICS_CACHE_LOCK_TIMEOUT
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout=lock_timeout):
+            try:
+                value = compute()
+                cache.set(key, value, timeout=ttl)
+                return value
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        # Otro proceso está calculando: esperar su resultado
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(cls.POLL_INTERVAL)
+            value = cache.get(key, cls._MISSING)
+            if value is not cls._MISSING:
+                return value
+            if cache.get(lock_key) is None:
+                break
+
+        return compute()
+
+
+def _key_part(value):
+    if isinstance(value, models.Model):
+        return str(value.pk)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ','.join(_key_part(item) for item in value)
+    if value is None:
+        return '-'
+    return str(value)
+
+
+def cached_statistics(group):
+    """
+    Decorador para métodos de StatisticsService (aplicar bajo @classmethod).
+    La clave se forma con el nombre del método y sus argumentos; instancias
+    de modelos se identifican por su pk.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            parts = [_key_part(arg) for arg in args]
+            parts += [f'{name}={_key_part(kwargs[name])}' for name in sorted(kwargs)]
+            digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+            return StatisticsCache.get_or_compute(
+                group,
+                f'{func.__name__}:{digest}',
+                lambda: func(cls, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
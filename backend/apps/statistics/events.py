@@ -0,0 +1,374 @@
+"""
+Registro de eventos de dominio y estadísticas a una fecha dada.
+
+Los servicios de pagos, KYC, leads y reservas registran cada transición de
+estado como un DomainEvent dentro de su misma transacción. Cada tipo de
+evento se proyecta a deltas sobre un conjunto de contadores acumulados
+(COUNTERS). El estado en un instante T se obtiene partiendo del último
+StatisticsCheckpoint con as_of <= T y sumando los eventos ocurridos entre
+ambos, por lo que nunca se reproduce la historia completa.
+
+Los checkpoints se crean con un margen (CHECKPOINT_LAG) respecto del
+presente para no dejar fuera eventos de transacciones aún no confirmadas.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+
+def _amount(payload, key='amount'):
+    return Decimal(payload.get(key) or '0')
+
+
+class EventLogService:
+    """Servicio del registro de eventos de dominio."""
+
+    INVESTMENT_ACTIVATED = 'investment.activated'
+    PAYMENT_REJECTED = 'payment.rejected'
+    KYC_APPROVED = 'kyc.approved'
+    KYC_REJECTED = 'kyc.rejected'
+    LEAD_CREATED = 'lead.created'
+    LEAD_CONVERTED = 'lead.converted'
+    LEAD_MERGED = 'lead.merged'
+    RESERVATION_CREATED = 'reservation.created'
+    RESERVATION_CONVERTED = 'reservation.converted'
+    RESERVATION_CANCELLED = 'reservation.cancelled'
+    RESERVATION_EXPIRED = 'reservation.expired'
+
+    COUNTERS = {
+        'verified_investors': int,
+        'activated_investments_count': int,
+        'invested_amount': Decimal,
+        'expected_returns': Decimal,
+        'rejected_payments': int,
+        'total_leads': int,
+        'converted_leads': int,
+        'pending_reservations_count': int,
+        'pending_reservations_amount': Decimal,
+    }
+
+    PROJECTIONS = {
+        INVESTMENT_ACTIVATED: lambda p: {
+            'activated_investments_count': 1,
+            'invested_amount': _amount(p),
+            'expected_returns': _amount(p, 'expected_return'),
+        },
+        PAYMENT_REJECTED: lambda p: {'rejected_payments': 1},
+        KYC_APPROVED: lambda p: {'verified_investors': 1},
+        KYC_REJECTED: lambda p: {},
+        LEAD_CREATED: lambda p: {'total_leads': 1},
+        LEAD_CONVERTED: lambda p: {'converted_leads': 1},
+        LEAD_MERGED: lambda p: {
+            'total_leads': -1,
+            'converted_leads': -1 if p.get('converted') else 0,
+        },
+        RESERVATION_CREATED: lambda p: {
+            'pending_reservations_count': 1,
+            'pending_reservations_amount': _amount(p),
+        },
+        RESERVATION_CONVERTED: lambda p: {
+            'pending_reservations_count': -1,
+            'pending_reservations_amount': -_amount(p),
+        },
+        RESERVATION_CANCELLED: lambda p: {
+            'pending_reservations_count': -1,
+            'pending_reservations_amount': -_amount(p),
+        },
+        RESERVATION_EXPIRED: lambda p: {
+            'pending_reservations_count': -1,
+            'pending_reservations_amount': -_amount(p),
+        },
+    }
+
+    CHECKPOINT_LAG = timedelta(minutes=5)
+    BATCH_SIZE = 2000
+
+    @classmethod
+    def build(cls, event_type, aggregate, payload=None, occurred_at=None):
+        """Construye un DomainEvent sin guardarlo."""
+        from apps.statistics.models import DomainEvent
+
+        if event_type not in cls.PROJECTIONS:
+            raise ValueError(f"Tipo de evento desconocido: {event_type}")
+
+        return DomainEvent(
+            event_type=event_type,
+            aggregate_type=aggregate._meta.model_name,
+            aggregate_id=aggregate.pk,
+            payload={
+                key: str(value) if isinstance(value, Decimal) else value
+                for key, value in (payload or {}).items()
+            },
+            occurred_at=occurred_at or timezone.now()
+        )
+
+    @classmethod
+    def record(cls, event_type, aggregate, payload=None, occurred_at=None):
+        """
+        Registra un evento. Debe llamarse dentro de la transacción que
+        realiza el cambio de estado.
+
+        Args:
+            event_type: Uno de los tipos definidos en PROJECTIONS
+            aggregate: Instancia del modelo afectado
+            payload: Datos del evento (Decimal se guarda como texto)
+            occurred_at: Momento del cambio (por defecto ahora)
+
+        Returns:
+            DomainEvent: Evento registrado
+        """
+        event = cls.build(event_type, aggregate, payload, occurred_at)
+        event.save()
+        return event
+
+    @classmethod
+    def record_many(cls, events):
+        """
+        Guarda en lotes eventos construidos con build().
+
+        Returns:
+            int: Número de eventos guardados
+        """
+        from apps.statistics.models import DomainEvent
+
+        total = 0
+        batch = []
+        for event in events:
+            batch.append(event)
+            if len(batch) >= cls.BATCH_SIZE:
+                DomainEvent.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            DomainEvent.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    @classmethod
+    def empty_counters(cls):
+        return {name: kind() for name, kind in cls.COUNTERS.items()}
+
+    @classmethod
+    def replay(cls, counters, events):
+        """
+        Aplica eventos sobre los contadores (en el lugar).
+
+        Args:
+            counters: dict de contadores
+            events: Iterable de tuplas (event_type, payload)
+
+        Returns:
+            int: Número de eventos aplicados
+        """
+        applied = 0
+        for event_type, payload in events:
+            for name, delta in cls.PROJECTIONS[event_type](payload).items():
+                counters[name] += delta
+            applied += 1
+        return applied
+
+    @classmethod
+    def _events_between(cls, start, end):
+        from apps.statistics.models import DomainEvent
+
+        events = DomainEvent.objects.filter(occurred_at__lte=end)
+        if start is not None:
+            events = events.filter(occurred_at__gt=start)
+        return events.order_by('occurred_at', 'id').values_list(
+            'event_type', 'payload'
+        ).iterator(chunk_size=cls.BATCH_SIZE)
+
+    @classmethod
+    def _load_counters(cls, stored):
+        counters = cls.empty_counters()
+        for name, kind in cls.COUNTERS.items():
+            if name in stored:
+                counters[name] = kind(stored[name])
+        return counters
+
+    @classmethod
+    def _dump_counters(cls, counters):
+        return {
+            name: str(value) if isinstance(value, Decimal) else value
+            for name, value in counters.items()
+        }
+
+    @classmethod
+    def counters_as_of(cls, at):
+        """
+        Contadores acumulados al instante `at`.
+
+        Returns:
+            tuple: (contadores, checkpoint usado o None, eventos reproducidos)
+        """
+        from apps.statistics.models import StatisticsCheckpoint
+
+        checkpoint = StatisticsCheckpoint.objects.filter(as_of__lte=at).order_by('-as_of').first()
+        if checkpoint:
+            counters = cls._load_counters(checkpoint.counters)
+            start = checkpoint.as_of
+        else:
+            counters = cls.empty_counters()
+            start = None
+
+        replayed = cls.replay(counters, cls._events_between(start, at))
+        return counters, checkpoint, replayed
+
+    @classmethod
+    def create_checkpoint(cls, as_of):
+        """
+        Crea (o retorna) el checkpoint al instante as_of.
+
+        Args:
+            as_of: datetime aware; debe ser anterior a ahora - CHECKPOINT_LAG
+
+        Returns:
+            StatisticsCheckpoint
+        """
+        from apps.statistics.models import StatisticsCheckpoint
+
+        if as_of > timezone.now() - cls.CHECKPOINT_LAG:
+            raise ValueError('El checkpoint debe quedar antes del margen de seguridad.')
+
+        existing = StatisticsCheckpoint.objects.filter(as_of=as_of).first()
+        if existing:
+            return existing
+
+        counters, _, replayed = cls.counters_as_of(as_of)
+        return StatisticsCheckpoint.objects.create(
+            as_of=as_of,
+            counters=cls._dump_counters(counters),
+            events_count=replayed
+        )
+
+    @classmethod
+    def create_checkpoints(cls, interval=timedelta(days=1)):
+        """
+        Crea checkpoints cada `interval` desde el último existente (o desde
+        el primer evento) hasta ahora - CHECKPOINT_LAG.
+
+        Returns:
+            list: Checkpoints creados
+        """
+        from apps.statistics.models import DomainEvent, StatisticsCheckpoint
+
+        limit = timezone.now() - cls.CHECKPOINT_LAG
+        last = StatisticsCheckpoint.objects.order_by('-as_of').first()
+        if last:
+            current = last.as_of + interval
+        else:
+            first_event = DomainEvent.objects.order_by('occurred_at').first()
+            if first_event is None:
+                return []
+            current = first_event.occurred_at + interval
+
+        created = []
+        while current <= limit:
+            created.append(cls.create_checkpoint(current))
+            current += interval
+        if not created or created[-1].as_of < limit:
+            created.append(cls.create_checkpoint(limit))
+        return created
+
+    @classmethod
+    def backfill(cls):
+        """
+        Sintetiza eventos para la historia anterior al primer evento
+        registrado, a partir de las fechas guardadas en cada modelo.
+        Los eventos llevan payload['backfilled'] = True.
+
+        Los checkpoints existentes no incluyen esa historia: se eliminan y
+        se vuelven a crear en los mismos instantes, en la misma transacción.
+
+        Returns:
+            int: Número de eventos creados
+
+        Raises:
+            ValueError: Si ya se ejecutó un backfill
+        """
+        from apps.statistics.models import DomainEvent, StatisticsCheckpoint
+        from apps.leads.models import Lead
+        from apps.investments.models import Investment
+        from apps.kyc.models import KYCSubmission
+        from apps.payments.models import PaymentProof
+        from apps.reservations.models import Reservation
+        from apps.users.models import User
+
+        if DomainEvent.objects.filter(payload__backfilled=True).exists():
+            raise ValueError('El backfill de eventos ya fue ejecutado.')
+
+        first_live = DomainEvent.objects.order_by('occurred_at').first()
+        cutoff = first_live.occurred_at if first_live else timezone.now()
+
+        def events():
+            for lead in Lead.objects.filter(created_at__lt=cutoff).iterator(cls.BATCH_SIZE):
+                yield cls.build(cls.LEAD_CREATED, lead, {'source': lead.source}, lead.created_at)
+                if lead.status == Lead.Status.CONVERTED and lead.converted_at and lead.converted_at < cutoff:
+                    yield cls.build(cls.LEAD_CONVERTED, lead, {
+                        'source': lead.source,
+                        'executive_id': str(lead.assigned_to_id) if lead.assigned_to_id else None,
+                    }, lead.converted_at)
+
+            for investment in Investment.objects.filter(
+                activated_at__lt=cutoff
+            ).iterator(cls.BATCH_SIZE):
+                yield cls.build(cls.INVESTMENT_ACTIVATED, investment, {
+                    'project_id': str(investment.project_id),
+                    'user_id': str(investment.user_id),
+                    'amount': investment.amount,
+                    'expected_return': investment.expected_return,
+                }, investment.activated_at)
+
+            for proof in PaymentProof.objects.filter(
+                status=PaymentProof.Status.REJECTED, reviewed_at__lt=cutoff
+            ).iterator(cls.BATCH_SIZE):
+                yield cls.build(cls.PAYMENT_REJECTED, proof, {
+                    'investment_id': str(proof.investment_id),
+                    'amount': proof.amount,
+                }, proof.reviewed_at)
+
+            approvals = dict(
+                KYCSubmission.objects.filter(
+                    status=KYCSubmission.Status.APPROVED, reviewed_at__isnull=False
+                ).values('user').annotate(first=Min('reviewed_at')).order_by().values_list('user', 'first')
+            )
+            for user in User.objects.filter(
+                is_kyc_verified=True, created_at__lt=cutoff
+            ).iterator(cls.BATCH_SIZE):
+                verified_at = approvals.get(user.id, user.created_at)
+                if verified_at < cutoff:
+                    yield cls.build(cls.KYC_APPROVED, user, {'user_id': str(user.id)}, verified_at)
+
+            closing = {
+                Reservation.Status.CONVERTED: cls.RESERVATION_CONVERTED,
+                Reservation.Status.CANCELLED: cls.RESERVATION_CANCELLED,
+                Reservation.Status.EXPIRED: cls.RESERVATION_EXPIRED,
+            }
+            for reservation in Reservation.objects.filter(
+                created_at__lt=cutoff
+            ).iterator(cls.BATCH_SIZE):
+                payload = {'project_id': str(reservation.project_id), 'amount': reservation.amount}
+                yield cls.build(cls.RESERVATION_CREATED, reservation, payload, reservation.created_at)
+                if reservation.status in closing and reservation.updated_at < cutoff:
+                    yield cls.build(
+                        closing[reservation.status], reservation, payload, reservation.updated_at
+                    )
+
+        def backfilled():
+            for event in events():
+                event.payload['backfilled'] = True
+                yield event
+
+        with transaction.atomic():
+            checkpoints = list(
+                StatisticsCheckpoint.objects.order_by('as_of').values_list('as_of', flat=True)
+            )
+            StatisticsCheckpoint.objects.all().delete()
+            created = cls.record_many(backfilled())
+            # En orden: cada checkpoint parte del anterior ya recalculado
+            for as_of in checkpoints:
+                cls.create_checkpoint(as_of)
+            return created
@@ -0,0 +1,388 @@
+"""
+Leaderboard de ejecutivos mantenido incrementalmente.
+
+Cada tablero (métrica + ventana + período) es un conjunto ordenado de
+ejecutivos por puntaje:
+- Con REDIS_URL se usa un ZSET de Redis (compartido entre procesos).
+  Actualizar, top-N y ranking de un ejecutivo son O(log n).
+- Sin Redis se usa una lista ordenada en memoria con bisect, propia de
+  cada proceso. Ranking y top-N son O(log n), pero actualizar es O(n)
+  (insort desplaza la lista); con n = ejecutivos activos (decenas) es
+  despreciable frente a la consulta que lo origina. Como cada proceso
+  solo ve sus propios eventos, los tableros se reconstruyen desde la
+  base cada LOCAL_REFRESH_SECONDS.
+
+Los eventos se registran al hacer commit de la transacción que los
+origina. Un tablero que no existe (despliegue, reinicio, Redis vaciado)
+se reconstruye desde la base en la primera lectura, sin necesidad de
+correr rebuild_leaderboard.
+
+Reconstruir es optimista: si mientras se calculan los puntajes llega un
+incremento al tablero (un commit que la consulta ya no vio), el cambio se
+descarta y se vuelve a calcular, hasta REBUILD_ATTEMPTS veces. En Redis
+con WATCH sobre el ZSET y el reemplazo en MULTI/EXEC; en memoria con un
+contador de versión por tablero.
+"""
+import threading
+import time as clock
+from bisect import bisect_left, insort
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+class InMemoryLeaderboardBackend:
+    """Conjuntos ordenados en memoria: dict de puntajes + lista ordenada."""
+
+    def __init__(self, refresh_seconds=None):
+        self._boards = {}
+        self._lock = threading.Lock()
+        self._refresh_seconds = refresh_seconds
+
+    def _board(self, key):
+        board = self._boards.get(key)
+        if board and board['expires_at'] and board['expires_at'] <= timezone.now():
+            del self._boards[key]
+            board = None
+        if board is None:
+            board = {
+                'scores': {}, 'sorted': [], 'expires_at': None, 'built_at': None, 'version': 0,
+            }
+            self._boards[key] = board
+        return board
+
+    def is_built(self, key):
+        """True si el tablero se reconstruyó desde la base hace menos de refresh_seconds."""
+        with self._lock:
+            built_at = self._board(key)['built_at']
+        return built_at is not None and (
+            self._refresh_seconds is None
+            or clock.monotonic() - built_at < self._refresh_seconds
+        )
+
+    def incr(self, key, member, amount, expires_at=None):
+        with self._lock:
+            board = self._board(key)
+            old = board['scores'].get(member)
+            if old is not None:
+                del board['sorted'][bisect_left(board['sorted'], (-old, member))]
+            score = (old or 0) + amount
+            board['scores'][member] = score
+            insort(board['sorted'], (-score, member))
+            board['version'] += 1
+            if expires_at:
+                board['expires_at'] = expires_at
+
+    def replace(self, key, compute, expires_at=None):
+        """
+        Reemplaza el tablero por compute() si no recibió incrementos
+        mientras se calculaba.
+
+        Returns:
+            dict: Puntajes guardados, o None si no se logró
+        """
+        for _ in range(LeaderboardService.REBUILD_ATTEMPTS):
+            with self._lock:
+                version = self._board(key)['version']
+            scores = compute()
+            with self._lock:
+                if self._board(key)['version'] != version:
+                    continue
+                self._boards[key] = {
+                    'scores': dict(scores),
+                    'sorted': sorted((-score, member) for member, score in scores.items()),
+                    'expires_at': expires_at,
+                    'built_at': clock.monotonic(),
+                    'version': version,
+                }
+                return scores
+        return None
+
+    def top(self, key, limit):
+        with self._lock:
+            return [(member, -score) for score, member in self._board(key)['sorted'][:limit]]
+
+    def rank(self, key, member):
+        with self._lock:
+            board = self._board(key)
+            score = board['scores'].get(member)
+            if score is None:
+                return None, None
+            return bisect_left(board['sorted'], (-score, member)), score
+
+    def clear(self):
+        with self._lock:
+            self._boards.clear()
+
+
+class RedisLeaderboardBackend:
+    """Conjuntos ordenados en Redis (ZSET)."""
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+
+    def incr(self, key, member, amount, expires_at=None):
+        pipe = self._client.pipeline()
+        pipe.zincrby(key, float(amount), member)
+        if expires_at:
+            pipe.expireat(key, expires_at)
+        pipe.execute()
+
+    @staticmethod
+    def _built_key(key):
+        # Marca de tablero reconstruido (un ZSET vacío no existe en Redis)
+        return f'{key}:built'
+
+    def is_built(self, key):
+        return bool(self._client.exists(self._built_key(key)))
+
+    def replace(self, key, compute, expires_at=None):
+        """
+        Reemplaza el ZSET por compute() en MULTI/EXEC, vigilado con WATCH:
+        un ZINCRBY durante el cálculo hace fallar el EXEC y se recalcula.
+
+        Returns:
+            dict: Puntajes guardados, o None si no se logró
+        """
+        with self._client.pipeline(transaction=True) as pipe:
+            for _ in range(LeaderboardService.REBUILD_ATTEMPTS):
+                try:
+                    pipe.watch(key)
+                    scores = compute()
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.set(self._built_key(key), 1)
+                    if scores:
+                        pipe.zadd(key, {member: float(score) for member, score in scores.items()})
+                    if expires_at:
+                        pipe.expireat(key, expires_at)
+                        pipe.expireat(self._built_key(key), expires_at)
+                    pipe.execute()
+                    return scores
+                except self._watch_error:
+                    continue
+        return None
+
+    def top(self, key, limit):
+        return [
+            (member.decode(), score)
+            for member, score in self._client.zrevrange(key, 0, limit - 1, withscores=True)
+        ]
+
+    def rank(self, key, member):
+        pipe = self._client.pipeline()
+        pipe.zrevrank(key, member)
+        pipe.zscore(key, member)
+        rank, score = pipe.execute()
+        return rank, score
+
+    def clear(self):
+        keys = list(self._client.scan_iter(f'{LeaderboardService.PREFIX}:*'))
+        if keys:
+            self._client.delete(*keys)
+
+
+class LeaderboardService:
+    """
+    Servicio de leaderboard de ejecutivos.
+    Métricas: conversiones de leads y monto de inversiones activadas.
+    Ventanas: histórico, semana actual y mes actual.
+    """
+
+    PREFIX = 'leaderboard'
+    METRICS = ('conversions', 'investment_amount')
+    WINDOWS = ('all', 'week', 'month')
+
+    # Los tableros de períodos pasados se conservan este tiempo
+    WINDOW_RETENTION = timedelta(days=62)
+
+    # Sin Redis: antigüedad máxima de los tableros de cada proceso
+    LOCAL_REFRESH_SECONDS = 60
+
+    # Intentos de reconstruir un tablero que recibe incrementos mientras
+    # se calcula; si se agotan queda como estaba y se reintenta al leerlo
+    REBUILD_ATTEMPTS = 3
+
+    _backend = None
+    _backend_lock = threading.Lock()
+
+    @classmethod
+    def backend(cls):
+        if cls._backend is None:
+            with cls._backend_lock:
+                if cls._backend is None:
+                    cls._backend = (
+                        RedisLeaderboardBackend(settings.REDIS_URL)
+                        if settings.REDIS_URL
+                        else InMemoryLeaderboardBackend(cls.LOCAL_REFRESH_SECONDS)
+                    )
+        return cls._backend
+
+    @classmethod
+    def period(cls, window, when=None):
+        """
+        Período de una ventana para un instante.
+
+        Returns:
+            tuple: (etiqueta, inicio aware o None, fin aware o None)
+        """
+        if window == 'all':
+            return 'all', None, None
+
+        day = timezone.localdate(when or timezone.now())
+        if window == 'week':
+            first = day - timedelta(days=day.weekday())
+            last = first + timedelta(days=7)
+            year, week, _ = first.isocalendar()
+            label = f'{year}-W{week:02d}'
+        elif window == 'month':
+            first = day.replace(day=1)
+            last = (first + timedelta(days=32)).replace(day=1)
+            label = f'{first:%Y-%m}'
+        else:
+            raise ValueError(f"Ventana inválida: {window}")
+
+        return (
+            label,
+            timezone.make_aware(datetime.combine(first, time.min)),
+            timezone.make_aware(datetime.combine(last, time.min)),
+        )
+
+    @classmethod
+    def key(cls, metric, window, label):
+        return f'{cls.PREFIX}:{metric}:{window}:{label}'
+
+    @classmethod
+    def record_conversion(cls, executive_id, when=None):
+        """Suma una conversión al ejecutivo, al hacer commit."""
+        cls._record('conversions', executive_id, 1, when)
+
+    @classmethod
+    def record_investment(cls, executive_id, amount, when=None):
+        """Suma el monto de una inversión activada al ejecutivo, al hacer commit."""
+        cls._record('investment_amount', executive_id, amount, when)
+
+    @classmethod
+    def _record(cls, metric, executive_id, amount, when):
+        if not executive_id:
+            return
+        when = when or timezone.now()
+
+        def apply():
+            backend = cls.backend()
+            for window in cls.WINDOWS:
+                label, _, end = cls.period(window, when)
+                backend.incr(
+                    cls.key(metric, window, label),
+                    str(executive_id),
+                    amount,
+                    expires_at=end + cls.WINDOW_RETENTION if end else None
+                )
+
+        transaction.on_commit(apply)
+
+    @classmethod
+    def top(cls, metric, window='all', limit=10):
+        """
+        Mejores ejecutivos del tablero actual.
+
+        Returns:
+            list: Tuplas (executive_id, puntaje) de mayor a menor
+        """
+        return [
+            (member, cls._score(metric, score))
+            for member, score in cls.backend().top(cls._current_key(metric, window), limit)
+        ]
+
+    @classmethod
+    def rank(cls, metric, window, executive_id):
+        """
+        Posición de un ejecutivo en el tablero actual.
+
+        Returns:
+            tuple: (posición desde 1 o None, puntaje)
+        """
+        rank, score = cls.backend().rank(cls._current_key(metric, window), str(executive_id))
+        if rank is None:
+            return None, cls._score(metric, 0)
+        return rank + 1, cls._score(metric, score)
+
+    @classmethod
+    def _current_key(cls, metric, window):
+        """Clave del tablero actual, reconstruyéndolo si no existe."""
+        label, start, end = cls.period(window)
+        key = cls.key(metric, window, label)
+        if not cls.backend().is_built(key):
+            cls._rebuild_board(key, metric, start, end)
+        return key
+
+    @classmethod
+    def _rebuild_board(cls, key, metric, start, end):
+        return cls.backend().replace(
+            key, lambda: cls.compute_scores(metric, start, end),
+            expires_at=end + cls.WINDOW_RETENTION if end else None
+        )
+
+    @staticmethod
+    def _score(metric, score):
+        if metric == 'conversions':
+            return int(score)
+        return Decimal(str(score)).quantize(Decimal('0.01'))
+
+    @classmethod
+    def compute_scores(cls, metric, start=None, end=None):
+        """
+        Puntajes desde la base de datos para un rango (para reconstruir).
+
+        Returns:
+            dict: executive_id (str) -> puntaje
+        """
+        from apps.leads.models import Lead
+        from apps.investments.models import Investment
+
+        if metric == 'conversions':
+            queryset = Lead.objects.filter(
+                status=Lead.Status.CONVERTED,
+                assigned_to__isnull=False
+            )
+            field, executive, value = 'converted_at', 'assigned_to', Count('id')
+        else:
+            queryset = Investment.objects.filter(
+                status__in=[Investment.Status.ACTIVE, Investment.Status.COMPLETED],
+                user__assigned_executive__isnull=False
+            )
+            field, executive, value = 'activated_at', 'user__assigned_executive', Sum('amount')
+
+        if start:
+            queryset = queryset.filter(**{f'{field}__gte': start, f'{field}__lt': end})
+
+        return {
+            str(row[executive]): row['score']
+            for row in queryset.values(executive).annotate(score=value).order_by()
+        }
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Reconstruye los tableros actuales (histórico, semana y mes) desde
+        la base de datos.
+
+        Returns:
+            dict: Número de ejecutivos por tablero reconstruido (None si
+            siguió recibiendo incrementos en cada intento)
+        """
+        sizes = {}
+        for metric in cls.METRICS:
+            for window in cls.WINDOWS:
+                label, start, end = cls.period(window)
+                key = cls.key(metric, window, label)
+                scores = cls._rebuild_board(key, metric, start, end)
+                sizes[key] = len(scores) if scores is not None else None
+        return sizes
@@ -0,0 +1,21 @@
+"""
+Comando para sintetizar eventos de dominio de la historia previa al
+registro de eventos, a partir de las fechas guardadas en cada modelo.
+Se ejecuta una sola vez al desplegar el registro de eventos.
+Los checkpoints existentes se recalculan para incluir esa historia.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.statistics.events import EventLogService
+
+
+class Command(BaseCommand):
+    help = 'Sintetiza eventos de dominio para la historia anterior al registro'
+
+    def handle(self, *args, **options):
+        try:
+            created = EventLogService.backfill()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f'{created} eventos sintetizados.'))
@@ -0,0 +1,36 @@
+"""
+Comando para crear checkpoints del registro de eventos de dominio.
+Crea un checkpoint cada --interval-hours desde el último existente, más
+uno al instante más reciente permitido, para acotar los eventos que
+reproduce una consulta histórica.
+Debe ejecutarse periódicamente (ej: cron diario).
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.statistics.events import EventLogService
+
+
+class Command(BaseCommand):
+    help = 'Crea checkpoints de estadísticas a partir del registro de eventos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval-hours',
+            type=int,
+            default=24,
+            help='Horas entre checkpoints consecutivos'
+        )
+
+    def handle(self, *args, **options):
+        if options['interval_hours'] < 1:
+            raise CommandError('--interval-hours debe ser mayor que 0')
+
+        created = EventLogService.create_checkpoints(
+            interval=timedelta(hours=options['interval_hours'])
+        )
+
+        for checkpoint in created:
+            self.stdout.write(f'  {checkpoint}: {checkpoint.events_count} eventos')
+
+        self.stdout.write(self.style.SUCCESS(f'{len(created)} checkpoints creados.'))
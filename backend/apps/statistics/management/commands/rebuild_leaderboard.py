@@ -0,0 +1,24 @@
+"""
+Comando para reconstruir el leaderboard de ejecutivos desde la base de datos.
+Los tableros que faltan se reconstruyen solos en la primera lectura; el
+comando sirve para forzarlo si quedaron desfasados.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.statistics.leaderboard import LeaderboardService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los tableros actuales del leaderboard de ejecutivos'
+
+    def handle(self, *args, **options):
+        sizes = LeaderboardService.rebuild()
+
+        for key, size in sorted(sizes.items()):
+            if size is None:
+                self.stdout.write(self.style.WARNING(f'  {key}: con incrementos en curso, sin reconstruir'))
+            else:
+                self.stdout.write(f'  {key}: {size} ejecutivos')
+
+        rebuilt = sum(size is not None for size in sizes.values())
+        self.stdout.write(self.style.SUCCESS(f'{rebuilt} tableros reconstruidos.'))
@@ -0,0 +1,37 @@
+"""
+Comando para reconstruir el snapshot de estadísticas de la plataforma.
+Compara los contadores almacenados contra los agregados reales.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.statistics.services import StatisticsService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye PlatformStatistics desde las tablas base y reporta diferencias'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo compara el snapshot con los agregados reales, sin escribir'
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+
+        _, differences = StatisticsService.rebuild_platform_snapshot(dry_run=check_only)
+
+        if not differences:
+            self.stdout.write(self.style.SUCCESS('El snapshot coincide con los agregados reales.'))
+            return
+
+        for name, (stored, live) in sorted(differences.items()):
+            self.stdout.write(f'  {name}: snapshot={stored} real={live}')
+
+        if check_only:
+            raise CommandError(f'{len(differences)} contadores no coinciden con los agregados reales.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot reconstruido ({len(differences)} contadores corregidos).'
+        ))
@@ -0,0 +1,47 @@
+"""
+Comando para procesar los rollups diarios de estadísticas.
+Recalcula solo los días marcados como modificados por los signals y luego
+las cohortes semanales de leads de esos días.
+Debe ejecutarse periódicamente (ej: cron cada pocos minutos).
+"""
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.statistics.services import StatisticsRollupService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los rollups diarios de los días marcados como modificados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Marca todos los días con actividad antes de procesar'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Con --backfill, fecha inicial YYYY-MM-DD'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=StatisticsRollupService.BATCH_SIZE,
+            help='Días por transacción'
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            since = None
+            if options['since']:
+                try:
+                    since = date.fromisoformat(options['since'])
+                except ValueError:
+                    raise CommandError('--since debe tener formato YYYY-MM-DD')
+            marked = StatisticsRollupService.mark_history(since=since)
+            self.stdout.write(f'  {marked} días marcados para backfill')
+
+        processed = StatisticsRollupService.process_all(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'{processed} días recalculados.'))
@@ -0,0 +1,95 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:35
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def seed_platform_statistics(apps, schema_editor):
+    """Crea la fila global con los contadores calculados desde los datos existentes."""
+    User = apps.get_model('users', 'User')
+    Project = apps.get_model('projects', 'Project')
+    Investment = apps.get_model('investments', 'Investment')
+    Lead = apps.get_model('leads', 'Lead')
+    PlatformStatistics = apps.get_model('statistics', 'PlatformStatistics')
+
+    users = User.objects.filter(role='investor').aggregate(
+        total=Count('id'),
+        verified=Count('id', filter=Q(is_kyc_verified=True))
+    )
+    projects = Project.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status__in=['funding', 'in_progress'])),
+        completed=Count('id', filter=Q(status='completed'))
+    )
+    active = Q(status='active')
+    with_returns = Q(status__in=['active', 'completed'])
+    investments = Investment.objects.aggregate(
+        active_count=Count('id', filter=active),
+        active_amount=Sum('amount', filter=active),
+        expected=Sum('expected_return', filter=with_returns),
+        actual=Sum('actual_return', filter=with_returns)
+    )
+    leads = Lead.objects.aggregate(
+        total=Count('id'),
+        converted=Count('id', filter=Q(status='converted'))
+    )
+
+    PlatformStatistics.objects.update_or_create(
+        scope='global',
+        defaults={
+            'total_investors': users['total'],
+            'verified_investors': users['verified'],
+            'total_projects': projects['total'],
+            'active_projects': projects['active'],
+            'completed_projects': projects['completed'],
+            'active_investments_count': investments['active_count'],
+            'active_investments_amount': investments['active_amount'] or Decimal('0.00'),
+            'expected_returns': investments['expected'] or Decimal('0.00'),
+            'actual_returns': investments['actual'] or Decimal('0.00'),
+            'total_leads': leads['total'],
+            'converted_leads': leads['converted'],
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('projects', '0003_project_main_image_url_alter_project_main_image'),
+        ('investments', '0003_initial'),
+        ('leads', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatistics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('scope', models.CharField(default='global', max_length=20, unique=True, verbose_name='Alcance')),
+                ('total_investors', models.BigIntegerField(default=0, verbose_name='Inversionistas')),
+                ('verified_investors', models.BigIntegerField(default=0, verbose_name='Inversionistas verificados')),
+                ('total_projects', models.BigIntegerField(default=0, verbose_name='Proyectos')),
+                ('active_projects', models.BigIntegerField(default=0, verbose_name='Proyectos activos')),
+                ('completed_projects', models.BigIntegerField(default=0, verbose_name='Proyectos completados')),
+                ('active_investments_count', models.BigIntegerField(default=0, verbose_name='Inversiones activas')),
+                ('active_investments_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Monto invertido activo')),
+                ('expected_returns', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Retornos esperados')),
+                ('actual_returns', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Retornos reales')),
+                ('total_leads', models.BigIntegerField(default=0, verbose_name='Leads')),
+                ('converted_leads', models.BigIntegerField(default=0, verbose_name='Leads convertidos')),
+            ],
+            options={
+                'verbose_name': 'Estadísticas de plataforma',
+                'verbose_name_plural': 'Estadísticas de plataforma',
+                'db_table': 'platform_statistics',
+            },
+        ),
+        migrations.RunPython(seed_platform_statistics, migrations.RunPython.noop),
+    ]
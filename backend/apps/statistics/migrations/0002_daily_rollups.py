@@ -0,0 +1,94 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:41
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def mark_existing_days(apps, schema_editor):
+    """Marca los días con actividad existente para que el job de rollups los procese."""
+    User = apps.get_model('users', 'User')
+    Investment = apps.get_model('investments', 'Investment')
+    Lead = apps.get_model('leads', 'Lead')
+    StatisticsDirtyDay = apps.get_model('statistics', 'StatisticsDirtyDay')
+
+    days = set()
+    for queryset, field in (
+        (User.objects.filter(role='investor'), 'created_at'),
+        (Investment.objects.exclude(activated_at=None), 'activated_at'),
+        (Lead.objects.all(), 'created_at'),
+        (Lead.objects.exclude(converted_at=None), 'converted_at'),
+    ):
+        days.update(value.date() for value in queryset.datetimes(field, 'day'))
+
+    StatisticsDirtyDay.objects.bulk_create(
+        [StatisticsDirtyDay(day=day) for day in days],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0001_initial'),
+        ('users', '0001_initial'),
+        ('investments', '0003_initial'),
+        ('leads', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLeadSourceRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('source', models.CharField(max_length=20, verbose_name='Fuente')),
+                ('new_leads', models.PositiveIntegerField(default=0, verbose_name='Leads nuevos')),
+                ('conversions', models.PositiveIntegerField(default=0, verbose_name='Conversiones')),
+            ],
+            options={
+                'verbose_name': 'Rollup diario de leads por fuente',
+                'verbose_name_plural': 'Rollups diarios de leads por fuente',
+                'db_table': 'statistics_daily_lead_source',
+                'ordering': ['day', 'source'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyPlatformRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('day', models.DateField(unique=True, verbose_name='Día')),
+                ('new_investors', models.PositiveIntegerField(default=0, verbose_name='Nuevos inversionistas')),
+                ('activated_investments_count', models.PositiveIntegerField(default=0, verbose_name='Inversiones activadas')),
+                ('activated_investments_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Monto activado')),
+            ],
+            options={
+                'verbose_name': 'Rollup diario de plataforma',
+                'verbose_name_plural': 'Rollups diarios de plataforma',
+                'db_table': 'statistics_daily_platform',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatisticsDirtyDay',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False, verbose_name='Día')),
+                ('marked_at', models.DateTimeField(auto_now_add=True, verbose_name='Marcado en')),
+            ],
+            options={
+                'verbose_name': 'Día pendiente de rollup',
+                'verbose_name_plural': 'Días pendientes de rollup',
+                'db_table': 'statistics_dirty_days',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyleadsourcerollup',
+            constraint=models.UniqueConstraint(fields=('day', 'source'), name='unique_daily_lead_source'),
+        ),
+        migrations.RunPython(mark_existing_days, migrations.RunPython.noop),
+    ]
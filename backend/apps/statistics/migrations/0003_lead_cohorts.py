@@ -0,0 +1,65 @@
+# Generated by Django 5.0.1 on 2026-10-16 22:51
+
+import uuid
+from django.db import migrations, models
+
+
+def mark_existing_weeks(apps, schema_editor):
+    """Marca las semanas con leads existentes para construir sus cohortes."""
+    Lead = apps.get_model('leads', 'Lead')
+    StatisticsDirtyWeek = apps.get_model('statistics', 'StatisticsDirtyWeek')
+
+    StatisticsDirtyWeek.objects.bulk_create(
+        [
+            StatisticsDirtyWeek(week=value.date())
+            for value in Lead.objects.datetimes('created_at', 'week')
+        ],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0002_daily_rollups'),
+        ('leads', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsDirtyWeek',
+            fields=[
+                ('week', models.DateField(primary_key=True, serialize=False, verbose_name='Semana')),
+                ('marked_at', models.DateTimeField(auto_now_add=True, verbose_name='Marcado en')),
+            ],
+            options={
+                'verbose_name': 'Semana pendiente de rollup',
+                'verbose_name_plural': 'Semanas pendientes de rollup',
+                'db_table': 'statistics_dirty_weeks',
+                'ordering': ['week'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyLeadCohortConversion',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('cohort_week', models.DateField(verbose_name='Semana de cohorte')),
+                ('source', models.CharField(max_length=20, verbose_name='Fuente')),
+                ('weeks_to_convert', models.PositiveSmallIntegerField(verbose_name='Semanas hasta conversión')),
+                ('conversions', models.PositiveIntegerField(default=0, verbose_name='Conversiones')),
+            ],
+            options={
+                'verbose_name': 'Cohorte semanal de leads',
+                'verbose_name_plural': 'Cohortes semanales de leads',
+                'db_table': 'statistics_weekly_lead_cohorts',
+                'ordering': ['cohort_week', 'source', 'weeks_to_convert'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='weeklyleadcohortconversion',
+            constraint=models.UniqueConstraint(fields=('cohort_week', 'source', 'weeks_to_convert'), name='unique_weekly_lead_cohort'),
+        ),
+        migrations.RunPython(mark_existing_weeks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:02
+
+import uuid
+from django.db import migrations, models
+
+
+def create_append_only_trigger(apps, schema_editor):
+    """En PostgreSQL, impide UPDATE/DELETE sobre el registro de eventos."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE OR REPLACE FUNCTION statistics_domain_events_append_only()
+        RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'statistics_domain_events es append-only';
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    schema_editor.execute("""
+        CREATE TRIGGER statistics_domain_events_append_only
+        BEFORE UPDATE OR DELETE ON statistics_domain_events
+        FOR EACH ROW EXECUTE FUNCTION statistics_domain_events_append_only();
+    """)
+
+
+def drop_append_only_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'DROP TRIGGER IF EXISTS statistics_domain_events_append_only ON statistics_domain_events;'
+    )
+    schema_editor.execute('DROP FUNCTION IF EXISTS statistics_domain_events_append_only();')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0003_lead_cohorts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('as_of', models.DateTimeField(unique=True, verbose_name='Estado al')),
+                ('counters', models.JSONField(verbose_name='Contadores')),
+                ('events_count', models.PositiveBigIntegerField(default=0, verbose_name='Eventos aplicados desde el checkpoint anterior')),
+            ],
+            options={
+                'verbose_name': 'Checkpoint de estadísticas',
+                'verbose_name_plural': 'Checkpoints de estadísticas',
+                'db_table': 'statistics_checkpoints',
+                'ordering': ['-as_of'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DomainEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=50, verbose_name='Tipo de evento')),
+                ('aggregate_type', models.CharField(max_length=50, verbose_name='Tipo de entidad')),
+                ('aggregate_id', models.UUIDField(verbose_name='ID de entidad')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Datos')),
+                ('occurred_at', models.DateTimeField(verbose_name='Ocurrido en')),
+                ('recorded_at', models.DateTimeField(auto_now_add=True, verbose_name='Registrado en')),
+            ],
+            options={
+                'verbose_name': 'Evento de dominio',
+                'verbose_name_plural': 'Eventos de dominio',
+                'db_table': 'statistics_domain_events',
+                'ordering': ['occurred_at', 'id'],
+                'indexes': [models.Index(fields=['occurred_at', 'id'], name='domain_events_occurred_idx'), models.Index(fields=['aggregate_type', 'aggregate_id'], name='domain_events_aggregate_idx')],
+            },
+        ),
+        migrations.RunPython(create_append_only_trigger, drop_append_only_trigger),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-17 00:39
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0004_domain_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatisticsDelta',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('total_investors', models.BigIntegerField(default=0, verbose_name='Inversionistas')),
+                ('verified_investors', models.BigIntegerField(default=0, verbose_name='Inversionistas verificados')),
+                ('total_projects', models.BigIntegerField(default=0, verbose_name='Proyectos')),
+                ('active_projects', models.BigIntegerField(default=0, verbose_name='Proyectos activos')),
+                ('completed_projects', models.BigIntegerField(default=0, verbose_name='Proyectos completados')),
+                ('active_investments_count', models.BigIntegerField(default=0, verbose_name='Inversiones activas')),
+                ('active_investments_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Monto invertido activo')),
+                ('expected_returns', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Retornos esperados')),
+                ('actual_returns', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Retornos reales')),
+                ('total_leads', models.BigIntegerField(default=0, verbose_name='Leads')),
+                ('converted_leads', models.BigIntegerField(default=0, verbose_name='Leads convertidos')),
+            ],
+            options={
+                'verbose_name': 'Variación de estadísticas de plataforma',
+                'verbose_name_plural': 'Variaciones de estadísticas de plataforma',
+                'db_table': 'platform_statistics_deltas',
+            },
+        ),
+    ]
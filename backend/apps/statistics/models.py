@@ -1,5 +1,368 @@
 """
 Statistics models for SomosRentable.
-Las estadísticas se calculan en tiempo real desde los otros modelos.
-Este archivo está vacío pero es necesario para que Django reconozca la app.
+Contadores precalculados que se mantienen incrementalmente desde los
+signals de los modelos de negocio (ver signals.py).
 """
+from decimal import Decimal
+from django.db import models
+from core.models import BaseModel
+
+
+class PlatformCounters(models.Model):
+    """Contadores globales de la plataforma (snapshot y variaciones)."""
+
+    # Usuarios
+    total_investors = models.BigIntegerField(
+        default=0,
+        verbose_name='Inversionistas'
+    )
+    verified_investors = models.BigIntegerField(
+        default=0,
+        verbose_name='Inversionistas verificados'
+    )
+
+    # Proyectos
+    total_projects = models.BigIntegerField(
+        default=0,
+        verbose_name='Proyectos'
+    )
+    active_projects = models.BigIntegerField(
+        default=0,
+        verbose_name='Proyectos activos'
+    )
+    completed_projects = models.BigIntegerField(
+        default=0,
+        verbose_name='Proyectos completados'
+    )
+
+    # Inversiones
+    active_investments_count = models.BigIntegerField(
+        default=0,
+        verbose_name='Inversiones activas'
+    )
+    active_investments_amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name='Monto invertido activo'
+    )
+    expected_returns = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name='Retornos esperados'
+    )
+    actual_returns = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name='Retornos reales'
+    )
+
+    # Leads
+    total_leads = models.BigIntegerField(
+        default=0,
+        verbose_name='Leads'
+    )
+    converted_leads = models.BigIntegerField(
+        default=0,
+        verbose_name='Leads convertidos'
+    )
+
+    COUNTER_FIELDS = (
+        'total_investors', 'verified_investors',
+        'total_projects', 'active_projects', 'completed_projects',
+        'active_investments_count', 'active_investments_amount',
+        'expected_returns', 'actual_returns',
+        'total_leads', 'converted_leads',
+    )
+
+    class Meta:
+        abstract = True
+
+    def as_counters(self):
+        """Retorna los contadores como dict."""
+        return {name: getattr(self, name) for name in self.COUNTER_FIELDS}
+
+
+class PlatformStatistics(BaseModel, PlatformCounters):
+    """
+    Snapshot de contadores globales de la plataforma.
+    Existe una sola fila (scope='global'). Los cambios de User, Project,
+    Investment o Lead no la actualizan: agregan una fila de
+    PlatformStatisticsDelta en su transacción, y StatisticsService la
+    suma al leer y la pliega en el snapshot por tandas.
+    """
+
+    GLOBAL_SCOPE = 'global'
+
+    scope = models.CharField(
+        max_length=20,
+        unique=True,
+        default=GLOBAL_SCOPE,
+        verbose_name='Alcance'
+    )
+
+    class Meta:
+        db_table = 'platform_statistics'
+        verbose_name = 'Estadísticas de plataforma'
+        verbose_name_plural = 'Estadísticas de plataforma'
+
+    def __str__(self):
+        return f"Estadísticas {self.scope} ({self.updated_at:%Y-%m-%d %H:%M})"
+
+
+class PlatformStatisticsDelta(BaseModel, PlatformCounters):
+    """
+    Variación de los contadores globales, registrada por los signals en la
+    misma transacción que el cambio que la origina. Solo se insertan: los
+    escritores concurrentes no comparten ninguna fila bloqueada.
+    """
+
+    class Meta:
+        db_table = 'platform_statistics_deltas'
+        verbose_name = 'Variación de estadísticas de plataforma'
+        verbose_name_plural = 'Variaciones de estadísticas de plataforma'
+
+
+class DailyPlatformRollup(BaseModel):
+    """
+    Hechos diarios de la plataforma (día local America/Santiago).
+    Se recalculan por día desde el job de rollups, solo para los días
+    marcados como modificados.
+    """
+
+    day = models.DateField(
+        unique=True,
+        verbose_name='Día'
+    )
+    new_investors = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Nuevos inversionistas'
+    )
+    activated_investments_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Inversiones activadas'
+    )
+    activated_investments_amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name='Monto activado'
+    )
+
+    class Meta:
+        db_table = 'statistics_daily_platform'
+        verbose_name = 'Rollup diario de plataforma'
+        verbose_name_plural = 'Rollups diarios de plataforma'
+        ordering = ['day']
+
+    def __str__(self):
+        return f"Rollup {self.day}"
+
+
+class DailyLeadSourceRollup(BaseModel):
+    """
+    Leads nuevos y conversiones por día y fuente.
+    """
+
+    day = models.DateField(
+        verbose_name='Día'
+    )
+    source = models.CharField(
+        max_length=20,
+        verbose_name='Fuente'
+    )
+    new_leads = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Leads nuevos'
+    )
+    conversions = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Conversiones'
+    )
+
+    class Meta:
+        db_table = 'statistics_daily_lead_source'
+        verbose_name = 'Rollup diario de leads por fuente'
+        verbose_name_plural = 'Rollups diarios de leads por fuente'
+        ordering = ['day', 'source']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'source'], name='unique_daily_lead_source'),
+        ]
+
+    def __str__(self):
+        return f"Leads {self.source} {self.day}"
+
+
+class StatisticsDirtyDay(models.Model):
+    """
+    Cola de días cuyos rollups deben recalcularse.
+    Los signals insertan el día afectado (ON CONFLICT DO NOTHING) en la misma
+    transacción del cambio; el job de rollups los consume.
+    """
+
+    day = models.DateField(
+        primary_key=True,
+        verbose_name='Día'
+    )
+    marked_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Marcado en'
+    )
+
+    class Meta:
+        db_table = 'statistics_dirty_days'
+        verbose_name = 'Día pendiente de rollup'
+        verbose_name_plural = 'Días pendientes de rollup'
+        ordering = ['day']
+
+    def __str__(self):
+        return str(self.day)
+
+
+class StatisticsDirtyWeek(models.Model):
+    """
+    Cola de semanas de cohorte (lunes) cuya matriz de conversión debe
+    recalcularse. La llena el job de rollups al procesar días modificados.
+    """
+
+    week = models.DateField(
+        primary_key=True,
+        verbose_name='Semana'
+    )
+    marked_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Marcado en'
+    )
+
+    class Meta:
+        db_table = 'statistics_dirty_weeks'
+        verbose_name = 'Semana pendiente de rollup'
+        verbose_name_plural = 'Semanas pendientes de rollup'
+        ordering = ['week']
+
+    def __str__(self):
+        return str(self.week)
+
+
+class WeeklyLeadCohortConversion(BaseModel):
+    """
+    Matriz de cohortes de leads: conversiones de los leads creados en la
+    semana cohort_week, por fuente y por semanas transcurridas hasta la
+    conversión (0 = misma semana). El tamaño de cada cohorte se obtiene de
+    DailyLeadSourceRollup.
+    """
+
+    cohort_week = models.DateField(
+        verbose_name='Semana de cohorte'
+    )
+    source = models.CharField(
+        max_length=20,
+        verbose_name='Fuente'
+    )
+    weeks_to_convert = models.PositiveSmallIntegerField(
+        verbose_name='Semanas hasta conversión'
+    )
+    conversions = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Conversiones'
+    )
+
+    class Meta:
+        db_table = 'statistics_weekly_lead_cohorts'
+        verbose_name = 'Cohorte semanal de leads'
+        verbose_name_plural = 'Cohortes semanales de leads'
+        ordering = ['cohort_week', 'source', 'weeks_to_convert']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cohort_week', 'source', 'weeks_to_convert'],
+                name='unique_weekly_lead_cohort'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Cohorte {self.source} {self.cohort_week} +{self.weeks_to_convert}"
+
+
+class DomainEvent(models.Model):
+    """
+    Registro append-only de transiciones de estado del negocio
+    (pagos, KYC, leads y reservas). Es la fuente para reconstruir
+    estadísticas en cualquier instante (ver events.py).
+    El id autoincremental da el orden de inserción.
+    """
+
+    event_type = models.CharField(
+        max_length=50,
+        verbose_name='Tipo de evento'
+    )
+    aggregate_type = models.CharField(
+        max_length=50,
+        verbose_name='Tipo de entidad'
+    )
+    aggregate_id = models.UUIDField(
+        verbose_name='ID de entidad'
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Datos'
+    )
+    occurred_at = models.DateTimeField(
+        verbose_name='Ocurrido en'
+    )
+    recorded_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Registrado en'
+    )
+
+    class Meta:
+        db_table = 'statistics_domain_events'
+        verbose_name = 'Evento de dominio'
+        verbose_name_plural = 'Eventos de dominio'
+        ordering = ['occurred_at', 'id']
+        indexes = [
+            models.Index(fields=['occurred_at', 'id'], name='domain_events_occurred_idx'),
+            models.Index(fields=['aggregate_type', 'aggregate_id'], name='domain_events_aggregate_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_id} ({self.occurred_at:%Y-%m-%d %H:%M})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Los eventos de dominio no se pueden modificar.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError('Los eventos de dominio no se pueden eliminar.')
+
+
+class StatisticsCheckpoint(BaseModel):
+    """
+    Estado acumulado de los contadores del registro de eventos hasta as_of.
+    Las consultas históricas parten del checkpoint anterior más cercano y
+    solo reproducen los eventos posteriores.
+    """
+
+    as_of = models.DateTimeField(
+        unique=True,
+        verbose_name='Estado al'
+    )
+    counters = models.JSONField(
+        verbose_name='Contadores'
+    )
+    events_count = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Eventos aplicados desde el checkpoint anterior'
+    )
+
+    class Meta:
+        db_table = 'statistics_checkpoints'
+        verbose_name = 'Checkpoint de estadísticas'
+        verbose_name_plural = 'Checkpoints de estadísticas'
+        ordering = ['-as_of']
+
+    def __str__(self):
+        return f"Checkpoint {self.as_of:%Y-%m-%d %H:%M}"
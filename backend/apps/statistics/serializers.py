@@ -0,0 +1,111 @@
+"""
+Statistics serializers for SomosRentable API.
+"""
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.leads.models import Lead
+from .leaderboard import LeaderboardService
+from .services import StatisticsService, StatisticsRollupService
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """Parámetros de consulta para series de tiempo."""
+
+    MAX_DAYS = 3660
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(
+        choices=StatisticsService.TIMESERIES_GRANULARITIES,
+        default='day'
+    )
+
+    def validate(self, attrs):
+        end = attrs.get('end') or timezone.localdate()
+        start = attrs.get('start') or end - timedelta(days=29)
+
+        if start > end:
+            raise serializers.ValidationError({
+                'start': 'La fecha inicial debe ser anterior a la final.'
+            })
+        if (end - start).days > self.MAX_DAYS:
+            raise serializers.ValidationError({
+                'start': f'El rango máximo es de {self.MAX_DAYS} días.'
+            })
+
+        attrs['start'] = start
+        attrs['end'] = end
+        return attrs
+
+
+class LeadCohortQuerySerializer(serializers.Serializer):
+    """Parámetros de consulta para la matriz de cohortes de leads."""
+
+    MAX_WEEKS = 260
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    source = serializers.ChoiceField(choices=Lead.Source.choices, required=False)
+
+    def validate(self, attrs):
+        end = StatisticsRollupService.week_start(attrs.get('end') or timezone.localdate())
+        start = StatisticsRollupService.week_start(
+            attrs.get('start') or end - timedelta(weeks=11)
+        )
+
+        if start > end:
+            raise serializers.ValidationError({
+                'start': 'La fecha inicial debe ser anterior a la final.'
+            })
+        if (end - start).days // 7 > self.MAX_WEEKS:
+            raise serializers.ValidationError({
+                'start': f'El rango máximo es de {self.MAX_WEEKS} semanas.'
+            })
+
+        attrs['start'] = start
+        attrs['end'] = end
+        return attrs
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    """Parámetros de consulta del leaderboard de ejecutivos."""
+
+    metric = serializers.ChoiceField(
+        choices=LeaderboardService.METRICS,
+        default='conversions'
+    )
+    window = serializers.ChoiceField(
+        choices=LeaderboardService.WINDOWS,
+        default='all'
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class AsOfQuerySerializer(serializers.Serializer):
+    """
+    Parámetros de consulta de estadísticas históricas.
+    ?at= (fecha y hora) o ?date= (fin de ese día en hora local).
+    """
+
+    at = serializers.DateTimeField(required=False)
+    date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if 'at' in attrs and 'date' in attrs:
+            raise serializers.ValidationError('Indique solo uno de at o date.')
+
+        if 'at' in attrs:
+            at = attrs['at']
+        elif 'date' in attrs:
+            at = timezone.make_aware(
+                datetime.combine(attrs['date'] + timedelta(days=1), time.min)
+            ) - timedelta(microseconds=1)
+        else:
+            raise serializers.ValidationError('Debe indicar at o date.')
+
+        if at > timezone.now():
+            raise serializers.ValidationError({'at': 'La fecha no puede estar en el futuro.'})
+
+        return {'at': at}
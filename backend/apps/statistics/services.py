@@ -1,63 +1,51 @@
 """
 Statistics Service - Cálculo de estadísticas de la plataforma.
 """
-from django.db.models import Sum, Count, Avg, Q
+from django.db import connection, transaction
+from django.db.models import Sum, Count, Q, DateField
+from django.db.models.functions import Trunc
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 from decimal import Decimal
+from itertools import islice
+
+from .cache import StatisticsCache, cached_statistics
 
 
 class StatisticsService:
     """
     Servicio para calcular estadísticas de la plataforma.
-    Todas las estadísticas se calculan en tiempo real.
+    Los totales globales provienen de un snapshot más las variaciones
+    registradas por signals; el resto se calcula en tiempo real. Los resultados públicos se cachean
+    por grupo (ver cache.py).
     """
 
     @classmethod
+    @cached_statistics('platform')
     def get_platform_statistics(cls):
         """
         Obtiene estadísticas generales de la plataforma.
+        Los totales se leen del snapshot PlatformStatistics; solo las
+        ventanas de 30 días se consultan sobre las tablas base.
 
         Returns:
             dict: Estadísticas de usuarios, proyectos, inversiones y leads
         """
         from apps.users.models import User
-        from apps.projects.models import Project
         from apps.investments.models import Investment
         from apps.leads.models import Lead
 
         now = timezone.now()
         last_30_days = now - timedelta(days=30)
 
-        # Usuarios
-        total_investors = User.objects.filter(role=User.Role.INVESTOR).count()
-        verified_investors = User.objects.filter(
-            role=User.Role.INVESTOR,
-            is_kyc_verified=True
-        ).count()
+        counters = cls.get_platform_snapshot().as_counters()
+
+        # Ventanas de 30 días
         new_investors_30d = User.objects.filter(
             role=User.Role.INVESTOR,
             created_at__gte=last_30_days
         ).count()
 
-        # Proyectos
-        total_projects = Project.objects.count()
-        active_projects = Project.objects.filter(
-            status__in=[Project.Status.FUNDING, Project.Status.IN_PROGRESS]
-        ).count()
-        completed_projects = Project.objects.filter(
-            status=Project.Status.COMPLETED
-        ).count()
-
-        # Inversiones
-        investments_data = Investment.objects.filter(
-            status=Investment.Status.ACTIVE
-        ).aggregate(
-            total_invested=Sum('amount'),
-            total_count=Count('id'),
-            avg_investment=Avg('amount')
-        )
-
         new_investments_30d = Investment.objects.filter(
             activated_at__gte=last_30_days,
             status=Investment.Status.ACTIVE
@@ -66,18 +54,15 @@ class StatisticsService:
             count=Count('id')
         )
 
-        total_returns = Investment.objects.filter(
-            status__in=[Investment.Status.ACTIVE, Investment.Status.COMPLETED]
-        ).aggregate(
-            expected=Sum('expected_return'),
-            actual=Sum('actual_return')
-        )
-
-        # Leads
-        total_leads = Lead.objects.count()
-        converted_leads = Lead.objects.filter(status=Lead.Status.CONVERTED).count()
         new_leads_30d = Lead.objects.filter(created_at__gte=last_30_days).count()
 
+        total_investors = counters['total_investors']
+        verified_investors = counters['verified_investors']
+        total_leads = counters['total_leads']
+        converted_leads = counters['converted_leads']
+        active_count = counters['active_investments_count']
+        active_amount = counters['active_investments_amount']
+
         conversion_rate = (
             (converted_leads / total_leads * 100) if total_leads > 0 else 0
         )
@@ -86,6 +71,10 @@ class StatisticsService:
             (verified_investors / total_investors * 100) if total_investors > 0 else 0
         )
 
+        average_amount = (
+            active_amount / active_count if active_count > 0 else Decimal('0')
+        )
+
         return {
             'users': {
                 'total_investors': total_investors,
@@ -94,18 +83,18 @@ class StatisticsService:
                 'verification_rate': round(verification_rate, 2)
             },
             'projects': {
-                'total': total_projects,
-                'active': active_projects,
-                'completed': completed_projects
+                'total': counters['total_projects'],
+                'active': counters['active_projects'],
+                'completed': counters['completed_projects']
             },
             'investments': {
-                'total_amount': investments_data['total_invested'] or Decimal('0'),
-                'total_count': investments_data['total_count'] or 0,
-                'average_amount': investments_data['avg_investment'] or Decimal('0'),
+                'total_amount': active_amount,
+                'total_count': active_count,
+                'average_amount': average_amount,
                 'new_amount_30d': new_investments_30d['amount'] or Decimal('0'),
                 'new_count_30d': new_investments_30d['count'] or 0,
-                'total_expected_returns': total_returns['expected'] or Decimal('0'),
-                'total_actual_returns': total_returns['actual'] or Decimal('0')
+                'total_expected_returns': counters['expected_returns'],
+                'total_actual_returns': counters['actual_returns']
             },
             'leads': {
                 'total': total_leads,
@@ -115,10 +104,200 @@ class StatisticsService:
             }
         }
 
+    # Variaciones pendientes a partir de las cuales una lectura las pliega
+    # en el snapshot
+    FOLD_PENDING_DELTAS = 1000
+
+    @classmethod
+    def get_platform_snapshot(cls):
+        """
+        Obtiene los contadores globales: la fila del snapshot (reconstruida
+        si no existe) más las variaciones aún no plegadas. Si hay
+        FOLD_PENDING_DELTAS o más, primero se pliegan.
+
+        Returns:
+            PlatformStatistics: Snapshot con las variaciones sumadas (no
+            guardar: la fila no las incluye)
+        """
+        from apps.statistics.models import PlatformStatistics, PlatformStatisticsDelta
+
+        snapshot = PlatformStatistics.objects.filter(
+            scope=PlatformStatistics.GLOBAL_SCOPE
+        ).first()
+        if snapshot is None:
+            snapshot, _ = cls.rebuild_platform_snapshot()
+            return snapshot
+
+        fields = PlatformStatistics.COUNTER_FIELDS
+        sums = {name: Sum(name) for name in fields}
+        pending = PlatformStatisticsDelta.objects.aggregate(pending=Count('id'), **sums)
+        if pending['pending'] >= cls.FOLD_PENDING_DELTAS and cls.fold_platform_deltas():
+            snapshot.refresh_from_db()
+            pending = PlatformStatisticsDelta.objects.aggregate(**sums)
+
+        for name in fields:
+            setattr(snapshot, name, getattr(snapshot, name) + (pending[name] or 0))
+        return snapshot
+
+    @classmethod
+    def apply_platform_deltas(cls, deltas):
+        """
+        Registra variaciones de los contadores globales como una fila
+        nueva de PlatformStatisticsDelta, dentro de la transacción del
+        save() que lo origina. Es solo un INSERT: no bloquea la fila del
+        snapshot ni serializa a los escritores concurrentes.
+
+        Args:
+            deltas: Dict {campo: variación}
+        """
+        from apps.statistics.models import PlatformStatisticsDelta
+
+        if not deltas:
+            return
+
+        PlatformStatisticsDelta.objects.create(**deltas)
+
+    @classmethod
+    def fold_platform_deltas(cls):
+        """
+        Suma al snapshot las variaciones confirmadas y las elimina, en una
+        sola sentencia (DELETE ... RETURNING dentro del UPDATE): cada
+        variación se pliega exactamente una vez aunque haya lecturas
+        plegando a la vez o escritores insertando.
+
+        Returns:
+            bool: True si existía el snapshot donde plegarlas
+        """
+        from apps.statistics.models import PlatformStatistics, PlatformStatisticsDelta
+
+        quote = connection.ops.quote_name
+        snapshot_table = quote(PlatformStatistics._meta.db_table)
+        fields = [quote(name) for name in PlatformStatistics.COUNTER_FIELDS]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH folded AS ('
+                f' DELETE FROM {quote(PlatformStatisticsDelta._meta.db_table)}'
+                f' WHERE EXISTS (SELECT 1 FROM {snapshot_table} WHERE {quote("scope")} = %s)'
+                f' RETURNING {", ".join(fields)}'
+                f') UPDATE {snapshot_table} SET {quote("updated_at")} = %s, '
+                + ', '.join(
+                    f'{field} = {field} + (SELECT COALESCE(SUM({field}), 0) FROM folded)'
+                    for field in fields
+                )
+                + f' WHERE {quote("scope")} = %s',
+                [PlatformStatistics.GLOBAL_SCOPE, timezone.now(), PlatformStatistics.GLOBAL_SCOPE]
+            )
+            return cursor.rowcount > 0
+
+    @classmethod
+    def compute_platform_counters(cls):
+        """
+        Calcula los contadores globales directamente desde las tablas base.
+        Es la referencia contra la que se valida el snapshot.
+
+        Returns:
+            dict: Contadores con los mismos nombres que PlatformStatistics
+        """
+        from apps.users.models import User
+        from apps.projects.models import Project
+        from apps.investments.models import Investment
+        from apps.leads.models import Lead
+
+        users = User.objects.filter(role=User.Role.INVESTOR).aggregate(
+            total=Count('id'),
+            verified=Count('id', filter=Q(is_kyc_verified=True))
+        )
+
+        projects = Project.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(
+                status__in=[Project.Status.FUNDING, Project.Status.IN_PROGRESS]
+            )),
+            completed=Count('id', filter=Q(status=Project.Status.COMPLETED))
+        )
+
+        active = Q(status=Investment.Status.ACTIVE)
+        with_returns = Q(status__in=[Investment.Status.ACTIVE, Investment.Status.COMPLETED])
+        investments = Investment.objects.aggregate(
+            active_count=Count('id', filter=active),
+            active_amount=Sum('amount', filter=active),
+            expected=Sum('expected_return', filter=with_returns),
+            actual=Sum('actual_return', filter=with_returns)
+        )
+
+        leads = Lead.objects.aggregate(
+            total=Count('id'),
+            converted=Count('id', filter=Q(status=Lead.Status.CONVERTED))
+        )
+
+        return {
+            'total_investors': users['total'],
+            'verified_investors': users['verified'],
+            'total_projects': projects['total'],
+            'active_projects': projects['active'],
+            'completed_projects': projects['completed'],
+            'active_investments_count': investments['active_count'],
+            'active_investments_amount': investments['active_amount'] or Decimal('0.00'),
+            'expected_returns': investments['expected'] or Decimal('0.00'),
+            'actual_returns': investments['actual'] or Decimal('0.00'),
+            'total_leads': leads['total'],
+            'converted_leads': leads['converted'],
+        }
+
+    @classmethod
+    def rebuild_platform_snapshot(cls, dry_run=False):
+        """
+        Reconstruye el snapshot desde las tablas base y descarta las
+        variaciones pendientes. Bloquea la tabla de variaciones (EXCLUSIVE:
+        permite leer, no insertar) antes de agregar: espera a que terminen
+        las transacciones con variaciones sin confirmar y las nuevas
+        esperan a la reconstrucción, así ninguna se pierde ni se cuenta
+        dos veces.
+
+        Args:
+            dry_run: Si es True solo compara, sin escribir
+
+        Returns:
+            tuple: (PlatformStatistics, dict) - (snapshot, diferencias
+            {campo: (valor_snapshot, valor_real)})
+        """
+        from apps.statistics.models import PlatformStatistics, PlatformStatisticsDelta
+
+        with transaction.atomic():
+            snapshot, _ = PlatformStatistics.objects.select_for_update().get_or_create(
+                scope=PlatformStatistics.GLOBAL_SCOPE
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'LOCK TABLE {connection.ops.quote_name(PlatformStatisticsDelta._meta.db_table)} '
+                    f'IN EXCLUSIVE MODE'
+                )
+            pending = PlatformStatisticsDelta.objects.aggregate(
+                **{name: Sum(name) for name in PlatformStatistics.COUNTER_FIELDS}
+            )
+            live = cls.compute_platform_counters()
+
+            differences = {}
+            for name, stored in snapshot.as_counters().items():
+                stored += pending[name] or 0
+                if stored != live[name]:
+                    differences[name] = (stored, live[name])
+
+            if not dry_run:
+                PlatformStatisticsDelta.objects.all().delete()
+                for name, value in live.items():
+                    setattr(snapshot, name, value)
+                snapshot.save()
+
+        return snapshot, differences
+
     @classmethod
+    @cached_statistics('executives')
     def get_executive_statistics(cls, executive=None):
         """
         Obtiene estadísticas por ejecutivo.
+        Usa un número constante de consultas (ejecutivos, leads agrupados e
+        inversiones agrupadas) sin importar cuántos ejecutivos existan.
 
         Args:
             executive: Usuario ejecutivo específico (opcional)
@@ -135,30 +314,47 @@ class StatisticsService:
         if executive:
             executives = executives.filter(id=executive.id)
 
-        stats = []
+        executives = list(executives)
+        executive_ids = [exec_user.id for exec_user in executives]
 
-        for exec_user in executives:
-            # Estadísticas de leads
-            leads_data = Lead.objects.filter(assigned_to=exec_user).aggregate(
+        # Leads agrupados por ejecutivo (una sola consulta)
+        leads_by_executive = {
+            row['assigned_to']: row
+            for row in Lead.objects.filter(
+                assigned_to__in=executive_ids
+            ).values('assigned_to').annotate(
                 total=Count('id'),
                 converted=Count('id', filter=Q(status=Lead.Status.CONVERTED)),
                 contacted=Count('id', filter=Q(status=Lead.Status.CONTACTED)),
                 interested=Count('id', filter=Q(status=Lead.Status.INTERESTED)),
                 new=Count('id', filter=Q(status=Lead.Status.NEW))
-            )
-
-            conversion_rate = (
-                (leads_data['converted'] / leads_data['total'] * 100)
-                if leads_data['total'] > 0 else 0
-            )
+            ).order_by()
+        }
 
-            # Inversiones de usuarios asignados a este ejecutivo
-            investments_data = Investment.objects.filter(
-                user__assigned_executive=exec_user,
+        # Inversiones activas de usuarios asignados, agrupadas por ejecutivo
+        investments_by_executive = {
+            row['user__assigned_executive']: row
+            for row in Investment.objects.filter(
+                user__assigned_executive__in=executive_ids,
                 status=Investment.Status.ACTIVE
-            ).aggregate(
+            ).values('user__assigned_executive').annotate(
                 total_amount=Sum('amount'),
                 count=Count('id')
+            ).order_by()
+        }
+
+        empty_leads = {'total': 0, 'converted': 0, 'contacted': 0, 'interested': 0, 'new': 0}
+        empty_investments = {'total_amount': None, 'count': 0}
+
+        stats = []
+
+        for exec_user in executives:
+            leads_data = leads_by_executive.get(exec_user.id, empty_leads)
+            investments_data = investments_by_executive.get(exec_user.id, empty_investments)
+
+            conversion_rate = (
+                (leads_data['converted'] / leads_data['total'] * 100)
+                if leads_data['total'] > 0 else 0
             )
 
             stats.append({
@@ -182,39 +378,122 @@ class StatisticsService:
         return stats
 
     @classmethod
-    def get_project_statistics(cls, project=None):
+    def get_project_statistics(cls, project=None, status=None):
         """
         Obtiene estadísticas por proyecto.
 
         Args:
             project: Proyecto específico (opcional)
+            status: Filtrar por estado del proyecto (opcional)
 
         Returns:
             list: Lista de estadísticas por proyecto
         """
-        from apps.projects.models import Project
-        from apps.investments.models import Investment
-        from apps.reservations.models import Reservation
-
-        projects = Project.objects.all()
+        projects = cls.get_project_statistics_queryset(status=status)
 
         if project:
             projects = projects.filter(id=project.id)
 
-        stats = []
+        return cls.build_project_statistics(projects)
 
-        for proj in projects:
-            investments_data = Investment.objects.filter(project=proj).aggregate(
+    @classmethod
+    def get_project_statistics_queryset(cls, status=None):
+        """
+        Proyectos incluidos en el reporte de estadísticas.
+
+        Args:
+            status: Filtrar por estado del proyecto (opcional)
+
+        Returns:
+            QuerySet de Project
+        """
+        from apps.projects.models import Project
+
+        projects = Project.objects.order_by('-created_at', 'id')
+        if status:
+            projects = projects.filter(status=status)
+        return projects
+
+    @classmethod
+    @cached_statistics('projects')
+    def build_project_statistics(cls, projects):
+        """
+        Estadísticas de un conjunto de proyectos (ej: una página), cacheadas.
+
+        Args:
+            projects: Iterable de Project
+
+        Returns:
+            list: Lista de estadísticas por proyecto
+        """
+        return cls.compute_project_statistics(projects)
+
+    @classmethod
+    def iter_project_statistics(cls, status=None, chunk_size=500):
+        """
+        Recorre las estadísticas de todos los proyectos por bloques, sin cache.
+        Pensado para exportaciones: la memoria depende de chunk_size, no del
+        total de proyectos.
+
+        Yields:
+            dict: Estadísticas de un proyecto
+        """
+        projects = cls.get_project_statistics_queryset(status=status).iterator(
+            chunk_size=chunk_size
+        )
+        while True:
+            chunk = list(islice(projects, chunk_size))
+            if not chunk:
+                return
+            yield from cls.compute_project_statistics(chunk)
+
+    @classmethod
+    def compute_project_statistics(cls, projects):
+        """
+        Calcula las estadísticas de un conjunto de proyectos.
+        Usa una consulta agrupada para inversiones y otra para reservas,
+        sin importar cuántos proyectos se incluyan.
+
+        Args:
+            projects: Iterable de Project
+
+        Returns:
+            list: Lista de estadísticas por proyecto
+        """
+        from apps.investments.models import Investment
+        from apps.reservations.models import Reservation
+
+        projects = list(projects)
+        project_ids = [proj.id for proj in projects]
+
+        investments_by_project = {
+            row['project']: row
+            for row in Investment.objects.filter(
+                project__in=project_ids
+            ).values('project').annotate(
                 active_amount=Sum('amount', filter=Q(status=Investment.Status.ACTIVE)),
                 active_count=Count('id', filter=Q(status=Investment.Status.ACTIVE)),
                 pending_amount=Sum('amount', filter=Q(status=Investment.Status.PENDING_PAYMENT)),
                 pending_count=Count('id', filter=Q(status=Investment.Status.PENDING_PAYMENT))
-            )
+            ).order_by()
+        }
 
-            reservations_data = Reservation.objects.filter(project=proj).aggregate(
-                pending_amount=Sum('amount', filter=Q(status=Reservation.Status.PENDING)),
-                pending_count=Count('id', filter=Q(status=Reservation.Status.PENDING))
-            )
+        reservations_by_project = {
+            row['project']: row
+            for row in Reservation.objects.filter(
+                project__in=project_ids,
+                status=Reservation.Status.PENDING
+            ).values('project').annotate(
+                pending_amount=Sum('amount'),
+                pending_count=Count('id')
+            ).order_by()
+        }
+
+        stats = []
+
+        for proj in projects:
+            investments_data = investments_by_project.get(proj.id, {})
+            reservations_data = reservations_by_project.get(proj.id, {})
 
             stats.append({
                 'project_id': str(proj.id),
@@ -224,20 +503,21 @@ class StatisticsService:
                 'current_amount': proj.current_amount,
                 'funding_progress': proj.funding_progress_percentage,
                 'investments': {
-                    'active_amount': investments_data['active_amount'] or Decimal('0'),
-                    'active_count': investments_data['active_count'] or 0,
-                    'pending_amount': investments_data['pending_amount'] or Decimal('0'),
-                    'pending_count': investments_data['pending_count'] or 0
+                    'active_amount': investments_data.get('active_amount') or Decimal('0'),
+                    'active_count': investments_data.get('active_count') or 0,
+                    'pending_amount': investments_data.get('pending_amount') or Decimal('0'),
+                    'pending_count': investments_data.get('pending_count') or 0
                 },
                 'reservations': {
-                    'pending_amount': reservations_data['pending_amount'] or Decimal('0'),
-                    'pending_count': reservations_data['pending_count'] or 0
+                    'pending_amount': reservations_data.get('pending_amount') or Decimal('0'),
+                    'pending_count': reservations_data.get('pending_count') or 0
                 }
             })
 
         return stats
 
     @classmethod
+    @cached_statistics('lead_sources')
     def get_lead_source_statistics(cls):
         """
         Obtiene estadísticas de leads por fuente.
@@ -267,3 +547,429 @@ class StatisticsService:
             })
 
         return stats
+
+    @classmethod
+    @cached_statistics('cohorts')
+    def get_lead_cohorts(cls, start, end, source=None):
+        """
+        Matriz semanal de cohortes de leads por fuente, leída desde las
+        tablas de rollup. Para cada semana de creación indica cuántos leads
+        convirtieron en la misma semana (posición 0), la siguiente, etc.
+
+        Args:
+            start: Lunes de la primera cohorte (incluida)
+            end: Lunes de la última cohorte (incluida)
+            source: Filtrar por fuente (opcional)
+
+        Returns:
+            list: Un dict por cohorte (semana, fuente) con actividad
+        """
+        from apps.leads.models import Lead
+        from apps.statistics.models import DailyLeadSourceRollup, WeeklyLeadCohortConversion
+
+        sizes = DailyLeadSourceRollup.objects.filter(
+            day__gte=start, day__lt=end + timedelta(days=7)
+        )
+        conversions = WeeklyLeadCohortConversion.objects.filter(
+            cohort_week__range=(start, end)
+        )
+        if source:
+            sizes = sizes.filter(source=source)
+            conversions = conversions.filter(source=source)
+
+        cohorts = {}
+        for row in sizes.annotate(
+            cohort_week=Trunc('day', 'week', output_field=DateField())
+        ).values('cohort_week', 'source').annotate(leads=Sum('new_leads')).order_by():
+            cohorts[(row['cohort_week'], row['source'])] = {'leads': row['leads'], 'by_week': {}}
+
+        for row in conversions.values_list('cohort_week', 'source', 'weeks_to_convert', 'conversions'):
+            cohort_week, cohort_source, offset, total = row
+            cohort = cohorts.setdefault((cohort_week, cohort_source), {'leads': 0, 'by_week': {}})
+            cohort['by_week'][offset] = total
+
+        current_week = StatisticsRollupService.week_start(timezone.localdate())
+        source_names = dict(Lead.Source.choices)
+
+        stats = []
+        for (cohort_week, cohort_source), cohort in sorted(cohorts.items()):
+            weeks = max(
+                (current_week - cohort_week).days // 7 + 1,
+                max(cohort['by_week'], default=-1) + 1
+            )
+            by_week = [cohort['by_week'].get(offset, 0) for offset in range(weeks)]
+            converted = sum(by_week)
+            if not cohort['leads'] and not converted:
+                continue
+            stats.append({
+                'cohort_week': cohort_week,
+                'source': cohort_source,
+                'source_display': source_names.get(cohort_source, cohort_source),
+                'leads': cohort['leads'],
+                'conversions_by_week': by_week,
+                'converted': converted,
+                'conversion_rate': round(
+                    converted / cohort['leads'] * 100 if cohort['leads'] else 0, 2
+                )
+            })
+
+        return stats
+
+    TIMESERIES_GRANULARITIES = ('day', 'week', 'month')
+
+    @classmethod
+    @cached_statistics('timeseries')
+    def get_timeseries(cls, start, end, granularity='day'):
+        """
+        Serie de tiempo de métricas diarias leída desde las tablas de rollup.
+        No consulta las tablas base.
+
+        Args:
+            start: Fecha inicial (incluida)
+            end: Fecha final (incluida)
+            granularity: 'day', 'week' o 'month'
+
+        Returns:
+            list: Un dict por período, incluyendo períodos sin actividad
+        """
+        from apps.statistics.models import DailyPlatformRollup, DailyLeadSourceRollup
+
+        if granularity not in cls.TIMESERIES_GRANULARITIES:
+            raise ValueError(f"Granularidad inválida: {granularity}")
+
+        period = Trunc('day', granularity, output_field=DateField())
+
+        platform_rows = DailyPlatformRollup.objects.filter(
+            day__range=(start, end)
+        ).annotate(period=period).values('period').annotate(
+            new_investors=Sum('new_investors'),
+            activated_count=Sum('activated_investments_count'),
+            activated_amount=Sum('activated_investments_amount')
+        ).order_by()
+
+        lead_rows = DailyLeadSourceRollup.objects.filter(
+            day__range=(start, end)
+        ).annotate(period=period).values('period', 'source').annotate(
+            new_leads=Sum('new_leads'),
+            conversions=Sum('conversions')
+        ).order_by()
+
+        buckets = {}
+        for period_start in cls._periods(start, end, granularity):
+            buckets[period_start] = {
+                'period': period_start,
+                'new_investors': 0,
+                'activated_investments_count': 0,
+                'activated_investments_amount': Decimal('0'),
+                'new_leads': 0,
+                'conversions': 0,
+                'new_leads_by_source': {},
+                'conversions_by_source': {},
+            }
+
+        for row in platform_rows:
+            bucket = buckets[row['period']]
+            bucket['new_investors'] = row['new_investors']
+            bucket['activated_investments_count'] = row['activated_count']
+            bucket['activated_investments_amount'] = row['activated_amount']
+
+        for row in lead_rows:
+            bucket = buckets[row['period']]
+            bucket['new_leads'] += row['new_leads']
+            bucket['conversions'] += row['conversions']
+            if row['new_leads']:
+                bucket['new_leads_by_source'][row['source']] = row['new_leads']
+            if row['conversions']:
+                bucket['conversions_by_source'][row['source']] = row['conversions']
+
+        return list(buckets.values())
+
+    @staticmethod
+    def _periods(start, end, granularity):
+        """Inicio de cada período entre start y end, alineado a la granularidad."""
+        if granularity == 'week':
+            current = start - timedelta(days=start.weekday())
+        elif granularity == 'month':
+            current = start.replace(day=1)
+        else:
+            current = start
+
+        while current <= end:
+            yield current
+            if granularity == 'week':
+                current += timedelta(days=7)
+            elif granularity == 'month':
+                current = (current + timedelta(days=32)).replace(day=1)
+            else:
+                current += timedelta(days=1)
+
+
+class StatisticsRollupService:
+    """
+    Servicio para mantener las tablas de rollup diario.
+    Los signals marcan los días afectados; el job solo recalcula esos días.
+    """
+
+    BATCH_SIZE = 100
+
+    @classmethod
+    def mark_dirty_days(cls, days):
+        """
+        Marca días para recálculo (INSERT ... ON CONFLICT DO NOTHING).
+
+        Args:
+            days: Iterable de date
+        """
+        from apps.statistics.models import StatisticsDirtyDay
+
+        days = {day for day in days if day is not None}
+        if days:
+            StatisticsDirtyDay.objects.bulk_create(
+                [StatisticsDirtyDay(day=day) for day in days],
+                ignore_conflicts=True
+            )
+
+    @classmethod
+    def mark_dirty_weeks(cls, weeks):
+        """
+        Marca semanas de cohorte (lunes) para recálculo.
+
+        Args:
+            weeks: Iterable de date
+        """
+        from apps.statistics.models import StatisticsDirtyWeek
+
+        weeks = set(weeks)
+        if weeks:
+            StatisticsDirtyWeek.objects.bulk_create(
+                [StatisticsDirtyWeek(week=week) for week in weeks],
+                ignore_conflicts=True
+            )
+
+    @staticmethod
+    def _claim(model, field, batch_size):
+        """
+        Toma y elimina de la cola un lote de claves en una transacción corta.
+        Las filas bloqueadas por otro worker se omiten (SKIP LOCKED). Un cambio
+        posterior al reclamo vuelve a insertar la clave, por lo que no se pierde.
+        """
+        with transaction.atomic():
+            keys = list(
+                model.objects.select_for_update(skip_locked=True)
+                .order_by(field)
+                .values_list(field, flat=True)[:batch_size]
+            )
+            model.objects.filter(**{f'{field}__in': keys}).delete()
+        return keys
+
+    @classmethod
+    def process_dirty_days(cls, batch_size=None):
+        """
+        Recalcula un lote de días marcados y marca sus semanas de cohorte.
+        Si el cálculo falla, los días vuelven a la cola.
+
+        Returns:
+            list: Días procesados
+        """
+        from apps.statistics.models import StatisticsDirtyDay
+
+        days = cls._claim(StatisticsDirtyDay, 'day', batch_size or cls.BATCH_SIZE)
+        try:
+            with transaction.atomic():
+                for day in days:
+                    cls.rollup_day(day)
+                cls.mark_dirty_weeks(cls.week_start(day) for day in days)
+        except Exception:
+            cls.mark_dirty_days(days)
+            raise
+
+        if days:
+            StatisticsCache.invalidate('timeseries')
+        return days
+
+    @classmethod
+    def process_dirty_weeks(cls, batch_size=None):
+        """
+        Recalcula la matriz de cohortes de un lote de semanas marcadas.
+        Si el cálculo falla, las semanas vuelven a la cola.
+
+        Returns:
+            list: Semanas procesadas
+        """
+        from apps.statistics.models import StatisticsDirtyWeek
+
+        weeks = cls._claim(StatisticsDirtyWeek, 'week', batch_size or cls.BATCH_SIZE)
+        try:
+            with transaction.atomic():
+                for week in weeks:
+                    cls.rollup_cohort_week(week)
+        except Exception:
+            cls.mark_dirty_weeks(weeks)
+            raise
+
+        if weeks:
+            StatisticsCache.invalidate('cohorts')
+        return weeks
+
+    @classmethod
+    def process_all(cls, batch_size=None):
+        """
+        Procesa la cola completa: primero los días, luego las semanas que
+        estos marcaron.
+
+        Returns:
+            int: Número de días procesados
+        """
+        total = 0
+        while True:
+            days = cls.process_dirty_days(batch_size)
+            if not days:
+                break
+            total += len(days)
+
+        while cls.process_dirty_weeks(batch_size):
+            pass
+
+        return total
+
+    @classmethod
+    def mark_history(cls, since=None):
+        """
+        Marca todos los días con actividad desde `since` (backfill).
+
+        Args:
+            since: Fecha inicial (opcional, por defecto desde el primer registro)
+
+        Returns:
+            int: Número de días marcados
+        """
+        from apps.users.models import User
+        from apps.investments.models import Investment
+        from apps.leads.models import Lead
+
+        firsts = [
+            User.objects.order_by('created_at').values_list('created_at', flat=True).first(),
+            Investment.objects.exclude(activated_at=None).order_by(
+                'activated_at'
+            ).values_list('activated_at', flat=True).first(),
+            Lead.objects.order_by('created_at').values_list('created_at', flat=True).first(),
+        ]
+        firsts = [timezone.localdate(value) for value in firsts if value]
+        if not firsts:
+            return 0
+
+        day = max(since, min(firsts)) if since else min(firsts)
+        today = timezone.localdate()
+        days = []
+        while day <= today:
+            days.append(day)
+            day += timedelta(days=1)
+
+        cls.mark_dirty_days(days)
+        return len(days)
+
+    @classmethod
+    def rollup_day(cls, day):
+        """
+        Recalcula los hechos de un día desde las tablas base.
+        Solo recorre filas del rango del día.
+
+        Args:
+            day: date (día local)
+        """
+        from apps.users.models import User
+        from apps.investments.models import Investment
+        from apps.leads.models import Lead
+        from apps.statistics.models import DailyPlatformRollup, DailyLeadSourceRollup
+
+        start, end = cls.day_bounds(day)
+
+        new_investors = User.objects.filter(
+            role=User.Role.INVESTOR,
+            created_at__gte=start,
+            created_at__lt=end
+        ).count()
+
+        activated = Investment.objects.filter(
+            status__in=[Investment.Status.ACTIVE, Investment.Status.COMPLETED],
+            activated_at__gte=start,
+            activated_at__lt=end
+        ).aggregate(count=Count('id'), amount=Sum('amount'))
+
+        DailyPlatformRollup.objects.update_or_create(
+            day=day,
+            defaults={
+                'new_investors': new_investors,
+                'activated_investments_count': activated['count'],
+                'activated_investments_amount': activated['amount'] or Decimal('0.00'),
+            }
+        )
+
+        by_source = {}
+        for row in Lead.objects.filter(
+            created_at__gte=start, created_at__lt=end
+        ).values('source').annotate(total=Count('id')).order_by():
+            by_source.setdefault(row['source'], {'new_leads': 0, 'conversions': 0})
+            by_source[row['source']]['new_leads'] = row['total']
+
+        for row in Lead.objects.filter(
+            status=Lead.Status.CONVERTED,
+            converted_at__gte=start,
+            converted_at__lt=end
+        ).values('source').annotate(total=Count('id')).order_by():
+            by_source.setdefault(row['source'], {'new_leads': 0, 'conversions': 0})
+            by_source[row['source']]['conversions'] = row['total']
+
+        DailyLeadSourceRollup.objects.filter(day=day).delete()
+        DailyLeadSourceRollup.objects.bulk_create([
+            DailyLeadSourceRollup(day=day, source=source, **values)
+            for source, values in by_source.items()
+        ])
+
+    @classmethod
+    def rollup_cohort_week(cls, week):
+        """
+        Recalcula la matriz de conversión de la cohorte de una semana.
+        Solo recorre leads creados en esa semana.
+
+        Args:
+            week: date (lunes de la semana local)
+        """
+        from apps.leads.models import Lead
+        from apps.statistics.models import WeeklyLeadCohortConversion
+
+        start, _ = cls.day_bounds(week)
+        _, end = cls.day_bounds(week + timedelta(days=6))
+
+        conversions = {}
+        for source, converted_at in Lead.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end,
+            status=Lead.Status.CONVERTED
+        ).exclude(converted_at=None).values_list('source', 'converted_at').iterator():
+            offset = max((cls.week_start(timezone.localdate(converted_at)) - week).days // 7, 0)
+            key = (source, offset)
+            conversions[key] = conversions.get(key, 0) + 1
+
+        WeeklyLeadCohortConversion.objects.filter(cohort_week=week).delete()
+        WeeklyLeadCohortConversion.objects.bulk_create([
+            WeeklyLeadCohortConversion(
+                cohort_week=week,
+                source=source,
+                weeks_to_convert=offset,
+                conversions=total
+            )
+            for (source, offset), total in conversions.items()
+        ])
+
+    @staticmethod
+    def week_start(day):
+        """Lunes de la semana de un día."""
+        return day - timedelta(days=day.weekday())
+
+    @staticmethod
+    def day_bounds(day):
+        """Inicio y fin (exclusivo) de un día local como datetimes aware."""
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        return start, end
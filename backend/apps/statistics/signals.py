@@ -0,0 +1,251 @@
+"""
+Signals que mantienen los datos precalculados de estadísticas.
+
+- Snapshot PlatformStatistics: cada modelo aporta un conjunto de contadores
+  según su estado. Al guardar o eliminar una instancia se registra la
+  diferencia entre el aporte anterior y el nuevo, en la misma transacción,
+  como una fila de PlatformStatisticsDelta (sin bloquear el snapshot).
+- Rollups diarios: cada cambio relevante marca los días afectados para que
+  el job de rollups los recalcule.
+- Cache: los cambios de estado de inversiones (aprobación de pagos), leads
+  (y su reasignación), reservas y proyectos, los datos de proyecto que
+  muestra el reporte y is_kyc_verified invalidan los grupos de cache que
+  dependen de ellos.
+- Cargas masivas de leads (leads_bulk_created) aplican lo mismo en bloque.
+"""
+from decimal import Decimal
+from django.db.models.signals import post_save, pre_delete
+from django.utils import timezone
+
+from core import tracking
+from apps.users.models import User
+from apps.projects.models import Project
+from apps.investments.models import Investment
+from apps.leads.models import Lead
+from apps.leads.signals import leads_bulk_created
+from apps.reservations.models import Reservation
+from .cache import StatisticsCache
+from .services import StatisticsService, StatisticsRollupService
+
+
+def user_counters(values):
+    """Aporte de un usuario a los contadores globales."""
+    if values['role'] != User.Role.INVESTOR:
+        return {}
+    return {
+        'total_investors': 1,
+        'verified_investors': 1 if values['is_kyc_verified'] else 0,
+    }
+
+
+def project_counters(values):
+    """Aporte de un proyecto a los contadores globales."""
+    status = values['status']
+    return {
+        'total_projects': 1,
+        'active_projects': 1 if status in (
+            Project.Status.FUNDING, Project.Status.IN_PROGRESS
+        ) else 0,
+        'completed_projects': 1 if status == Project.Status.COMPLETED else 0,
+    }
+
+
+def investment_counters(values):
+    """Aporte de una inversión a los contadores globales."""
+    status = values['status']
+    counters = {}
+    if status == Investment.Status.ACTIVE:
+        counters['active_investments_count'] = 1
+        counters['active_investments_amount'] = values['amount'] or Decimal('0')
+    if status in (Investment.Status.ACTIVE, Investment.Status.COMPLETED):
+        counters['expected_returns'] = values['expected_return'] or Decimal('0')
+        counters['actual_returns'] = values['actual_return'] or Decimal('0')
+    return counters
+
+
+def lead_counters(values):
+    """Aporte de un lead a los contadores globales."""
+    return {
+        'total_leads': 1,
+        'converted_leads': 1 if values['status'] == Lead.Status.CONVERTED else 0,
+    }
+
+
+COUNTERS = {
+    User: (('role', 'is_kyc_verified'), user_counters),
+    Project: (('status',), project_counters),
+    Investment: (('status', 'amount', 'expected_return', 'actual_return'), investment_counters),
+    Lead: (('status',), lead_counters),
+}
+
+
+def counter_deltas(new, old):
+    """Diferencia entre dos aportes, omitiendo contadores sin cambio."""
+    deltas = {}
+    for name in new.keys() | old.keys():
+        value = new.get(name, 0) - old.get(name, 0)
+        if value:
+            deltas[name] = value
+    return deltas
+
+
+def _current_values(instance, fields):
+    return {name: getattr(instance, name) for name in fields}
+
+
+def update_counters_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    fields, counters = COUNTERS[sender]
+    previous = tracking.previous_values(instance)
+    old = counters(previous) if previous is not None else {}
+    new = counters(_current_values(instance, fields))
+    StatisticsService.apply_platform_deltas(counter_deltas(new, old))
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    fields, counters = COUNTERS[sender]
+    loaded = tracking.loaded_values(instance)
+    values = loaded if loaded is not None else _current_values(instance, fields)
+    StatisticsService.apply_platform_deltas(counter_deltas({}, counters(values)))
+
+
+def _local_day(value):
+    return timezone.localdate(value) if value else None
+
+
+def user_rollup_days(values):
+    """Días de rollup a los que aporta un usuario."""
+    if values['role'] != User.Role.INVESTOR:
+        return set()
+    return {_local_day(values['created_at'])}
+
+
+def investment_rollup_days(values):
+    """Días de rollup a los que aporta una inversión."""
+    if values['status'] not in (Investment.Status.ACTIVE, Investment.Status.COMPLETED):
+        return set()
+    return {_local_day(values['activated_at'])}
+
+
+def lead_rollup_days(values):
+    """Días de rollup a los que aporta un lead (creación y conversión)."""
+    days = {_local_day(values['created_at'])}
+    if values['status'] == Lead.Status.CONVERTED:
+        days.add(_local_day(values['converted_at']))
+    return days
+
+
+ROLLUPS = {
+    User: (('role', 'created_at'), user_rollup_days),
+    Investment: (('status', 'activated_at', 'amount'), investment_rollup_days),
+    Lead: (('source', 'status', 'converted_at', 'created_at'), lead_rollup_days),
+}
+
+
+def mark_rollup_days_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    fields, rollup_days = ROLLUPS[sender]
+    previous = tracking.previous_values(instance)
+    current = _current_values(instance, fields)
+    if previous is None:
+        days = rollup_days(current)
+    elif any(previous.get(name) != current[name] for name in fields):
+        days = rollup_days(previous) | rollup_days(current)
+    else:
+        return
+    StatisticsRollupService.mark_dirty_days(days)
+
+
+def mark_rollup_days_on_delete(sender, instance, **kwargs):
+    fields, rollup_days = ROLLUPS[sender]
+    loaded = tracking.loaded_values(instance)
+    values = loaded if loaded is not None else _current_values(instance, fields)
+    StatisticsRollupService.mark_dirty_days(rollup_days(values))
+
+
+CACHE_INVALIDATIONS = {
+    User: (('is_kyc_verified',), ('platform',)),
+    Investment: (('status',), ('platform', 'executives', 'projects')),
+    Lead: (('status', 'assigned_to_id'), ('platform', 'executives', 'lead_sources')),
+    Reservation: (('status', 'amount'), ('projects',)),
+    Project: (
+        ('status', 'title', 'target_amount', 'current_amount'),
+        ('platform', 'projects')
+    ),
+}
+
+
+def invalidate_cache_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    fields, groups = CACHE_INVALIDATIONS[sender]
+    previous = tracking.previous_values(instance)
+    if previous is None or any(
+        previous.get(name) != getattr(instance, name) for name in fields
+    ):
+        StatisticsCache.invalidate(*groups)
+
+
+def invalidate_cache_on_delete(sender, instance, **kwargs):
+    _, groups = CACHE_INVALIDATIONS[sender]
+    StatisticsCache.invalidate(*groups)
+
+
+def update_statistics_on_bulk_create(sender, leads, **kwargs):
+    """Contadores, días de rollup y cache para leads insertados en bloque."""
+    counter_fields, counters = COUNTERS[sender]
+    rollup_fields, rollup_days = ROLLUPS[sender]
+
+    totals = {}
+    days = set()
+    for lead in leads:
+        for name, value in counters(_current_values(lead, counter_fields)).items():
+            totals[name] = totals.get(name, 0) + value
+        days |= rollup_days(_current_values(lead, rollup_fields))
+
+    StatisticsService.apply_platform_deltas(counter_deltas(totals, {}))
+    StatisticsRollupService.mark_dirty_days(days)
+    StatisticsCache.invalidate(*CACHE_INVALIDATIONS[sender][1])
+
+
+def connect():
+    """Registra el seguimiento de campos y los receivers de cada modelo."""
+    for model, (fields, _) in COUNTERS.items():
+        tracking.track_fields(model, fields)
+        post_save.connect(
+            update_counters_on_save, sender=model,
+            dispatch_uid=f'statistics_counters_save_{model._meta.label}'
+        )
+        pre_delete.connect(
+            update_counters_on_delete, sender=model,
+            dispatch_uid=f'statistics_counters_delete_{model._meta.label}'
+        )
+
+    for model, (fields, _) in ROLLUPS.items():
+        tracking.track_fields(model, fields)
+        post_save.connect(
+            mark_rollup_days_on_save, sender=model,
+            dispatch_uid=f'statistics_rollups_save_{model._meta.label}'
+        )
+        pre_delete.connect(
+            mark_rollup_days_on_delete, sender=model,
+            dispatch_uid=f'statistics_rollups_delete_{model._meta.label}'
+        )
+
+    for model, (fields, _) in CACHE_INVALIDATIONS.items():
+        tracking.track_fields(model, fields)
+        post_save.connect(
+            invalidate_cache_on_save, sender=model,
+            dispatch_uid=f'statistics_cache_save_{model._meta.label}'
+        )
+        pre_delete.connect(
+            invalidate_cache_on_delete, sender=model,
+            dispatch_uid=f'statistics_cache_delete_{model._meta.label}'
+        )
+
+    leads_bulk_created.connect(
+        update_statistics_on_bulk_create, sender=Lead,
+        dispatch_uid='statistics_leads_bulk_create'
+    )
@@ -9,7 +9,12 @@ from .views import (
     ExecutiveDetailStatisticsView,
     MyStatisticsView,
     ProjectStatisticsView,
+    ProjectStatisticsExportView,
     LeadSourceStatisticsView,
+    LeadCohortStatisticsView,
+    TimeseriesStatisticsView,
+    AsOfStatisticsView,
+    LeaderboardView,
 )
 
 urlpatterns = [
@@ -18,5 +23,10 @@ urlpatterns = [
     path('executives/<uuid:pk>/', ExecutiveDetailStatisticsView.as_view(), name='executive_detail_stats'),
     path('my/', MyStatisticsView.as_view(), name='my_stats'),
     path('projects/', ProjectStatisticsView.as_view(), name='project_stats'),
+    path('projects/export/', ProjectStatisticsExportView.as_view(), name='project_stats_export'),
     path('lead-sources/', LeadSourceStatisticsView.as_view(), name='lead_source_stats'),
+    path('lead-cohorts/', LeadCohortStatisticsView.as_view(), name='lead_cohort_stats'),
+    path('timeseries/', TimeseriesStatisticsView.as_view(), name='timeseries_stats'),
+    path('as-of/', AsOfStatisticsView.as_view(), name='as_of_stats'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
 ]
@@ -1,10 +1,20 @@
 """
 Statistics views for SomosRentable API.
 """
-from rest_framework import permissions
+from rest_framework import generics, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-
+from rest_framework.pagination import PageNumberPagination
+
+from core.exports import streaming_export
+from .events import EventLogService
+from .leaderboard import LeaderboardService
+from .serializers import (
+    AsOfQuerySerializer,
+    TimeseriesQuerySerializer,
+    LeadCohortQuerySerializer,
+    LeaderboardQuerySerializer,
+)
 from .services import StatisticsService
 from apps.users.models import User
 from apps.users.views import IsAdminOrExecutive, IsAdmin
@@ -66,15 +76,63 @@ class MyStatisticsView(APIView):
         return Response(stats[0] if stats else {})
 
 
-class ProjectStatisticsView(APIView):
+class StatisticsPagination(PageNumberPagination):
+    """Paginación para reportes de estadísticas."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class ProjectStatisticsView(generics.GenericAPIView):
     """
     Estadísticas por proyecto (admin).
+    Filtro opcional ?status= y paginación (?page=, ?page_size=).
     """
     permission_classes = [IsAdmin]
+    pagination_class = StatisticsPagination
+
+    def get_queryset(self):
+        return StatisticsService.get_project_statistics_queryset(
+            status=self.request.query_params.get('status')
+        )
 
     def get(self, request):
-        stats = StatisticsService.get_project_statistics()
-        return Response(stats)
+        page = self.paginate_queryset(self.get_queryset())
+        stats = StatisticsService.build_project_statistics(page)
+        return self.get_paginated_response(stats)
+
+
+class ProjectStatisticsExportView(APIView):
+    """
+    Exportar estadísticas por proyecto en streaming (admin).
+    Filtro opcional ?status=; formato ?output=csv|ndjson.
+    """
+    permission_classes = [IsAdmin]
+
+    EXPORT_COLUMNS = (
+        'project_id', 'project_title', 'status', 'target_amount', 'current_amount',
+        'funding_progress', 'active_investments_amount', 'active_investments_count',
+        'pending_investments_amount', 'pending_investments_count',
+        'pending_reservations_amount', 'pending_reservations_count',
+    )
+
+    def get_rows(self):
+        stats = StatisticsService.iter_project_statistics(
+            status=self.request.query_params.get('status')
+        )
+        for row in stats:
+            yield (
+                row['project_id'], row['project_title'], row['status'],
+                row['target_amount'], row['current_amount'], row['funding_progress'],
+                row['investments']['active_amount'], row['investments']['active_count'],
+                row['investments']['pending_amount'], row['investments']['pending_count'],
+                row['reservations']['pending_amount'], row['reservations']['pending_count'],
+            )
+
+    def get(self, request):
+        return streaming_export(
+            request, 'estadisticas-proyectos', self.EXPORT_COLUMNS, self.get_rows()
+        )
 
 
 class LeadSourceStatisticsView(APIView):
@@ -86,3 +144,109 @@ class LeadSourceStatisticsView(APIView):
     def get(self, request):
         stats = StatisticsService.get_lead_source_statistics()
         return Response(stats)
+
+
+class TimeseriesStatisticsView(APIView):
+    """
+    Serie de tiempo de métricas de plataforma (admin).
+    Parámetros: ?start=YYYY-MM-DD&end=YYYY-MM-DD&granularity=day|week|month
+    Se sirve desde las tablas de rollup diario.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        serializer = TimeseriesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        series = StatisticsService.get_timeseries(**serializer.validated_data)
+        return Response({
+            **serializer.validated_data,
+            'results': series
+        })
+
+
+class AsOfStatisticsView(APIView):
+    """
+    Contadores de plataforma a un instante dado (admin).
+    Parámetros: ?at=YYYY-MM-DDTHH:MM:SS o ?date=YYYY-MM-DD
+    Se reconstruyen desde el checkpoint anterior más cercano más los
+    eventos de dominio posteriores.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        serializer = AsOfQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        at = serializer.validated_data['at']
+
+        counters, checkpoint, replayed = EventLogService.counters_as_of(at)
+        return Response({
+            'at': at,
+            'checkpoint': checkpoint.as_of if checkpoint else None,
+            'events_replayed': replayed,
+            'statistics': counters,
+        })
+
+
+class LeadCohortStatisticsView(APIView):
+    """
+    Matriz semanal de conversión de leads por fuente (admin).
+    Parámetros: ?start=YYYY-MM-DD&end=YYYY-MM-DD&source=
+    Las fechas se alinean al lunes de su semana. Se sirve desde las tablas
+    de rollup.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        serializer = LeadCohortQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        cohorts = StatisticsService.get_lead_cohorts(**serializer.validated_data)
+        return Response({
+            **serializer.validated_data,
+            'results': cohorts
+        })
+
+
+class LeaderboardView(APIView):
+    """
+    Leaderboard de ejecutivos (admin/ejecutivo).
+    Parámetros: ?metric=conversions|investment_amount&window=all|week|month&limit=
+    Los ejecutivos reciben además su propia posición en 'me'.
+    """
+    permission_classes = [IsAdminOrExecutive]
+
+    def get(self, request):
+        serializer = LeaderboardQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        metric = serializer.validated_data['metric']
+        window = serializer.validated_data['window']
+
+        top = LeaderboardService.top(metric, window, serializer.validated_data['limit'])
+        executives = {
+            str(executive.id): executive
+            for executive in User.objects.filter(id__in=[member for member, _ in top])
+        }
+
+        results = []
+        for position, (executive_id, score) in enumerate(top, start=1):
+            executive = executives.get(executive_id)
+            results.append({
+                'rank': position,
+                'executive_id': executive_id,
+                'executive_name': executive.get_full_name() if executive else '',
+                'score': score,
+            })
+
+        data = {
+            'metric': metric,
+            'window': window,
+            'period': LeaderboardService.period(window)[0],
+            'results': results,
+        }
+
+        if request.user.role == User.Role.EXECUTIVE:
+            rank, score = LeaderboardService.rank(metric, window, request.user.id)
+            data['me'] = {'rank': rank, 'score': score}
+
+        return Response(data)
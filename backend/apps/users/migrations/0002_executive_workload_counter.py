@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:06
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_active_leads_count(apps, schema_editor):
+    """Inicializa el contador con los leads abiertos asignados a cada usuario."""
+    User = apps.get_model('users', 'User')
+    Lead = apps.get_model('leads', 'Lead')
+
+    rows = Lead.objects.filter(assigned_to__isnull=False).exclude(
+        status__in=['converted', 'not_interested', 'invalid']
+    ).values('assigned_to').annotate(total=Count('id')).order_by()
+    for row in rows:
+        User.objects.filter(pk=row['assigned_to']).update(active_leads_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+        ('leads', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='active_leads_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Leads activos asignados'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_active', 'active_leads_count'], name='users_executive_workload_idx'),
+        ),
+        migrations.RunPython(populate_active_leads_count, migrations.RunPython.noop),
+    ]
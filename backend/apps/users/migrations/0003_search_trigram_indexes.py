@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:27
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_executive_workload_counter'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='users_email_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), name='users_first_name_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), name='users_last_name_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:32
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_search_trigram_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['created_at', 'id'], name='users_keyset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['role', 'created_at', 'id'], name='users_role_keyset_idx'),
+        ),
+    ]
@@ -2,7 +2,9 @@
 User models for SomosRentable.
 """
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from core.models import BaseModel
 
 
@@ -89,16 +91,38 @@ class User(AbstractUser, BaseModel):
         verbose_name='Ejecutivo asignado'
     )
 
+    # Leads abiertos asignados (solo ejecutivos). Lo mantienen los signals
+    # de leads; reconcile_lead_counters corrige desviaciones.
+    active_leads_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Leads activos asignados'
+    )
+
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
+    # Columnas de la búsqueda ?q= (índice trigram sobre UPPER de cada una)
+    SEARCH_FIELDS = ('email', 'first_name', 'last_name')
+
     class Meta:
         db_table = 'users'
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['role', 'is_active', 'active_leads_count'],
+                name='users_executive_workload_idx'
+            ),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='users_email_trgm_idx'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='users_first_name_trgm_idx'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='users_last_name_trgm_idx'),
+            # Paginación por cursor (core.pagination)
+            models.Index(fields=['created_at', 'id'], name='users_keyset_idx'),
+            models.Index(fields=['role', 'created_at', 'id'], name='users_role_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.email
@@ -8,6 +8,9 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import update_session_auth_hash
 
+from core import search
+from core.pagination import KeysetPagination
+
 from .models import User
 from .serializers import (
     UserSerializer,
@@ -114,27 +117,45 @@ class IsAdmin(permissions.BasePermission):
         return request.user.is_authenticated and request.user.role == User.Role.ADMIN
 
 
-class UserListView(generics.ListAPIView):
+class UserSearchMixin(search.SearchMixin):
+    """Búsqueda ?q= por email o nombre y orden de los listados de usuarios."""
+
+    def search_users(self, queryset):
+        query = self.request.query_params.get('q')
+        if query:
+            return self.apply_search(
+                queryset, query, User.SEARCH_FIELDS, ('-search_rank', '-created_at')
+            )
+        return queryset.order_by('-created_at')
+
+
+class UserListView(UserSearchMixin, generics.ListAPIView):
     """
     Listar usuarios (solo admin/ejecutivo).
+    Búsqueda por email o nombre con ?q=, ordenada por relevancia.
+    Paginación por cursor opcional con ?pagination=cursor.
     """
     serializer_class = UserListSerializer
     permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = User.objects.all()
         role = self.request.query_params.get('role')
         if role:
             queryset = queryset.filter(role=role)
-        return queryset.order_by('-created_at')
+        return self.search_users(queryset)
 
 
-class InvestorListView(generics.ListAPIView):
+class InvestorListView(UserSearchMixin, generics.ListAPIView):
     """
     Listar inversionistas (admin/ejecutivo).
+    Búsqueda por email o nombre con ?q=, ordenada por relevancia.
+    Paginación por cursor opcional con ?pagination=cursor.
     """
     serializer_class = UserListSerializer
     permission_classes = [IsAdminOrExecutive]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = User.objects.filter(role=User.Role.INVESTOR)
@@ -143,7 +164,7 @@ class InvestorListView(generics.ListAPIView):
         if self.request.user.role == User.Role.EXECUTIVE:
             queryset = queryset.filter(assigned_executive=self.request.user)
 
-        return queryset.order_by('-created_at')
+        return self.search_users(queryset)
 
 
 class UserDetailView(generics.RetrieveAPIView):
@@ -0,0 +1,14 @@
+"""
+Benchmarks de estadísticas y de paginación de listados a volúmenes de
+producción.
+
+No forman parte de la suite normal (pytest.ini limita testpaths a tests/).
+Se ejecutan contra PostgreSQL local indicando el directorio explícitamente:
+
+    DATABASE_URL=postgres://... pytest benchmarks --bench-scale=medium
+
+Opciones: --bench-scale (small|medium|large), --bench-factor, --bench-repeat
+y --bench-output (JSON de resultados). Para comparar dos ejecuciones:
+
+    python benchmarks/compare.py antes.json despues.json
+"""
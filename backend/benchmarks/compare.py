@@ -0,0 +1,57 @@
+"""
+Compara dos archivos de resultados de benchmarks.
+
+    python benchmarks/compare.py antes.json despues.json [--threshold 1.25]
+
+Termina con código 1 si algún caso empeora su mediana más allá del umbral
+o ejecuta más consultas SQL.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as file:
+        data = json.load(file)
+    return data, {(row['kind'], row['name']): row for row in data['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Razón máxima permitida entre medianas (después / antes)')
+    args = parser.parse_args()
+
+    before_data, before = load(args.before)
+    after_data, after = load(args.after)
+
+    if before_data['dataset'].get('counts') != after_data['dataset'].get('counts'):
+        print('Advertencia: los datasets tienen tamaños distintos.')
+
+    regressions = 0
+    print(f"{'caso':<40} {'antes ms':>10} {'después ms':>11} {'razón':>7} {'consultas':>11}")
+    for key in sorted(before.keys() | after.keys()):
+        old, new = before.get(key), after.get(key)
+        label = f'{key[0]}:{key[1]}'
+        if not old or not new:
+            print(f"{label:<40} {'(solo en uno de los archivos)':>41}")
+            continue
+
+        ratio = new['median_ms'] / old['median_ms'] if old['median_ms'] else 1
+        flag = ''
+        if ratio > args.threshold or new['queries'] > old['queries']:
+            flag = '  <-- regresión'
+            regressions += 1
+        print(
+            f"{label:<40} {old['median_ms']:>10.2f} {new['median_ms']:>11.2f} "
+            f"{ratio:>7.2f} {old['queries']:>5} -> {new['queries']:<3}{flag}"
+        )
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
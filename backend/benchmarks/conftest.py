@@ -0,0 +1,141 @@
+"""
+Fixtures y opciones de los benchmarks.
+Los datos sintéticos se cargan una vez por sesión en la base de tests y los
+resultados se escriben como JSON al terminar.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import django
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .generator import SCALES, generate, is_loaded, scale_counts
+
+RESULTS = {'environment': {}, 'dataset': {}, 'results': []}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption(
+        '--bench-scale', default=os.environ.get('BENCH_SCALE', 'small'),
+        choices=sorted(SCALES), help='Escala de datos sintéticos'
+    )
+    group.addoption(
+        '--bench-factor', type=float, default=float(os.environ.get('BENCH_FACTOR', 1)),
+        help='Multiplicador sobre las cantidades de la escala'
+    )
+    group.addoption(
+        '--bench-repeat', type=int, default=int(os.environ.get('BENCH_REPEAT', 5)),
+        help='Ejecuciones medidas por caso'
+    )
+    group.addoption(
+        '--bench-output', default=os.environ.get('BENCH_OUTPUT'),
+        help='Archivo JSON de resultados (por defecto benchmarks/results/<fecha>.json)'
+    )
+
+
+@pytest.fixture(scope='session')
+def bench_data(request, django_db_setup, django_db_blocker):
+    """Carga los datos sintéticos una sola vez por sesión."""
+    config = request.config
+    counts = scale_counts(
+        config.getoption('--bench-scale'), config.getoption('--bench-factor')
+    )
+    with django_db_blocker.unblock():
+        reused = is_loaded()
+        timings = {} if reused else generate(counts)
+        RESULTS['environment'] = {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'database_version': getattr(connection, 'pg_version', None),
+        }
+
+    RESULTS['dataset'] = {
+        'scale': config.getoption('--bench-scale'),
+        'factor': config.getoption('--bench-factor'),
+        'counts': counts,
+        'reused': reused,
+        'load_seconds': timings,
+    }
+    return counts
+
+
+@pytest.fixture
+def measure(request, bench_data):
+    """
+    Mide una función: latencia en frío (cache vacío) en cada repetición,
+    una lectura en caliente y el número de consultas SQL en frío.
+    """
+    repeat = request.config.getoption('--bench-repeat')
+
+    def run(name, kind, func):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        # Leer antes de otra request: request_started limpia el log de consultas
+        query_count = len(queries)
+
+        cold = []
+        for _ in range(repeat):
+            cache.clear()
+            started = time.perf_counter()
+            func()
+            cold.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        func()
+        warm = (time.perf_counter() - started) * 1000
+
+        result = {
+            'name': name,
+            'kind': kind,
+            'queries': query_count,
+            'runs': repeat,
+            'min_ms': round(min(cold), 3),
+            'median_ms': round(statistics.median(cold), 3),
+            'max_ms': round(max(cold), 3),
+            'warm_ms': round(warm, 3),
+        }
+        RESULTS['results'].append(result)
+        return result
+
+    return run
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not RESULTS['results']:
+        return
+
+    output = session.config.getoption('--bench-output')
+    if output:
+        path = Path(output)
+    else:
+        path = Path(__file__).parent / 'results' / f'{timezone.now():%Y%m%dT%H%M%S}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    payload = {
+        'commit': _git_commit(),
+        'created_at': timezone.now().isoformat(),
+        **RESULTS,
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    session.config.get_terminal_writer().line(f'Resultados de benchmarks: {path}')
@@ -0,0 +1,252 @@
+"""
+Generador de datos sintéticos para benchmarks.
+
+Carga usuarios, proyectos, leads, inversiones y reservas con bulk_create
+en lotes, con fechas repartidas en el último año. bulk_create no dispara
+signals, por lo que al final se reconstruyen los datos derivados
+(snapshot, rollups, leaderboard y carga de ejecutivos) como se haría tras una carga masiva.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from apps.users.models import User
+from apps.projects.models import Project
+from apps.leads.models import Lead
+from apps.investments.models import Investment
+from apps.reservations.models import Reservation
+
+EMAIL_PREFIX = 'bench-'
+
+SCALES = {
+    'small': {
+        'executives': 10, 'investors': 2_000, 'projects': 50,
+        'leads': 10_000, 'investments': 5_000, 'reservations': 1_000,
+    },
+    'medium': {
+        'executives': 50, 'investors': 50_000, 'projects': 500,
+        'leads': 500_000, 'investments': 100_000, 'reservations': 20_000,
+    },
+    'large': {
+        'executives': 200, 'investors': 500_000, 'projects': 2_000,
+        'leads': 5_000_000, 'investments': 1_000_000, 'reservations': 200_000,
+    },
+}
+
+BATCH_SIZE = 5_000
+HISTORY_DAYS = 365
+
+
+def scale_counts(name='small', factor=1.0):
+    """Cantidades de una escala, multiplicadas por factor."""
+    return {
+        model: max(1, int(count * factor))
+        for model, count in SCALES[name].items()
+    }
+
+
+def is_loaded():
+    """Indica si la base ya tiene datos de benchmark (ej: con --reuse-db)."""
+    return User.objects.filter(email__startswith=EMAIL_PREFIX).exists()
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """Permite asignar created_at/updated_at explícitamente en bulk_create."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _bulk_insert(model, objects):
+    """Inserta un generador de instancias en lotes de BATCH_SIZE."""
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def _random_moment(rng, now):
+    return now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86_400))
+
+
+def generate(counts, seed=42):
+    """
+    Carga datos sintéticos y reconstruye los datos derivados.
+
+    Args:
+        counts: dict con executives, investors, projects, leads,
+            investments y reservations
+        seed: Semilla para resultados reproducibles
+
+    Returns:
+        dict: Segundos empleados por etapa
+    """
+    from apps.leads.services import LeadService
+    from apps.statistics.leaderboard import LeaderboardService
+    from apps.statistics.services import StatisticsService, StatisticsRollupService
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password('bench123')
+    timings = {}
+
+    def stage(name, func):
+        started = time.perf_counter()
+        result = func()
+        timings[name] = round(time.perf_counter() - started, 3)
+        return result
+
+    with manual_timestamps(User, Project, Lead, Investment, Reservation):
+        def users():
+            executives = [
+                User(
+                    email=f'{EMAIL_PREFIX}exec{i}@example.com', password=password,
+                    first_name='Ejecutivo', last_name=str(i), role=User.Role.EXECUTIVE,
+                    created_at=now, updated_at=now,
+                )
+                for i in range(counts['executives'])
+            ]
+            User.objects.bulk_create(executives)
+
+            def build(i):
+                created = _random_moment(rng, now)
+                return User(
+                    email=f'{EMAIL_PREFIX}investor{i}@example.com', password=password,
+                    first_name='Inversionista', last_name=str(i), role=User.Role.INVESTOR,
+                    is_kyc_verified=rng.random() < 0.7,
+                    assigned_executive=rng.choice(executives),
+                    created_at=created, updated_at=created,
+                )
+
+            _bulk_insert(User, (build(i) for i in range(counts['investors'])))
+            return executives
+
+        executives = stage('users', users)
+        executive_ids = [executive.id for executive in executives]
+
+        def projects():
+            statuses = [
+                Project.Status.FUNDING, Project.Status.FUNDED,
+                Project.Status.IN_PROGRESS, Project.Status.COMPLETED,
+            ]
+
+            def build(i):
+                created = _random_moment(rng, now)
+                return Project(
+                    title=f'Proyecto benchmark {i}', slug=f'{EMAIL_PREFIX}proyecto-{i}',
+                    description='Proyecto sintético', location='Santiago',
+                    target_amount=Decimal('500000000'), annual_return_rate=Decimal('12.00'),
+                    funding_start_date=created.date(),
+                    funding_end_date=(created + timedelta(days=90)).date(),
+                    status=rng.choice(statuses),
+                    created_at=created, updated_at=created,
+                )
+
+            _bulk_insert(Project, (build(i) for i in range(counts['projects'])))
+            return list(Project.objects.filter(slug__startswith=EMAIL_PREFIX))
+
+        projects = stage('projects', projects)
+        project_ids = [project.id for project in projects]
+
+        def leads():
+            sources = [choice for choice, _ in Lead.Source.choices]
+            statuses = [choice for choice, _ in Lead.Status.choices]
+
+            def build(i):
+                created = _random_moment(rng, now)
+                status = rng.choice(statuses)
+                converted = (
+                    min(created + timedelta(days=rng.randint(0, 60)), now)
+                    if status == Lead.Status.CONVERTED else None
+                )
+                email = f'{EMAIL_PREFIX}lead{i}@example.com'
+                return Lead(
+                    email=email, email_normalized=email, name=f'Lead {i}',
+                    source=rng.choice(sources), status=status,
+                    assigned_to_id=rng.choice(executive_ids),
+                    assigned_at=created, converted_at=converted,
+                    created_at=created, updated_at=converted or created,
+                )
+
+            _bulk_insert(Lead, (build(i) for i in range(counts['leads'])))
+
+        stage('leads', leads)
+
+        investor_ids = list(
+            User.objects.filter(
+                email__startswith=EMAIL_PREFIX, role=User.Role.INVESTOR
+            ).values_list('id', flat=True)
+        )
+
+        def investments():
+            statuses = [choice for choice, _ in Investment.Status.choices]
+
+            def build():
+                created = _random_moment(rng, now)
+                status = rng.choice(statuses)
+                investment = Investment(
+                    user_id=rng.choice(investor_ids), project_id=rng.choice(project_ids),
+                    amount=Decimal(rng.randint(1, 50) * 1_000_000), status=status,
+                    annual_return_rate_snapshot=Decimal('12.00'), duration_months_snapshot=12,
+                    activated_at=(
+                        created + timedelta(days=rng.randint(0, 10))
+                        if status in (Investment.Status.ACTIVE, Investment.Status.COMPLETED)
+                        else None
+                    ),
+                    created_at=created, updated_at=created,
+                )
+                investment.expected_return = investment.calculate_expected_return()
+                return investment
+
+            _bulk_insert(Investment, (build() for _ in range(counts['investments'])))
+
+        stage('investments', investments)
+
+        def reservations():
+            statuses = [choice for choice, _ in Reservation.Status.choices]
+
+            def build(i):
+                created = _random_moment(rng, now)
+                return Reservation(
+                    email=f'{EMAIL_PREFIX}reservation{i}@example.com',
+                    project_id=rng.choice(project_ids),
+                    amount=Decimal(rng.randint(1, 20) * 1_000_000),
+                    status=rng.choice(statuses),
+                    access_token=f'{EMAIL_PREFIX}{i}',
+                    expires_at=created + timedelta(days=7),
+                    created_at=created, updated_at=created,
+                )
+
+            _bulk_insert(Reservation, (build(i) for i in range(counts['reservations'])))
+
+        stage('reservations', reservations)
+
+    stage('platform_snapshot', StatisticsService.rebuild_platform_snapshot)
+    stage('rollups', lambda: (
+        StatisticsRollupService.mark_history(), StatisticsRollupService.process_all()
+    ))
+    stage('leaderboard', LeaderboardService.rebuild)
+    stage('workload_counters', LeadService.reconcile_workload_counters)
+
+    return timings
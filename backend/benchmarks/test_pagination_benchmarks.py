@@ -0,0 +1,78 @@
+"""
+Benchmarks de paginación de listados grandes: página TARGET_PAGE con
+?page= (COUNT + OFFSET) frente a la misma página con ?pagination=cursor.
+Si el dataset tiene menos páginas se mide la última disponible.
+"""
+import pytest
+from django.conf import settings
+from rest_framework.test import APIClient
+
+from apps.leads.models import Lead
+from apps.users.models import User
+from core.pagination import KeysetPagination
+
+TARGET_PAGE = 1000
+
+CASES = {
+    'leads': ('/api/leads/', lambda: Lead.objects.all()),
+    'users': ('/api/auth/users/', lambda: User.objects.all()),
+    'investors': ('/api/auth/investors/', lambda: User.objects.filter(role=User.Role.INVESTOR)),
+}
+
+
+def _page_and_cursor(queryset):
+    """Página a medir y cursor que apunta a su inicio."""
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    pages = max(1, (queryset.count() + page_size - 1) // page_size)
+    page = min(TARGET_PAGE, pages)
+    if page == 1:
+        return page, None
+    previous = queryset.order_by('-created_at', '-id').values_list('created_at', 'id')[
+        (page - 1) * page_size - 1
+    ]
+    return page, KeysetPagination.encode_cursor(*previous)
+
+
+@pytest.fixture
+def admin_api(bench_data):
+    admin = User.objects.create_user(
+        email='bench-pagination-admin@example.com', password='bench123', role=User.Role.ADMIN
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', CASES)
+def test_page_number(name, admin_api, measure):
+    url, queryset = CASES[name]
+    page, _ = _page_and_cursor(queryset())
+
+    def request():
+        response = admin_api.get(url, {'page': page})
+        assert response.status_code == 200
+        return response
+
+    result = measure(f'{name}_page_{page}', 'pagination_offset', request)
+
+    assert result['runs'] > 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', CASES)
+def test_cursor(name, admin_api, measure):
+    url, queryset = CASES[name]
+    page, cursor = _page_and_cursor(queryset())
+    params = {'pagination': 'cursor'}
+    if cursor:
+        params['cursor'] = cursor
+
+    def request():
+        response = admin_api.get(url, params)
+        assert response.status_code == 200
+        return response
+
+    result = measure(f'{name}_page_{page}', 'pagination_cursor', request)
+
+    assert result['runs'] > 0
@@ -0,0 +1,76 @@
+"""
+Benchmarks de StatisticsService y de los endpoints de estadísticas.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.statistics.leaderboard import LeaderboardService
+from apps.statistics.services import StatisticsService, StatisticsRollupService
+from apps.users.models import User
+
+
+def _today():
+    return timezone.localdate()
+
+
+SERVICE_CASES = {
+    'platform': lambda: StatisticsService.get_platform_statistics(),
+    'executives': lambda: StatisticsService.get_executive_statistics(),
+    'projects_page': lambda: StatisticsService.build_project_statistics(
+        StatisticsService.get_project_statistics_queryset()[:50]
+    ),
+    'lead_sources': lambda: StatisticsService.get_lead_source_statistics(),
+    'timeseries_year_by_week': lambda: StatisticsService.get_timeseries(
+        _today() - timedelta(days=364), _today(), 'week'
+    ),
+    'lead_cohorts_26_weeks': lambda: StatisticsService.get_lead_cohorts(
+        StatisticsRollupService.week_start(_today() - timedelta(weeks=25)),
+        StatisticsRollupService.week_start(_today())
+    ),
+    'leaderboard_top_10': lambda: LeaderboardService.top('conversions', 'month', 10),
+    'rollup_day': lambda: StatisticsRollupService.rollup_day(_today() - timedelta(days=1)),
+    'rollup_cohort_week': lambda: StatisticsRollupService.rollup_cohort_week(
+        StatisticsRollupService.week_start(_today() - timedelta(weeks=4))
+    ),
+}
+
+ENDPOINT_CASES = {
+    'platform': ('/api/statistics/platform/', {}),
+    'executives': ('/api/statistics/executives/', {}),
+    'projects': ('/api/statistics/projects/', {}),
+    'lead_sources': ('/api/statistics/lead-sources/', {}),
+    'timeseries': ('/api/statistics/timeseries/', {'granularity': 'week'}),
+    'lead_cohorts': ('/api/statistics/lead-cohorts/', {}),
+    'leaderboard': ('/api/statistics/leaderboard/', {'window': 'week'}),
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', SERVICE_CASES)
+def test_service(name, measure):
+    result = measure(name, 'service', SERVICE_CASES[name])
+
+    assert result['runs'] > 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ENDPOINT_CASES)
+def test_endpoint(name, measure):
+    admin = User.objects.create_user(
+        email='bench-admin@example.com', password='bench123', role=User.Role.ADMIN
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    url, params = ENDPOINT_CASES[name]
+
+    def request():
+        response = client.get(url, params)
+        assert response.status_code == 200
+        return response
+
+    result = measure(name, 'endpoint', request)
+
+    assert result['runs'] > 0
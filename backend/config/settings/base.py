@@ -21,6 +21,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -83,6 +84,37 @@ DATABASES = {
     'default': dj_database_url.parse(DATABASE_URL)
 }
 
+# Cache
+# Redis si REDIS_URL está definido (docker-compose); memoria local en otro caso.
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'somosrentable',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'somosrentable',
+        }
+    }
+
+# TTL en segundos del cache de estadísticas por grupo (0 desactiva el cache)
+STATISTICS_CACHE_TTLS = {
+    'platform': int(os.environ.get('STATISTICS_CACHE_TTL_PLATFORM', 60)),
+    'executives': int(os.environ.get('STATISTICS_CACHE_TTL_EXECUTIVES', 300)),
+    'projects': int(os.environ.get('STATISTICS_CACHE_TTL_PROJECTS', 300)),
+    'lead_sources': int(os.environ.get('STATISTICS_CACHE_TTL_LEAD_SOURCES', 300)),
+    'timeseries': int(os.environ.get('STATISTICS_CACHE_TTL_TIMESERIES', 900)),
+    'cohorts': int(os.environ.get('STATISTICS_CACHE_TTL_COHORTS', 900)),
+}
+# Tiempo máximo que un proceso mantiene el lock de recálculo de una entrada
+STATISTICS_CACHE_LOCK_TIMEOUT = int(os.environ.get('STATISTICS_CACHE_LOCK_TIMEOUT', 30))
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -166,3 +198,16 @@ DEFAULT_FROM_EMAIL = 'SomosRentable <noreply@somosrentable.com>'
 
 # Webhook API Key
 WEBHOOK_API_KEY = os.environ.get('WEBHOOK_API_KEY', 'webhook-secret-key')
+
+# Webhook asíncrono: responder 202 con recibo y procesar con process_lead_intake
+WEBHOOK_ASYNC_INTAKE = os.environ.get('WEBHOOK_ASYNC_INTAKE', 'False').lower() == 'true'
+
+# Ventana (horas) en que se repite la respuesta guardada de un Idempotency-Key
+WEBHOOK_IDEMPOTENCY_TTL_HOURS = int(os.environ.get('WEBHOOK_IDEMPOTENCY_TTL_HOURS', 24))
+
+# Máximo de leads por request del webhook en lote
+WEBHOOK_BATCH_MAX_SIZE = int(os.environ.get('WEBHOOK_BATCH_MAX_SIZE', 500))
+
+# Estrategia de asignación de leads (apps.leads.assignment.STRATEGIES):
+# least_loaded, weighted o routed
+LEAD_ASSIGNMENT_STRATEGY = os.environ.get('LEAD_ASSIGNMENT_STRATEGY', 'least_loaded')
@@ -7,3 +7,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 application = get_wsgi_application()
+
+# Pre-filtro de emails del webhook listo antes de la primera entrega
+from apps.leads.dedupe import LeadEmailFilter  # noqa: E402
+
+LeadEmailFilter.warm_up()
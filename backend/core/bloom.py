@@ -0,0 +1,54 @@
+"""
+Filtro de Bloom en memoria.
+
+Responde "seguro que no está" o "quizás está" con una tasa de falsos
+positivos acotada y sin falsos negativos para las claves agregadas.
+Las posiciones se derivan de un único blake2b por clave (doble hashing).
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray.
+
+    Args:
+        capacity: Número de claves esperado
+        error_rate: Tasa de falsos positivos con `capacity` claves
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def is_saturated(self):
+        """True si ya se agregaron más claves que la capacidad prevista."""
+        return self.count > self.capacity
@@ -0,0 +1,124 @@
+"""
+Paginación por cursor (keyset) opcional para listados grandes.
+
+Por defecto los listados siguen con PageNumberPagination (?page=), que
+cuenta el total y salta filas con OFFSET: las páginas lejanas son cada vez
+más lentas. Con ?pagination=cursor la página se pide por posición
+(created_at, id) del último elemento entregado:
+
+    WHERE created_at <= t AND (created_at < t OR id < i)
+    ORDER BY created_at DESC, id DESC LIMIT n + 1
+
+que un índice compuesto (…, created_at, id) resuelve leyendo solo n + 1
+filas, sin COUNT(*). La respuesta trae `next` con el cursor opaco de la
+página siguiente (null en la última) y `results`.
+
+En modo cursor el orden es siempre (created_at, id); la vista define el
+sentido con `cursor_ordering`.
+"""
+import base64
+import uuid
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DESCENDING = ('-created_at', '-id')
+ASCENDING = ('created_at', 'id')
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    PageNumberPagination con modo cursor opcional (?pagination=cursor).
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def is_cursor_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.is_cursor_mode(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = getattr(view, 'cursor_ordering', DESCENDING)
+        descending = ordering[0].startswith('-')
+
+        queryset = queryset.order_by(*ordering)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        if position is not None:
+            created_at, pk = position
+            if descending:
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+                )
+
+        rows = list(queryset[:page_size + 1])
+        page = rows[:page_size]
+        self.next_position = (page[-1].created_at, page[-1].pk) if len(rows) > page_size else None
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ('next', self.get_next_cursor_link()),
+            ('results', data),
+        ]))
+
+    def get_next_cursor_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(*self.next_position)
+        )
+
+    @staticmethod
+    def encode_cursor(created_at, pk):
+        raw = f'{created_at.isoformat()}|{pk}'.encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, value):
+        """
+        Posición (created_at, id) de un cursor; None si no viene.
+
+        Raises:
+            NotFound: Si el cursor no es válido
+        """
+        if not value:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(value.encode('ascii')).decode('utf-8')
+            created_raw, pk_raw = raw.split('|')
+            created_at = parse_datetime(created_raw)
+            pk = uuid.UUID(pk_raw)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['next']['description'] = (
+            'Con ?pagination=cursor: URL de la página siguiente (sin count ni previous).'
+        )
+        return response
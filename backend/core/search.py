@@ -0,0 +1,125 @@
+"""
+Búsqueda aproximada (?q=) sobre columnas con índice trigram.
+
+Cada columna buscable tiene un índice GIN gin_trgm_ops sobre UPPER(columna),
+la misma expresión con la que Django compara icontains
+(UPPER(col) LIKE UPPER('%texto%')), y que también sirve al operador de
+similitud por palabra (%>). Cada condición usa el índice de su columna y
+Postgres las combina con BitmapOr/BitmapAnd, por lo que el costo depende
+de las coincidencias y no del tamaño de la tabla.
+
+Una fila coincide si cada término de la consulta aparece en alguna de las
+columnas. Si la primera página de esas coincidencias queda vacía, se
+buscan columnas parecidas a la consulta completa (errores de tipeo); la
+similitud es más cara y más amplia, por eso queda como respaldo y no se
+consulta mientras haya coincidencias. Las vistas lo obtienen con
+SearchMixin.
+
+El ranking suma, por término, la mejor similitud por palabra entre las
+columnas. Se calcula sobre todas las coincidencias (el orden por
+relevancia lo necesita) y la paginación acota las filas leídas.
+"""
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+
+# Consultas más largas se truncan: el costo del filtro crece con los términos
+MAX_QUERY_LENGTH = 100
+MAX_TERMS = 5
+
+
+def _terms(query):
+    return query[:MAX_QUERY_LENGTH].split()[:MAX_TERMS]
+
+
+def _best_similarity(term, fields):
+    similarities = [TrigramWordSimilarity(term, field) for field in fields]
+    if len(similarities) == 1:
+        return similarities[0]
+    return Greatest(*similarities)
+
+
+def _rank(terms, fields):
+    rank = _best_similarity(terms[0], fields)
+    for term in terms[1:]:
+        rank = rank + _best_similarity(term, fields)
+    return rank
+
+
+def search(queryset, query, fields):
+    """
+    Filtra el queryset a las filas donde cada término de `query` aparece
+    en alguna de `fields` y las anota con su relevancia.
+
+    Args:
+        queryset: QuerySet a filtrar
+        query: Texto de búsqueda (?q=)
+        fields: Columnas con índice gin_trgm_ops sobre UPPER(columna)
+
+    Returns:
+        QuerySet: Filtrado y anotado con `search_rank` (sin ordenar);
+            el mismo queryset si la consulta está vacía
+    """
+    terms = _terms(query or '')
+    if not terms:
+        return queryset
+
+    every_term = Q()
+    for term in terms:
+        every_term &= Q(*[(f'{field}__icontains', term) for field in fields], _connector=Q.OR)
+
+    return queryset.filter(every_term).annotate(search_rank=_rank(terms, fields))
+
+
+def fuzzy_search(queryset, query, fields):
+    """
+    Búsqueda de respaldo: filas con alguna de `fields` parecida a la
+    consulta completa, anotadas con `search_rank` como search().
+    """
+    terms = _terms(query or '')
+    if not terms:
+        return queryset
+
+    full_query = ' '.join(terms).upper()
+    return queryset.filter(Q(
+        *[TrigramWordSimilar(Upper(field), full_query) for field in fields],
+        _connector=Q.OR
+    )).annotate(search_rank=_rank(terms, fields))
+
+
+class SearchMixin:
+    """
+    Búsqueda ?q= para vistas de listado. get_queryset() aplica
+    apply_search(); si la primera página de coincidencias queda vacía se
+    pagina en su lugar la búsqueda aproximada, con los mismos filtros y
+    orden.
+    """
+
+    search_fallback = None
+
+    def apply_search(self, queryset, query, fields, ordering):
+        """
+        Returns:
+            QuerySet: Coincidencias de `query` ordenadas por `ordering`
+        """
+        self.search_fallback = lambda: fuzzy_search(queryset, query, fields).order_by(*ordering)
+        return search(queryset, query, fields).order_by(*ordering)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # PageNumberPagination rechaza páginas vacías salvo la primera
+        cursor_param = getattr(self.paginator, 'cursor_query_param', None)
+        if (
+            page is not None and not page and self.search_fallback is not None
+            and cursor_param not in self.request.query_params
+        ):
+            page = super().paginate_queryset(self.search_fallback())
+        return page
+
+    def search_results(self):
+        """get_queryset() con el respaldo aproximado, para vistas sin paginar."""
+        queryset = self.get_queryset()
+        if self.search_fallback is not None and not queryset.exists():
+            queryset = self.search_fallback()
+        return queryset
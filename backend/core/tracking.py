@@ -0,0 +1,110 @@
+"""
+Seguimiento de cambios de campos en modelos.
+
+Permite que los signals comparen el estado con que una instancia se cargó
+desde la base de datos contra el estado que se está guardando, sin tener
+que volver a consultar la fila antes de cada save().
+"""
+from django.db.models.signals import post_init, post_save, pre_save
+
+_tracked_fields = {}
+
+
+def track_fields(model, fields):
+    """
+    Registra campos (attname) a seguir para un modelo.
+    Puede llamarse varias veces para el mismo modelo; los campos se acumulan.
+
+    Args:
+        model: Clase del modelo
+        fields: Iterable de attnames (ej: 'status', 'assigned_to_id')
+    """
+    if model not in _tracked_fields:
+        _tracked_fields[model] = set()
+        post_init.connect(
+            _capture_initial, sender=model, weak=False,
+            dispatch_uid=f'tracking_post_init_{model._meta.label}'
+        )
+        pre_save.connect(
+            _rotate_before_save, sender=model, weak=False,
+            dispatch_uid=f'tracking_pre_save_{model._meta.label}'
+        )
+        post_save.connect(
+            _capture_saved, sender=model, weak=False,
+            dispatch_uid=f'tracking_post_save_{model._meta.label}'
+        )
+    _tracked_fields[model].update(fields)
+
+
+def previous_values(instance):
+    """
+    Valores de los campos seguidos antes del save() en curso.
+    Usar desde post_save.
+
+    Returns:
+        dict o None si la instancia se está creando
+    """
+    return instance.__dict__.get('_tracking_previous')
+
+
+def loaded_values(instance):
+    """
+    Valores de los campos seguidos tal como están en la base de datos
+    (al cargar la instancia o tras su último save()).
+
+    Returns:
+        dict o None si la instancia aún no existe en la base de datos
+    """
+    if instance._state.adding:
+        return None
+    return _complete_initial(instance)
+
+
+def mark_persisted(instance):
+    """
+    Marca una instancia insertada fuera de save() (bulk_create, upsert)
+    como persistida, tomando sus valores actuales como estado cargado.
+    """
+    instance._state.adding = False
+    instance.__dict__['_tracking_initial'] = _current_values(instance)
+
+
+def _current_values(instance):
+    fields = _tracked_fields.get(type(instance), ())
+    return {
+        name: instance.__dict__[name]
+        for name in fields
+        if name in instance.__dict__
+    }
+
+
+def _capture_initial(sender, instance, **kwargs):
+    instance.__dict__['_tracking_initial'] = _current_values(instance)
+
+
+def _complete_initial(instance):
+    """Completa desde la BD los campos diferidos (.only/.defer) no capturados."""
+    initial = instance.__dict__.setdefault('_tracking_initial', {})
+    missing = _tracked_fields.get(type(instance), set()) - initial.keys()
+    if missing and instance.pk is not None:
+        row = type(instance)._base_manager.filter(pk=instance.pk).values(*missing).first()
+        if row:
+            initial.update(row)
+    return initial
+
+
+def _rotate_before_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance._state.adding:
+        instance.__dict__['_tracking_previous'] = None
+    else:
+        instance.__dict__['_tracking_previous'] = dict(_complete_initial(instance))
+    instance.__dict__['_tracking_initial'] = _current_values(instance)
+
+
+def _capture_saved(sender, instance, raw=False, **kwargs):
+    # Los campos auto_now/auto_now_add se asignan después de pre_save
+    if raw:
+        return
+    instance.__dict__['_tracking_initial'] = _current_values(instance)
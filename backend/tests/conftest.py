@@ -3,6 +3,7 @@ Pytest fixtures for SomosRentable tests.
 """
 import pytest
 from decimal import Decimal
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APIClient
@@ -15,6 +16,14 @@ from apps.investments.models import Investment
 from apps.kyc.models import KYCSubmission
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an API client for testing."""
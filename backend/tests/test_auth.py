@@ -136,3 +136,19 @@ class TestUserProfile:
         investor_user.refresh_from_db()
         assert investor_user.first_name == 'Updated'
         assert investor_user.phone == '+56 9 9999 9999'
+
+
+@pytest.mark.django_db
+class TestUserSearch:
+    """Tests for ?q= search on user listings."""
+
+    def test_search_users_by_name_and_email(self, admin_client, investor_user, executive_user):
+        """Test users are found by full name terms or partial email."""
+        investor_user.first_name, investor_user.last_name = 'Camila', 'Rojas'
+        investor_user.save()
+
+        response = admin_client.get('/api/auth/users/?q=camila rojas')
+        assert [item['id'] for item in response.data['results']] == [str(investor_user.id)]
+
+        response = admin_client.get(f'/api/auth/investors/?q={investor_user.email[:5]}')
+        assert [item['id'] for item in response.data['results']] == [str(investor_user.id)]
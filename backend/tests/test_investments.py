@@ -86,6 +86,39 @@ class TestInvestmentList:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.django_db
+class TestInvestmentExport:
+    """Tests for the streaming investment export."""
+
+    def test_export_filters_by_status(self, admin_client, investment, project):
+        """Test export applies the status and project filters."""
+        response = admin_client.get('/api/investments/export/', {
+            'status': Investment.Status.PENDING_PAYMENT, 'project': str(project.id)
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 2
+        assert str(investment.id) in lines[1]
+
+        response = admin_client.get('/api/investments/export/', {
+            'status': Investment.Status.ACTIVE
+        })
+        assert len(b''.join(response.streaming_content).decode().splitlines()) == 1
+
+    def test_export_invalid_filter(self, admin_client):
+        """Test malformed ids are rejected instead of failing mid-stream."""
+        response = admin_client.get('/api/investments/export/', {'project': 'nope'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_requires_admin(self, verified_client):
+        """Test investors cannot export investments."""
+        response = verified_client.get('/api/investments/export/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.django_db
 class TestInvestmentProjection:
     """Tests for investment return projection."""
@@ -188,6 +221,27 @@ class TestPaymentReview:
 
         assert response.status_code == status.HTTP_200_OK
 
+    def test_pending_payments_cursor_oldest_first(self, admin_client, investment):
+        """Test cursor pagination of pending payments keeps FIFO order."""
+        proofs = [
+            PaymentProof.objects.create(
+                investment=investment,
+                amount=Decimal('5000000'),
+                bank_name='Test Bank',
+                transaction_reference=f'TX{i}',
+                transaction_date='2024-01-15',
+                status=PaymentProof.Status.PENDING,
+            )
+            for i in range(25)
+        ]
+
+        first = admin_client.get('/api/payments/pending/?pagination=cursor')
+        second = admin_client.get(first.data['next'])
+
+        ids = [item['id'] for item in first.data['results'] + second.data['results']]
+        assert ids == [str(proof.id) for proof in proofs]
+        assert second.data['next'] is None
+
     def test_approve_payment(self, admin_client, investment):
         """Test admin can approve payment."""
         proof = PaymentProof.objects.create(
@@ -1,9 +1,9 @@
 """
 Tests for leads and webhook endpoints.
 """
+import json
 import pytest
 from rest_framework import status
-from django.conf import settings
 
 from apps.leads.models import Lead, LeadInteraction
 from apps.users.models import User
@@ -45,6 +45,45 @@ class TestLeadList:
         assert len(response.data) >= 1
 
 
+@pytest.mark.django_db
+class TestLeadExport:
+    """Tests for the streaming lead export."""
+
+    def test_export_csv_applies_list_filters(self, admin_client, lead):
+        """Test CSV export streams the header and only the filtered rows."""
+        Lead.objects.create(email='other@example.com', status=Lead.Status.CONTACTED)
+
+        response = admin_client.get('/api/leads/export/', {'status': Lead.Status.NEW})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith('id,email,name')
+        assert len(lines) == 2
+        assert lead.email in lines[1]
+
+    def test_export_ndjson(self, admin_client, lead, executive_user):
+        """Test NDJSON export emits one JSON object per lead."""
+        response = admin_client.get('/api/leads/export/', {'output': 'ndjson'})
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        assert rows[0]['email'] == lead.email
+        assert rows[0]['assigned_to'] == executive_user.email
+
+    def test_export_invalid_output(self, admin_client):
+        """Test unknown output formats are rejected."""
+        response = admin_client.get('/api/leads/export/', {'output': 'xlsx'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_forbidden_for_investor(self, auth_client):
+        """Test investors cannot export leads."""
+        response = auth_client.get('/api/leads/export/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.django_db
 class TestLeadDetail:
     """Tests for lead detail."""
@@ -127,6 +166,83 @@ class TestLeadInteractions:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) >= 1
 
+    def test_detail_carries_recent_interactions_and_counts(self, admin_client, lead):
+        """Test lead detail is bounded to the latest interactions plus counts by type."""
+        from apps.leads.serializers import LeadDetailSerializer
+
+        LeadInteraction.objects.bulk_create([
+            LeadInteraction(
+                lead=lead,
+                interaction_type=(
+                    LeadInteraction.InteractionType.CALL if i % 3 else LeadInteraction.InteractionType.NOTE
+                ),
+                description=f'Interaction {i}',
+            )
+            for i in range(30)
+        ])
+
+        response = admin_client.get(f'/api/leads/{lead.id}/')
+
+        assert len(response.data['interactions']) == LeadDetailSerializer.RECENT_INTERACTIONS
+        assert response.data['interaction_counts']['total'] == 30
+        assert response.data['interaction_counts']['by_type']['note'] == 10
+        assert response.data['interaction_counts']['by_type']['meeting'] == 0
+
+    def test_last_interaction_at_is_maintained(self, executive_client, lead):
+        """Test last_interaction_at follows interaction creation and deletion."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        first = LeadInteraction.objects.create(
+            lead=lead, interaction_type=LeadInteraction.InteractionType.CALL, description='First'
+        )
+        second = LeadInteraction.objects.create(
+            lead=lead, interaction_type=LeadInteraction.InteractionType.EMAIL, description='Second'
+        )
+        lead.refresh_from_db()
+        assert lead.last_interaction_at == second.created_at
+
+        second.delete()
+        lead.refresh_from_db()
+        assert lead.last_interaction_at == first.created_at
+
+        Lead.objects.filter(pk=lead.pk).update(
+            last_interaction_at=timezone.now() - timedelta(days=10),
+            created_at=timezone.now() - timedelta(days=20),
+        )
+        stale = executive_client.get('/api/leads/?stale_days=7')
+        fresh = executive_client.get('/api/leads/?stale_days=14')
+        assert [item['id'] for item in stale.data['results']] == [str(lead.id)]
+        assert fresh.data['results'] == []
+
+    def test_full_save_keeps_last_interaction_at(self, admin_client, lead, executive_user):
+        """Test saving a lead loaded before an interaction keeps the new timestamp."""
+        loaded = Lead.objects.get(pk=lead.pk)
+        interaction = LeadInteraction.objects.create(
+            lead=lead, interaction_type=LeadInteraction.InteractionType.CALL, description='Call'
+        )
+
+        loaded.notes = 'Editado'
+        loaded.save()
+        admin_client.patch(f'/api/leads/{lead.id}/', {'notes': 'Otra vez'}, format='json')
+        admin_client.post(
+            f'/api/leads/{lead.id}/assign/', {'executive_id': str(executive_user.id)}, format='json'
+        )
+
+        lead.refresh_from_db()
+        assert lead.notes == 'Otra vez'
+        assert lead.last_interaction_at == interaction.created_at
+
+    def test_full_save_of_deleted_lead_inserts_it_again(self, lead):
+        """Test a full save keeps Django's insert fallback when the row is gone."""
+        from django.utils import timezone
+
+        lead.last_interaction_at = timezone.now()
+        Lead.objects.filter(pk=lead.pk).delete()
+
+        lead.save()
+        assert Lead.objects.get(pk=lead.pk).last_interaction_at == lead.last_interaction_at
+
 
 @pytest.mark.django_db
 class TestWebhook:
@@ -192,6 +308,386 @@ class TestWebhook:
         assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
 
 
+@pytest.mark.django_db
+class TestWebhookBatch:
+    """Tests for the batch webhook endpoint."""
+
+    url = '/api/leads/webhook/batch/'
+    headers = {'HTTP_X_API_KEY': 'webhook-secret-key'}
+
+    def test_batch_reports_each_item(self, api_client, lead, executive_user):
+        """Test created, duplicate and invalid items are reported in order."""
+        from apps.statistics.models import DomainEvent
+        from apps.statistics.services import StatisticsService
+
+        payload = {'leads': [
+            {'email': 'batch1@test.com', 'name': 'Uno', 'source': 'partner'},
+            {'email': lead.email},
+            {'email': 'not-an-email'},
+            {'email': 'batch1@test.com'},
+            'garbage',
+        ]}
+        response = api_client.post(self.url, payload, format='json', **self.headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['created'], response.data['duplicate'], response.data['invalid']) == (1, 2, 2)
+        statuses = [item['status'] for item in response.data['results']]
+        assert statuses == ['created', 'duplicate', 'invalid', 'duplicate', 'invalid']
+        assert response.data['results'][1]['lead_id'] == str(lead.id)
+        assert response.data['results'][3]['lead_id'] == response.data['results'][0]['lead_id']
+        assert 'email' in response.data['results'][2]['errors']
+
+        created = Lead.objects.get(email='batch1@test.com')
+        assert created.source == Lead.Source.WEBHOOK
+        assert created.source_detail == 'partner'
+        assert created.assigned_to == executive_user
+        assert User.objects.get(pk=executive_user.pk).active_leads_count == 2
+        assert StatisticsService.get_platform_snapshot().total_leads == 2
+        assert DomainEvent.objects.filter(aggregate_id=created.id, event_type='lead.created').exists()
+
+    def test_batch_balances_workload_with_constant_queries(
+        self, api_client, executive_user, django_assert_max_num_queries
+    ):
+        """Test new leads go to the least loaded executives in a few queries."""
+        busy = User.objects.create_user(
+            email='busy-exec@test.com', password='pass123', role=User.Role.EXECUTIVE
+        )
+        for i in range(4):
+            Lead.objects.create(email=f'existing{i}@test.com', assigned_to=busy)
+
+        payload = {'leads': [{'email': f'partner{i}@test.com'} for i in range(30)]}
+        with django_assert_max_num_queries(12):
+            response = api_client.post(self.url, payload, format='json', **self.headers)
+
+        assert response.data['created'] == 30
+        counts = {
+            user.email: user.active_leads_count
+            for user in User.objects.filter(role=User.Role.EXECUTIVE)
+        }
+        assert counts == {executive_user.email: 17, busy.email: 17}
+
+    def test_batch_rejects_oversized_and_unauthorized(self, api_client, settings):
+        """Test batch size limit and API key are enforced."""
+        settings.WEBHOOK_BATCH_MAX_SIZE = 2
+        payload = {'leads': [{'email': f'x{i}@test.com'} for i in range(3)]}
+
+        response = api_client.post(self.url, payload, format='json', **self.headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.post(self.url, payload, format='json')
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+        assert not Lead.objects.exists()
+
+
+@pytest.mark.django_db
+class TestLeadUpsert:
+    """Tests for the normalized-email lead upsert."""
+
+    def test_webhook_dedupes_on_normalized_email(self, api_client, lead):
+        """Test case and surrounding spaces do not create a second lead."""
+        response = api_client.post(
+            '/api/leads/webhook/', {'email': '  LEAD@Test.com'}, HTTP_X_API_KEY='webhook-secret-key'
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data['lead_id'] == str(lead.id)
+        assert Lead.objects.count() == 1
+
+    def test_unique_index_rejects_duplicates(self, lead):
+        """Test the database refuses a second lead with the same normalized email."""
+        from django.db import IntegrityError, transaction
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Lead.objects.create(email='Lead@Test.com ')
+
+    def test_conflicting_insert_returns_existing_lead(self, lead, executive_user):
+        """Test a lost insert race falls back to the existing row without side effects."""
+        from apps.leads.services import LeadService
+        from apps.statistics.models import DomainEvent
+        from apps.statistics.services import StatisticsService
+
+        total_before = StatisticsService.get_platform_snapshot().total_leads
+
+        assert LeadService.insert_leads([Lead(email='lead@TEST.com')]) == []
+        existing, created = LeadService.upsert_lead(Lead(email='lead@test.com', name='Otro'))
+
+        assert (existing, created) == (lead, False)
+        assert existing.name == 'Test Lead'
+        assert StatisticsService.get_platform_snapshot().total_leads == total_before
+        assert User.objects.get(pk=executive_user.pk).active_leads_count == 1
+        assert not DomainEvent.objects.exists()
+
+    def test_upsert_creates_assigns_and_counts(self, executive_user):
+        """Test a new lead from the upsert path is assigned and counted."""
+        from apps.leads.services import LeadService
+        from apps.statistics.services import StatisticsService
+
+        lead, created = LeadService.get_or_create_lead_for_email('Fresh@Test.com', name='Fresh')
+
+        assert created
+        assert Lead.objects.get(pk=lead.pk).email_normalized == 'fresh@test.com'
+        assert lead.assigned_to == executive_user
+        assert User.objects.get(pk=executive_user.pk).active_leads_count == 1
+        assert StatisticsService.get_platform_snapshot().total_leads == 1
+
+
+@pytest.mark.django_db
+class TestAsyncIntake:
+    """Tests for the asynchronous webhook intake queue."""
+
+    headers = {'HTTP_X_API_KEY': 'webhook-secret-key'}
+
+    def test_webhook_enqueues_and_worker_creates_leads(self, api_client, settings, lead):
+        """Test the webhook answers 202 and the worker turns deliveries into leads."""
+        from django.core.management import call_command
+        from apps.leads.models import LeadIntake
+
+        settings.WEBHOOK_ASYNC_INTAKE = True
+        accepted = api_client.post('/api/leads/webhook/', {'email': 'queued@test.com'}, **self.headers)
+        repeated = api_client.post('/api/leads/webhook/', {'email': lead.email}, **self.headers)
+
+        assert accepted.status_code == status.HTTP_202_ACCEPTED
+        assert not Lead.objects.filter(email='queued@test.com').exists()
+        assert LeadIntake.objects.filter(status=LeadIntake.Status.PENDING).count() == 2
+
+        call_command('process_lead_intake', once=True)
+
+        response = api_client.get(accepted.data['status_url'], **self.headers)
+        created = Lead.objects.get(email='queued@test.com')
+        assert response.data['status'] == LeadIntake.Status.CREATED
+        assert response.data['lead_id'] == str(created.id)
+        assert LeadIntake.objects.get(pk=repeated.data['receipt_id']).lead == lead
+
+    def test_failed_delivery_is_retried_then_marked_failed(self, monkeypatch):
+        """Test a delivery that keeps failing is isolated and eventually marked failed."""
+        from apps.leads.models import LeadIntake
+        from apps.leads.services import LeadIntakeService, LeadService
+
+        good = LeadIntakeService.enqueue({'email': 'good@test.com'})
+        bad = LeadIntakeService.enqueue({'email': 'bad@test.com'})
+
+        def fail_batch(items):
+            raise RuntimeError('lote fallido')
+
+        original = LeadService.create_lead_from_webhook
+
+        def fail_bad(data):
+            if data['email'] == 'bad@test.com':
+                raise RuntimeError('entrega inválida')
+            return original(data)
+
+        monkeypatch.setattr(LeadService, 'create_leads_from_webhook_batch', fail_batch)
+        monkeypatch.setattr(LeadService, 'create_lead_from_webhook', fail_bad)
+        LeadIntakeService.drain(max_batches=LeadIntakeService.MAX_ATTEMPTS + 1)
+
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        assert good.status == LeadIntake.Status.CREATED
+        assert (bad.status, bad.attempts, bad.error) == (
+            LeadIntake.Status.FAILED, LeadIntakeService.MAX_ATTEMPTS, 'entrega inválida'
+        )
+
+    def test_metrics_and_unknown_receipt(self, admin_client):
+        """Test queue metrics for admins and 404 for unknown receipts."""
+        import uuid
+        from apps.leads.services import LeadIntakeService
+
+        LeadIntakeService.enqueue({'email': 'waiting@test.com'})
+
+        metrics = admin_client.get('/api/leads/webhook/intake/metrics/')
+        assert metrics.status_code == status.HTTP_200_OK
+        assert metrics.data['queue_depth'] == 1
+        assert metrics.data['lag_seconds'] >= 0
+
+        missing = admin_client.get(f'/api/leads/webhook/intake/{uuid.uuid4()}/', **self.headers)
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestWebhookIdempotency:
+    """Tests for Idempotency-Key replay and the email pre-filter."""
+
+    headers = {'HTTP_X_API_KEY': 'webhook-secret-key'}
+
+    def test_retry_with_same_key_replays_stored_response(self, api_client):
+        """Test a retried delivery gets the original 201 without touching leads."""
+        headers = {**self.headers, 'HTTP_IDEMPOTENCY_KEY': 'delivery-1'}
+        data = {'email': 'retry@test.com', 'name': 'Retry'}
+
+        first = api_client.post('/api/leads/webhook/', data, **headers)
+        second = api_client.post('/api/leads/webhook/', data, **headers)
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert second.json() == first.data
+        assert second['Idempotent-Replayed'] == 'true'
+        assert Lead.objects.filter(email='retry@test.com').count() == 1
+
+    def test_key_reused_with_other_body_or_after_expiry(self, api_client):
+        """Test key reuse with a different body is rejected and expired keys are reprocessed."""
+        from django.utils import timezone
+        from apps.leads.models import WebhookIdempotencyKey
+
+        headers = {**self.headers, 'HTTP_IDEMPOTENCY_KEY': 'delivery-2'}
+        api_client.post('/api/leads/webhook/', {'email': 'first@test.com'}, **headers)
+
+        conflict = api_client.post('/api/leads/webhook/', {'email': 'other@test.com'}, **headers)
+        assert conflict.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert not Lead.objects.filter(email='other@test.com').exists()
+
+        WebhookIdempotencyKey.objects.update(expires_at=timezone.now())
+        retried = api_client.post('/api/leads/webhook/', {'email': 'first@test.com'}, **headers)
+        assert retried.status_code == status.HTTP_409_CONFLICT
+        assert WebhookIdempotencyKey.objects.get().response_status == status.HTTP_409_CONFLICT
+
+    def test_key_is_reserved_while_first_request_is_in_flight(self, api_client):
+        """Test a concurrent retry gets 409 while pending and a released key can be reused."""
+        from apps.leads.models import WebhookIdempotencyKey
+        from apps.leads.services import WebhookIdempotencyService
+
+        headers = {**self.headers, 'HTTP_IDEMPOTENCY_KEY': 'delivery-3'}
+        data = {'email': 'inflight@test.com'}
+        record, reserved = WebhookIdempotencyService.reserve(
+            'webhook', 'delivery-3', WebhookIdempotencyService.fingerprint(data)
+        )
+        assert reserved
+
+        concurrent = api_client.post('/api/leads/webhook/', data, **headers)
+        assert concurrent.status_code == status.HTTP_409_CONFLICT
+        assert concurrent['Retry-After'] == '1'
+        assert not Lead.objects.filter(email='inflight@test.com').exists()
+
+        WebhookIdempotencyService.release(record)
+        assert not WebhookIdempotencyKey.objects.exists()
+
+        first = api_client.post('/api/leads/webhook/', data, **headers)
+        assert first.status_code == status.HTTP_201_CREATED
+        assert WebhookIdempotencyKey.objects.get().response_status == status.HTTP_201_CREATED
+
+    def test_validation_errors_are_stored_and_replayed(self, api_client):
+        """Test a 400 raised by the serializer is stored like any response below 500."""
+        headers = {**self.headers, 'HTTP_IDEMPOTENCY_KEY': 'delivery-4'}
+        data = {'email': 'not-an-email'}
+
+        first = api_client.post('/api/leads/webhook/', data, **headers)
+        retried = api_client.post('/api/leads/webhook/', data, **headers)
+
+        assert first.status_code == retried.status_code == status.HTTP_400_BAD_REQUEST
+        assert retried['Idempotent-Replayed'] == 'true'
+        assert retried.json() == first.json()
+
+    def test_email_filter_warm_up_builds_filter(self):
+        """Test the startup warm-up builds the pre-filter off the request path."""
+        from apps.leads.dedupe import LeadEmailFilter
+
+        LeadEmailFilter.reset()
+        LeadEmailFilter.warm_up().join()
+
+        assert LeadEmailFilter._filter is not None
+
+    def test_email_filter_skips_lookup_for_new_emails(self, lead, django_assert_num_queries):
+        """Test the pre-filter has no false negatives and avoids the dedupe query."""
+        from apps.leads.dedupe import LeadEmailFilter
+        from apps.leads.services import LeadService
+
+        LeadEmailFilter.reset()
+        assert LeadEmailFilter.might_exist(lead.email_normalized)
+
+        found, created = LeadService.create_lead_from_webhook({'email': lead.email.upper()})
+        assert (found, created) == (lead, False)
+
+        # Solo lectura del lead existente: sin INSERT ni transacción
+        with django_assert_num_queries(1):
+            LeadService.create_lead_from_webhook({'email': lead.email})
+
+        new, created = LeadService.create_lead_from_webhook({'email': 'brand-new@test.com'})
+        assert created
+        assert LeadEmailFilter.might_exist(new.email_normalized)
+
+
+@pytest.mark.django_db
+class TestLeadSearch:
+    """Tests for ?q= fuzzy search on leads."""
+
+    def test_search_matches_partial_fields_and_ranks(self, admin_client, lead):
+        """Test partial email/phone/name matches, typo tolerance and ranking."""
+        Lead.objects.create(email='maria.gonzalez@test.com', name='María González', phone='+56 9 8765 4321')
+        Lead.objects.create(email='gonzalo@test.com', name='Gonzalo Pérez')
+
+        by_phone = admin_client.get('/api/leads/?q=1234')
+        assert [item['email'] for item in by_phone.data['results']] == [lead.email]
+
+        by_name = admin_client.get('/api/leads/?q=maria gonzalez')
+        assert by_name.data['results'][0]['email'] == 'maria.gonzalez@test.com'
+
+        with_typo = admin_client.get('/api/leads/?q=gonzales')
+        emails = [item['email'] for item in with_typo.data['results']]
+        assert 'maria.gonzalez@test.com' in emails
+        assert lead.email not in emails
+
+    def test_broad_search_counts_every_match(self, admin_client):
+        """Test broad queries rank and count all matches, with the typo fallback only on empty results."""
+        Lead.objects.bulk_create([
+            Lead(email=f'cliente{i}@test.com', email_normalized=f'cliente{i}@test.com', name='Cliente')
+            for i in range(1005)
+        ])
+
+        response = admin_client.get('/api/leads/?q=cliente')
+        assert response.data['count'] == 1005
+        assert len(response.data['results']) == 20
+
+        with_typo = admin_client.get('/api/leads/?q=clientte')
+        assert with_typo.data['count'] == 1005
+
+    def test_search_respects_executive_scope(self, executive_client, lead):
+        """Test executives only find their own leads."""
+        Lead.objects.create(email='lead-other@test.com', name='Test Lead Other')
+
+        response = executive_client.get('/api/leads/?q=test lead')
+
+        assert [item['email'] for item in response.data['results']] == [lead.email]
+
+
+@pytest.mark.django_db
+class TestLeadKeysetPagination:
+    """Tests for opt-in cursor pagination on the lead list."""
+
+    def test_cursor_walks_every_lead_once_in_order(self, admin_client):
+        """Test cursor pages cover all leads, including created_at ties, without count."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        now = timezone.now()
+        leads = Lead.objects.bulk_create([
+            Lead(email=f'page{i}@test.com', email_normalized=f'page{i}@test.com')
+            for i in range(45)
+        ])
+        # Grupos de leads con el mismo created_at para probar el desempate por id
+        for i, lead in enumerate(leads):
+            Lead.objects.filter(pk=lead.pk).update(created_at=now - timedelta(minutes=i // 4))
+        expected = list(
+            Lead.objects.order_by('-created_at', '-id').values_list('email', flat=True)
+        )
+
+        seen = []
+        url = '/api/leads/?pagination=cursor'
+        while url:
+            response = admin_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            seen.extend(item['email'] for item in response.data['results'])
+            url = response.data['next']
+
+        assert seen == expected
+
+    def test_page_number_stays_default_and_bad_cursor_is_404(self, admin_client, lead):
+        """Test clients without the opt-in keep page numbers; invalid cursors are rejected."""
+        response = admin_client.get('/api/leads/')
+        assert response.data['count'] == 1
+
+        response = admin_client.get('/api/leads/?cursor=not-a-cursor')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.django_db
 class TestLeadRoundRobin:
     """Tests for round-robin lead assignment."""
@@ -235,6 +731,239 @@ class TestLeadRoundRobin:
         assert new_lead.assigned_to == exec2
 
 
+@pytest.mark.django_db
+class TestExecutiveWorkloadCounter:
+    """Tests for the maintained per-executive active-lead counter."""
+
+    def active_count(self, user):
+        return User.objects.values_list('active_leads_count', flat=True).get(pk=user.pk)
+
+    def test_counter_follows_assignment_status_and_delete(self, executive_user):
+        """Test the counter tracks reassignment, closing statuses and deletes."""
+        other = User.objects.create_user(
+            email='other-exec@test.com', password='pass123', role=User.Role.EXECUTIVE
+        )
+        lead = Lead.objects.create(email='counted@test.com', assigned_to=executive_user)
+        assert self.active_count(executive_user) == 1
+
+        lead = Lead.objects.get(pk=lead.pk)
+        lead.assigned_to = other
+        lead.save()
+        assert (self.active_count(executive_user), self.active_count(other)) == (0, 1)
+
+        lead.status = Lead.Status.NOT_INTERESTED
+        lead.save()
+        assert self.active_count(other) == 0
+
+        lead.status = Lead.Status.CONTACTED
+        lead.save()
+        Lead.objects.get(pk=lead.pk).delete()
+        assert self.active_count(other) == 0
+
+    def test_assignment_picks_least_loaded_without_aggregating(self, executive_user, django_assert_max_num_queries):
+        """Test assignment reads the counter instead of aggregating leads."""
+        from apps.leads.assignment import LeadDispatcher
+        from apps.leads.services import LeadService
+
+        busy = User.objects.create_user(
+            email='busy-exec@test.com', password='pass123', role=User.Role.EXECUTIVE
+        )
+        for i in range(3):
+            Lead.objects.create(email=f'busy{i}@test.com', assigned_to=busy)
+        lead = Lead.objects.create(email='incoming@test.com')
+
+        LeadDispatcher.assign([])
+        with django_assert_max_num_queries(5):
+            assert LeadService.assign_lead_to_executive(lead) == executive_user
+        assert self.active_count(executive_user) == 1
+
+    def test_assignment_validates_plan_against_counter(self, executive_user):
+        """Test the final pick uses the database counter, not the cached plan."""
+        from apps.leads.assignment import LeadDispatcher
+        from apps.leads.services import LeadService
+
+        other = User.objects.create_user(
+            email='other-exec@test.com', password='pass123', role=User.Role.EXECUTIVE
+        )
+        for i in range(2):
+            Lead.objects.create(email=f'other{i}@test.com', assigned_to=other)
+        LeadDispatcher.assign([])
+        # Otro proceso asignó leads al ejecutivo sin pasar por este plan
+        User.objects.filter(pk=executive_user.pk).update(active_leads_count=5)
+
+        lead = Lead.objects.create(email='incoming@test.com')
+        assert LeadService.assign_lead_to_executive(lead) == other
+
+    def test_reconcile_command_repairs_drift(self, executive_user):
+        """Test the reconcile command restores counters changed behind the ORM."""
+        from django.core.management import call_command
+
+        Lead.objects.create(email='drift@test.com', assigned_to=executive_user)
+        User.objects.filter(pk=executive_user.pk).update(active_leads_count=7)
+
+        call_command('reconcile_lead_counters', dry_run=True)
+        assert self.active_count(executive_user) == 7
+
+        call_command('reconcile_lead_counters')
+        assert self.active_count(executive_user) == 1
+
+
+@pytest.mark.django_db
+class TestLeadAssignmentStrategies:
+    """Tests for pluggable assignment strategies and the dispatch plan."""
+
+    def make_executive(self, email, **profile):
+        from apps.leads.models import ExecutiveAssignmentProfile
+
+        executive = User.objects.create_user(
+            email=email, password='pass123', role=User.Role.EXECUTIVE
+        )
+        if profile:
+            ExecutiveAssignmentProfile.objects.create(executive=executive, **profile)
+        return executive
+
+    def test_weighted_capacity_without_per_lead_queries(self, settings, django_assert_num_queries):
+        """Test weights split leads proportionally and a warm plan only reads the loads."""
+        from apps.leads.assignment import LeadDispatcher
+
+        settings.LEAD_ASSIGNMENT_STRATEGY = 'weighted'
+        heavy = self.make_executive('heavy@test.com', capacity_weight=2)
+        light = self.make_executive('light@test.com')
+        self.make_executive('paused@test.com', capacity_weight=0)
+
+        LeadDispatcher.assign([])
+        with django_assert_num_queries(1):
+            assigned = LeadDispatcher.assign([Lead(email=f'w{i}@test.com') for i in range(6)])
+
+        assert (assigned.count(heavy.id), assigned.count(light.id)) == (4, 2)
+
+    def test_routed_prefers_source_then_working_hours(self, settings):
+        """Test source affinity wins over load and off-shift reps are skipped."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.leads.models import ExecutiveAssignmentProfile
+        from apps.leads.services import LeadService
+
+        settings.LEAD_ASSIGNMENT_STRATEGY = 'routed'
+        linkedin_rep = self.make_executive('linkedin-rep@test.com', sources=['linkedin'])
+        Lead.objects.create(email='existing@test.com', assigned_to=linkedin_rep)
+        generalist = self.make_executive('generalist@test.com')
+
+        lead = Lead.objects.create(email='li@test.com', source_detail='linkedin')
+        assert LeadService.assign_lead_to_executive(lead) == linkedin_rep
+        lead = Lead.objects.create(email='fb@test.com', source_detail='facebook_ads')
+        assert LeadService.assign_lead_to_executive(lead) == generalist
+
+        # Fuera del horario del generalista: recibe quien está en turno
+        now = timezone.localtime()
+        ExecutiveAssignmentProfile.objects.create(
+            executive=generalist,
+            work_start=(now + timedelta(hours=2)).time(),
+            work_end=(now + timedelta(hours=4)).time()
+        )
+        lead = Lead.objects.create(email='late@test.com', source_detail='facebook_ads')
+        assert LeadService.assign_lead_to_executive(lead) == linkedin_rep
+
+    def test_simulation_reports_balance_and_throughput(self, executive_user, capsys):
+        """Test the simulation replays history for every strategy without writing."""
+        from django.core.management import call_command
+
+        self.make_executive('second@test.com', capacity_weight=3)
+        for i in range(8):
+            Lead.objects.create(email=f'history{i}@test.com')
+
+        call_command('simulate_lead_assignment', json=True)
+        results = {result['strategy']: result for result in json.loads(capsys.readouterr().out)}
+
+        assert set(results) == {'least_loaded', 'weighted', 'routed'}
+        assert sorted(results['least_loaded']['per_executive'].values()) == [4, 4]
+        assert sorted(results['weighted']['per_executive'].values()) == [2, 6]
+        assert results['weighted']['balance']['share_error'] == 0
+        assert results['weighted']['leads_per_second'] > 0
+        assert not Lead.objects.filter(assigned_to__isnull=False).exists()
+
+
+@pytest.mark.django_db
+class TestLeadDeduplication:
+    """Tests for the incremental duplicate-lead merge job."""
+
+    def test_merges_email_variants_and_phones_moving_related_rows(self, executive_user, reservation):
+        """Test Gmail/phone variants merge into the oldest lead with history moved over."""
+        from apps.leads.services import LeadDeduplicationService
+
+        original = Lead.objects.create(email='jane.doe@gmail.com', name='Jane Doe')
+        LeadDeduplicationService.run()
+
+        by_email = Lead.objects.create(
+            email='JaneDoe+ads@googlemail.com', name='Jane D.', phone='+56 9 1234 5678',
+            assigned_to=executive_user, status=Lead.Status.CONTACTED
+        )
+        by_phone = Lead.objects.create(email='jd@work.com', name='Jane', phone='912345678')
+        family = Lead.objects.create(email='john@work.com', name='John', phone='912345678')
+        LeadInteraction.objects.create(
+            lead=by_phone, executive=executive_user,
+            interaction_type=LeadInteraction.InteractionType.CALL, description='Llamada'
+        )
+        reservation.lead = by_email
+        reservation.save()
+
+        result = LeadDeduplicationService.run()
+
+        assert (result['checked'], result['merged']) == (3, 2)
+        assert set(Lead.objects.values_list('email', flat=True)) == {
+            'jane.doe@gmail.com', 'john@work.com'
+        }
+        original.refresh_from_db()
+        assert original.phone == '+56 9 1234 5678'
+        assert original.assigned_to == executive_user
+        assert original.status == Lead.Status.CONTACTED
+        assert original.last_interaction_at is not None
+        assert original.interactions.count() == 1
+        assert original.reservations.get() == reservation
+        assert 'jd@work.com' in original.notes
+        assert User.objects.get(pk=executive_user.pk).active_leads_count == 1
+        assert Lead.objects.get(email='john@work.com') == family
+
+    def test_merge_records_events_for_as_of_statistics(self):
+        """Test merged duplicates stop counting in the point-in-time statistics."""
+        from django.utils import timezone
+        from apps.leads.services import LeadDeduplicationService, LeadService
+        from apps.statistics.events import EventLogService
+
+        LeadService.create_lead_from_webhook({'email': 'ana.perez@gmail.com', 'name': 'Ana Perez'})
+        LeadService.create_lead_from_webhook({'email': 'anaperez+promo@gmail.com', 'name': 'Ana'})
+        LeadService.create_lead_from_webhook({'email': 'otro@test.com', 'name': 'Otro'})
+
+        assert LeadDeduplicationService.run()['merged'] == 1
+
+        counters, _, _ = EventLogService.counters_as_of(timezone.now())
+        assert counters['total_leads'] == Lead.objects.count() == 2
+        assert counters['converted_leads'] == Lead.objects.filter(status=Lead.Status.CONVERTED).count()
+
+    def test_incremental_runs_and_dry_run(self):
+        """Test later runs only check new or edited leads and dry runs roll back."""
+        from django.core.management import call_command
+        from apps.leads.services import LeadDeduplicationService
+
+        first = Lead.objects.create(email='first@test.com', phone='22 333 4444')
+        Lead.objects.create(email='second@test.com')
+        assert LeadDeduplicationService.run()['checked'] == 2
+        assert LeadDeduplicationService.run()['checked'] == 0
+
+        late = Lead.objects.create(email='other@test.com', phone='+56 2 2333 4444')
+        call_command('dedupe_leads', dry_run=True)
+        assert Lead.objects.filter(pk=late.pk, dedupe_checked_at__isnull=True).exists()
+
+        result = LeadDeduplicationService.run()
+        assert (result['checked'], result['merged']) == (1, 1)
+        assert not Lead.objects.filter(pk=late.pk).exists()
+
+        first.refresh_from_db()
+        first.phone = '999'
+        first.save(update_fields=['phone'])
+        assert Lead.objects.get(pk=first.pk).dedupe_checked_at is None
+
+
 @pytest.mark.django_db
 class TestEmailUnification:
     """Tests for email unification across reservations, webhook, and registration."""
@@ -38,6 +38,14 @@ class TestProjectList:
 
         assert response.status_code == status.HTTP_200_OK
 
+    def test_search_projects_by_title_or_location(self, api_client, project, funded_project):
+        """Test ?q= finds projects by partial title or location."""
+        response = api_client.get(f'/api/projects/?q={funded_project.title[:6].lower()}')
+        assert response.data['results'][0]['id'] == str(funded_project.id)
+
+        response = api_client.get('/api/projects/?q=santiago')
+        assert str(project.id) in [item['id'] for item in response.data['results']]
+
 
 @pytest.mark.django_db
 class TestProjectDetail:
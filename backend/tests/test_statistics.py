@@ -0,0 +1,719 @@
+"""
+Tests for statistics endpoints and precomputed counters.
+"""
+import json
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from rest_framework import status
+
+from apps.investments.models import Investment
+from apps.leads.models import Lead
+from apps.leads.services import LeadService
+from apps.statistics.events import EventLogService
+from apps.statistics.models import (
+    PlatformStatistics, DailyPlatformRollup, DailyLeadSourceRollup, StatisticsDirtyDay,
+    WeeklyLeadCohortConversion, DomainEvent, StatisticsCheckpoint,
+)
+from apps.statistics.services import StatisticsService, StatisticsRollupService
+
+
+def get_snapshot():
+    return StatisticsService.get_platform_snapshot()
+
+
+@pytest.mark.django_db
+class TestPlatformStatisticsSnapshot:
+    """Tests for the incrementally maintained platform snapshot."""
+
+    def test_snapshot_matches_live_aggregates(self, investment, lead, investor_user, funded_project):
+        """Test snapshot counters equal the live aggregates after normal writes."""
+        investment.status = Investment.Status.ACTIVE
+        investment.save()
+
+        assert get_snapshot().as_counters() == StatisticsService.compute_platform_counters()
+
+    def test_investment_activation_updates_snapshot(self, investment):
+        """Test activating and cancelling an investment moves the active counters."""
+        investment.status = Investment.Status.ACTIVE
+        investment.save()
+
+        snapshot = get_snapshot()
+        assert snapshot.active_investments_count == 1
+        assert snapshot.active_investments_amount == Decimal('5000000')
+        assert snapshot.expected_returns == investment.expected_return
+
+        investment.status = Investment.Status.CANCELLED
+        investment.save()
+
+        snapshot = get_snapshot()
+        assert snapshot.active_investments_count == 0
+        assert snapshot.active_investments_amount == Decimal('0')
+        assert snapshot.expected_returns == Decimal('0')
+
+    def test_lead_conversion_and_delete_update_snapshot(self, lead, verified_investor):
+        """Test lead counters follow conversion and deletion."""
+        assert get_snapshot().total_leads == 1
+
+        LeadService.convert_lead_to_investor(lead, verified_investor)
+        assert get_snapshot().converted_leads == 1
+
+        lead.delete()
+        snapshot = get_snapshot()
+        assert snapshot.total_leads == 0
+        assert snapshot.converted_leads == 0
+
+    def test_deferred_instance_uses_database_state(self, investor_user):
+        """Test saving an instance loaded with .only() still computes correct deltas."""
+        from apps.users.models import User
+
+        user = User.objects.only('id').get(pk=investor_user.pk)
+        user.is_kyc_verified = True
+        user.save()
+
+        assert get_snapshot().verified_investors == 1
+
+    def test_rebuild_command_repairs_drift(self, lead, investor_user):
+        """Test the rebuild command detects and fixes drifted counters."""
+        StatisticsService.fold_platform_deltas()
+        PlatformStatistics.objects.update(total_leads=42, total_investors=0)
+
+        with pytest.raises(CommandError):
+            call_command('rebuild_platform_statistics', '--check')
+        assert get_snapshot().total_leads == 42
+
+        call_command('rebuild_platform_statistics')
+
+        assert get_snapshot().as_counters() == StatisticsService.compute_platform_counters()
+
+    def test_writes_append_deltas_that_reads_fold(self, lead, monkeypatch):
+        """Test writers only insert deltas and reads fold them into the snapshot row."""
+        from apps.statistics.models import PlatformStatisticsDelta
+
+        StatisticsService.fold_platform_deltas()
+        Lead.objects.create(email='second@test.com')
+        Lead.objects.create(email='third@test.com', status=Lead.Status.CONVERTED)
+
+        row = PlatformStatistics.objects.get()
+        assert (row.total_leads, row.converted_leads) == (1, 0)
+        assert PlatformStatisticsDelta.objects.count() == 2
+        assert (get_snapshot().total_leads, get_snapshot().converted_leads) == (3, 1)
+
+        monkeypatch.setattr(StatisticsService, 'FOLD_PENDING_DELTAS', 2)
+        assert get_snapshot().total_leads == 3
+        assert PlatformStatistics.objects.get().total_leads == 3
+        assert not PlatformStatisticsDelta.objects.exists()
+
+    def test_platform_view_reads_snapshot(self, admin_client, lead, investment):
+        """Test platform endpoint serves the snapshot values."""
+        StatisticsService.fold_platform_deltas()
+        PlatformStatistics.objects.update(total_leads=7)
+
+        response = admin_client.get('/api/statistics/platform/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['leads']['total'] == 7
+        assert response.data['users']['total_investors'] == 1
+
+
+@pytest.mark.django_db
+class TestExecutiveStatistics:
+    """Tests for per-executive statistics."""
+
+    def create_executive(self, index):
+        from apps.users.models import User
+
+        executive = User.objects.create_user(
+            email=f'exec{index}@test.com',
+            password='pass123',
+            role=User.Role.EXECUTIVE,
+        )
+        Lead.objects.create(email=f'lead{index}a@test.com', assigned_to=executive)
+        Lead.objects.create(
+            email=f'lead{index}b@test.com',
+            assigned_to=executive,
+            status=Lead.Status.CONVERTED,
+        )
+        return executive
+
+    def test_executive_statistics_payload(self, executive_user, lead, investment, verified_investor):
+        """Test lead and investment figures are grouped per executive."""
+        verified_investor.assigned_executive = executive_user
+        verified_investor.save()
+        investment.status = Investment.Status.ACTIVE
+        investment.save()
+
+        stats = StatisticsService.get_executive_statistics(executive_user)
+
+        assert len(stats) == 1
+        assert stats[0]['executive_id'] == str(executive_user.id)
+        assert stats[0]['leads']['total'] == 1
+        assert stats[0]['leads']['new'] == 1
+        assert stats[0]['investments']['count'] == 1
+        assert stats[0]['investments']['total_amount'] == Decimal('5000000')
+
+    def test_executive_without_activity_has_zeroes(self, executive_user):
+        """Test executives with no leads or investments report zeroes."""
+        stats = StatisticsService.get_executive_statistics()
+
+        assert stats[0]['leads']['total'] == 0
+        assert stats[0]['leads']['conversion_rate'] == 0
+        assert stats[0]['investments']['total_amount'] == Decimal('0')
+
+    def test_executive_view_query_count_is_constant(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        """Test the executive statistics endpoint does not issue queries per executive."""
+        self.create_executive(0)
+        with django_assert_max_num_queries(3) as baseline:
+            response = admin_client.get('/api/statistics/executives/')
+        assert response.status_code == status.HTTP_200_OK
+
+        for index in range(1, 8):
+            self.create_executive(index)
+
+        with django_assert_max_num_queries(len(baseline.captured_queries)):
+            response = admin_client.get('/api/statistics/executives/')
+
+        assert len(response.data) == 8
+        assert all(row['leads']['converted'] == 1 for row in response.data)
+
+
+@pytest.mark.django_db
+class TestProjectStatistics:
+    """Tests for the per-project statistics report."""
+
+    def test_project_statistics_grouped_values(self, project, funded_project, investment, reservation):
+        """Test investments and reservations are attributed to their project."""
+        stats = {row['project_id']: row for row in StatisticsService.get_project_statistics()}
+
+        assert stats[str(project.id)]['investments']['pending_count'] == 1
+        assert stats[str(project.id)]['investments']['pending_amount'] == Decimal('5000000')
+        assert stats[str(project.id)]['reservations']['pending_count'] == 1
+        assert stats[str(funded_project.id)]['investments']['pending_count'] == 0
+        assert stats[str(funded_project.id)]['reservations']['pending_amount'] == Decimal('0')
+
+    def test_project_statistics_view_filters_and_paginates(
+        self, admin_client, project, funded_project, django_assert_max_num_queries
+    ):
+        """Test status filter and pagination on the project report."""
+        with django_assert_max_num_queries(4):
+            response = admin_client.get('/api/statistics/projects/', {'status': 'funding'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['project_id'] == str(project.id)
+
+        response = admin_client.get('/api/statistics/projects/', {'page_size': 1, 'page': 2})
+
+        assert response.data['count'] == 2
+        assert len(response.data['results']) == 1
+
+    def test_project_statistics_export(self, admin_client, project, funded_project, investment):
+        """Test the export streams one row per project with flattened figures."""
+        response = admin_client.get('/api/statistics/projects/export/', {'output': 'ndjson'})
+
+        assert response.status_code == status.HTTP_200_OK
+        rows = {
+            row['project_id']: row
+            for row in map(json.loads, b''.join(response.streaming_content).splitlines())
+        }
+        assert len(rows) == 2
+        assert rows[str(project.id)]['pending_investments_count'] == 1
+        assert rows[str(project.id)]['pending_investments_amount'] == '5000000.00'
+
+
+@pytest.mark.django_db
+class TestDailyRollups:
+    """Tests for the daily rollup tables and the timeseries endpoint."""
+
+    def test_writes_mark_dirty_days_and_job_fills_rollups(self, lead, investment):
+        """Test signals queue the affected day and the job rolls it up."""
+        today = timezone.localdate()
+        assert StatisticsDirtyDay.objects.filter(day=today).exists()
+
+        investment.status = Investment.Status.ACTIVE
+        investment.activated_at = timezone.now()
+        investment.save()
+        call_command('rollup_statistics')
+
+        assert not StatisticsDirtyDay.objects.exists()
+        platform = DailyPlatformRollup.objects.get(day=today)
+        assert platform.new_investors == 1
+        assert platform.activated_investments_count == 1
+        assert platform.activated_investments_amount == Decimal('5000000')
+        leads = DailyLeadSourceRollup.objects.get(day=today, source=lead.source)
+        assert leads.new_leads == 1
+        assert leads.conversions == 0
+
+    def test_moving_a_lead_recomputes_both_days(self, lead):
+        """Test changing a tracked timestamp re-rolls the old and the new day."""
+        call_command('rollup_statistics')
+        today = timezone.localdate()
+        assert DailyLeadSourceRollup.objects.filter(day=today).exists()
+
+        lead = Lead.objects.get(pk=lead.pk)
+        lead.created_at = lead.created_at - timedelta(days=3)
+        lead.save()
+        call_command('rollup_statistics')
+
+        assert not DailyLeadSourceRollup.objects.filter(day=today).exists()
+        assert DailyLeadSourceRollup.objects.get(
+            day=timezone.localdate(lead.created_at)
+        ).new_leads == 1
+
+    def test_timeseries_endpoint_buckets_by_week(self, admin_client, lead):
+        """Test the endpoint zero-fills empty periods and sums rollup rows."""
+        call_command('rollup_statistics')
+        today = timezone.localdate()
+        start = today - timedelta(days=20)
+
+        response = admin_client.get('/api/statistics/timeseries/', {
+            'start': start.isoformat(), 'end': today.isoformat(), 'granularity': 'week'
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert results[0]['period'] == start - timedelta(days=start.weekday())
+        assert len(results) in (3, 4)
+        assert sum(row['new_leads'] for row in results) == 1
+        assert results[-1]['new_leads_by_source'] == {lead.source: 1}
+
+    def test_timeseries_rejects_invalid_range(self, admin_client):
+        """Test an inverted date range is rejected."""
+        response = admin_client.get('/api/statistics/timeseries/', {
+            'start': '2024-02-01', 'end': '2024-01-01'
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestLeadCohorts:
+    """Tests for the weekly lead cohort matrix."""
+
+    def create_old_lead(self, weeks_ago, email='cohort@test.com'):
+        lead = Lead.objects.create(email=email, source=Lead.Source.WEBHOOK)
+        lead.created_at = timezone.now() - timedelta(weeks=weeks_ago)
+        lead.save()
+        return lead
+
+    def test_conversion_lands_in_weeks_since_creation(self, admin_client, verified_investor):
+        """Test a lead converted two weeks after creation fills offset 2 of its cohort."""
+        lead = self.create_old_lead(weeks_ago=2)
+        self.create_old_lead(weeks_ago=2, email='cohort2@test.com')
+        LeadService.convert_lead_to_investor(lead, verified_investor)
+
+        call_command('rollup_statistics')
+
+        cohort_week = StatisticsRollupService.week_start(timezone.localdate(lead.created_at))
+        row = WeeklyLeadCohortConversion.objects.get()
+        assert (row.cohort_week, row.source, row.weeks_to_convert) == (cohort_week, 'webhook', 2)
+
+        response = admin_client.get('/api/statistics/lead-cohorts/', {'source': 'webhook'})
+
+        assert response.status_code == status.HTTP_200_OK
+        cohort = next(r for r in response.data['results'] if r['cohort_week'] == cohort_week)
+        assert cohort['leads'] == 2
+        assert cohort['conversions_by_week'] == [0, 0, 1]
+        assert cohort['conversion_rate'] == 50.0
+
+    def test_reverting_conversion_recomputes_cohort(self, verified_investor):
+        """Test undoing a conversion clears the cohort cell on the next run."""
+        lead = self.create_old_lead(weeks_ago=1)
+        LeadService.convert_lead_to_investor(lead, verified_investor)
+        call_command('rollup_statistics')
+        assert WeeklyLeadCohortConversion.objects.count() == 1
+
+        lead.status = Lead.Status.CONTACTED
+        lead.save()
+        call_command('rollup_statistics')
+
+        assert not WeeklyLeadCohortConversion.objects.exists()
+
+    def test_failed_rollup_requeues_days(self, lead, monkeypatch):
+        """Test days claimed by a failing job go back to the queue."""
+        def fail(day):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(StatisticsRollupService, 'rollup_day', fail)
+
+        with pytest.raises(RuntimeError):
+            StatisticsRollupService.process_dirty_days()
+
+        assert StatisticsDirtyDay.objects.filter(day=timezone.localdate()).exists()
+
+
+@pytest.mark.django_db
+class TestStatisticsCache:
+    """Tests for the statistics cache layer."""
+
+    def test_platform_statistics_served_from_cache(self, lead, django_assert_num_queries):
+        """Test a second call does not touch the database."""
+        first = StatisticsService.get_platform_statistics()
+
+        with django_assert_num_queries(0):
+            assert StatisticsService.get_platform_statistics() == first
+
+    def test_lead_status_change_invalidates(self, lead, verified_investor):
+        """Test converting a lead refreshes platform and lead source statistics."""
+        assert StatisticsService.get_platform_statistics()['leads']['converted'] == 0
+        assert StatisticsService.get_lead_source_statistics()[0]['converted'] == 0
+
+        LeadService.convert_lead_to_investor(lead, verified_investor)
+
+        assert StatisticsService.get_platform_statistics()['leads']['converted'] == 1
+        assert StatisticsService.get_lead_source_statistics()[0]['converted'] == 1
+
+    def test_payment_approval_and_kyc_invalidate(self, investment, admin_user, investor_user):
+        """Test approving a payment and verifying KYC refresh cached figures."""
+        from apps.payments.models import PaymentProof
+        from apps.payments.services import PaymentService
+
+        stats = StatisticsService.get_platform_statistics()
+        assert stats['investments']['total_count'] == 0
+        verified = stats['users']['verified_investors']
+
+        proof = PaymentProof.objects.create(investment=investment, amount=investment.amount)
+        PaymentService.approve_payment(proof, admin_user)
+        investor_user.is_kyc_verified = True
+        investor_user.save()
+
+        stats = StatisticsService.get_platform_statistics()
+        assert stats['investments']['total_count'] == 1
+        assert stats['users']['verified_investors'] == verified + 1
+
+    def test_reservation_status_change_invalidates_projects(self, reservation, project):
+        """Test cancelling a reservation refreshes the pending amounts per project."""
+        from apps.reservations.models import Reservation
+
+        stats = StatisticsService.get_project_statistics(project)
+        assert stats[0]['reservations']['pending_count'] == 1
+
+        reservation.status = Reservation.Status.CANCELLED
+        reservation.save()
+
+        stats = StatisticsService.get_project_statistics(project)
+        assert stats[0]['reservations']['pending_count'] == 0
+        assert stats[0]['reservations']['pending_amount'] == Decimal('0')
+
+    def test_project_change_invalidates_platform_and_projects(self, project):
+        """Test a project status change refreshes platform counts and the project report."""
+        from apps.projects.models import Project
+
+        active = StatisticsService.get_platform_statistics()['projects']['active']
+        assert StatisticsService.get_project_statistics(project)[0]['status'] == project.status
+
+        project.status = Project.Status.COMPLETED
+        project.save()
+
+        stats = StatisticsService.get_platform_statistics()['projects']
+        assert stats['active'] == active - 1
+        assert stats['completed'] == 1
+        assert StatisticsService.get_project_statistics(project)[0]['status'] == Project.Status.COMPLETED
+
+    def test_lead_reassignment_invalidates_executives(self, lead, executive_user):
+        """Test reassigning a lead moves it between executives in the cached report."""
+        from apps.users.models import User
+
+        other = User.objects.create_user(
+            email='other.executive@test.com', password='testpass123', role=User.Role.EXECUTIVE
+        )
+
+        def totals():
+            return {
+                row['executive_id']: row['leads']['total']
+                for row in StatisticsService.get_executive_statistics()
+            }
+
+        assert totals() == {str(executive_user.id): 1, str(other.id): 0}
+
+        lead.assigned_to = other
+        lead.save()
+
+        assert totals() == {str(executive_user.id): 0, str(other.id): 1}
+
+    def test_unrelated_save_keeps_cache(self, lead, django_assert_num_queries):
+        """Test saving a lead without a status change keeps the cached entry."""
+        StatisticsService.get_lead_source_statistics()
+        lead.notes = 'Llamar el lunes'
+        lead.save()
+
+        with django_assert_num_queries(0):
+            StatisticsService.get_lead_source_statistics()
+
+    def test_concurrent_miss_computes_once(self):
+        """Test a caller waiting on the lock reuses the value computed by the holder."""
+        import threading
+        from django.core.cache import cache
+        from apps.statistics.cache import StatisticsCache
+
+        calls = []
+        key = f"statistics:platform:{StatisticsCache.generation('platform')}:report"
+        cache.add(f'{key}:lock', 'other-process')
+        threading.Timer(0.2, cache.set, args=(key, 'computed elsewhere')).start()
+
+        value = StatisticsCache.get_or_compute('platform', 'report', lambda: calls.append(1))
+
+        assert value == 'computed elsewhere'
+        assert calls == []
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    """Tests for the incrementally maintained executive leaderboard."""
+
+    @pytest.fixture(autouse=True)
+    def empty_leaderboard(self):
+        from apps.statistics.leaderboard import LeaderboardService
+
+        LeaderboardService.backend().clear()
+        yield
+        LeaderboardService.backend().clear()
+
+    def test_conversion_and_payment_update_scores(
+        self, lead, executive_user, verified_investor, investment, admin_user,
+        django_capture_on_commit_callbacks
+    ):
+        """Test converting a lead and approving its investor's payment score the executive."""
+        from apps.payments.models import PaymentProof
+        from apps.payments.services import PaymentService
+        from apps.statistics.leaderboard import LeaderboardService
+
+        with django_capture_on_commit_callbacks(execute=True):
+            LeadService.convert_lead_to_investor(lead, verified_investor)
+            LeadService.convert_lead_to_investor(lead, verified_investor)
+        with django_capture_on_commit_callbacks(execute=True):
+            proof = PaymentProof.objects.create(investment=investment, amount=investment.amount)
+            PaymentService.approve_payment(proof, admin_user)
+
+        executive_id = str(executive_user.id)
+        for window in LeaderboardService.WINDOWS:
+            assert LeaderboardService.top('conversions', window) == [(executive_id, 1)]
+            assert LeaderboardService.rank('investment_amount', window, executive_user.id) == (
+                1, Decimal('5000000.00')
+            )
+
+    def test_sorted_ranks_and_rebuild(self, executive_user):
+        """Test ranks follow scores and rebuild restores boards from the database."""
+        from apps.statistics.leaderboard import LeaderboardService
+
+        LeaderboardService.rebuild()
+        backend = LeaderboardService.backend()
+        key = LeaderboardService.key('conversions', 'all', 'all')
+        backend.incr(key, 'a', 3)
+        backend.incr(key, 'b', 5)
+        backend.incr(key, 'a', 4)
+        assert LeaderboardService.top('conversions', limit=2) == [('a', 7), ('b', 5)]
+        assert LeaderboardService.rank('conversions', 'all', 'b') == (2, 5)
+
+        Lead.objects.create(
+            email='won@test.com', assigned_to=executive_user,
+            status=Lead.Status.CONVERTED, converted_at=timezone.now()
+        )
+        call_command('rebuild_leaderboard')
+
+        assert LeaderboardService.top('conversions', 'week') == [(str(executive_user.id), 1)]
+        assert LeaderboardService.rank('conversions', 'all', 'a') == (None, 0)
+
+    def test_missing_boards_rebuild_on_read(self, executive_user):
+        """Test an empty process (deploy, restart) serves boards built from the database."""
+        from apps.statistics.leaderboard import LeaderboardService
+
+        Lead.objects.create(
+            email='won@test.com', assigned_to=executive_user,
+            status=Lead.Status.CONVERTED, converted_at=timezone.now()
+        )
+        LeaderboardService.backend().clear()
+
+        assert LeaderboardService.top('conversions', 'month') == [(str(executive_user.id), 1)]
+        assert LeaderboardService.rank('conversions', 'all', executive_user.id) == (1, 1)
+
+    def test_rebuild_keeps_increments_committed_while_computing(self, executive_user, monkeypatch):
+        """Test a conversion applied between computing scores and the swap is not lost."""
+        from apps.statistics.leaderboard import LeaderboardService
+
+        compute_scores = LeaderboardService.compute_scores
+        key = LeaderboardService.key('conversions', 'all', 'all')
+        executive_id = str(executive_user.id)
+
+        def racing_compute_scores(metric, start=None, end=None):
+            scores = compute_scores(metric, start, end)
+            if metric == 'conversions' and start is None and not Lead.objects.exists():
+                # La consulta ya se hizo: llega el commit de una conversión
+                Lead.objects.create(
+                    email='won@test.com', assigned_to=executive_user,
+                    status=Lead.Status.CONVERTED, converted_at=timezone.now()
+                )
+                LeaderboardService.backend().incr(key, executive_id, 1)
+            return scores
+
+        monkeypatch.setattr(LeaderboardService, 'compute_scores', racing_compute_scores)
+        LeaderboardService.rebuild()
+
+        assert LeaderboardService.top('conversions') == [(executive_id, 1)]
+
+    def test_leaderboard_view_includes_own_rank(self, executive_client, executive_user):
+        """Test executives see the board and their own position."""
+        from apps.statistics.leaderboard import LeaderboardService
+
+        LeaderboardService.rebuild()
+        LeaderboardService.backend().incr(
+            LeaderboardService.key('conversions', 'month', LeaderboardService.period('month')[0]),
+            str(executive_user.id), 2
+        )
+
+        response = executive_client.get('/api/statistics/leaderboard/', {'window': 'month'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['executive_id'] == str(executive_user.id)
+        assert response.data['results'][0]['score'] == 2
+        assert response.data['me'] == {'rank': 1, 'score': 2}
+
+
+@pytest.mark.django_db
+class TestDomainEvents:
+    """Tests for the append-only domain event log and as-of statistics."""
+
+    def test_service_transitions_record_events(
+        self, project, investment, investor_user, admin_user, executive_user
+    ):
+        """Test state transitions in the services append the matching events."""
+        from apps.kyc.models import KYCSubmission
+        from apps.kyc.services import KYCService
+        from apps.payments.models import PaymentProof
+        from apps.payments.services import PaymentService
+        from apps.reservations.services import ReservationService
+
+        reservation = ReservationService.create_reservation(
+            project, 'events@test.com', Decimal('2000000')
+        )
+        ReservationService.cancel_reservation(reservation)
+
+        proof = PaymentProof.objects.create(investment=investment, amount=investment.amount)
+        PaymentService.approve_payment(proof, admin_user)
+
+        submission = KYCSubmission.objects.create(user=investor_user)
+        KYCService.manual_approve(submission, admin_user)
+        KYCService.manual_approve(submission, admin_user)
+
+        assert list(DomainEvent.objects.values_list('event_type', flat=True)) == [
+            EventLogService.RESERVATION_CREATED,
+            EventLogService.LEAD_CREATED,
+            EventLogService.RESERVATION_CANCELLED,
+            EventLogService.INVESTMENT_ACTIVATED,
+            EventLogService.KYC_APPROVED,
+        ]
+        activated = DomainEvent.objects.get(event_type=EventLogService.INVESTMENT_ACTIVATED)
+        assert activated.aggregate_id == investment.id
+        assert Decimal(activated.payload['amount']) == investment.amount
+
+    def test_expired_reservations_are_recorded(self, reservation):
+        """Test bulk expiry records one event per expired reservation."""
+        from apps.reservations.services import ReservationService
+
+        EventLogService.record(EventLogService.RESERVATION_CREATED, reservation, {'amount': reservation.amount})
+        type(reservation).objects.filter(id=reservation.id).update(
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+
+        assert ReservationService.expire_old_reservations() == 1
+
+        counters, _, _ = EventLogService.counters_as_of(timezone.now())
+        assert counters['pending_reservations_count'] == 0
+        assert counters['pending_reservations_amount'] == Decimal('0')
+
+    def test_events_are_append_only(self, lead):
+        """Test recorded events cannot be updated or deleted."""
+        from django.db import DatabaseError, transaction
+
+        event = EventLogService.record(EventLogService.LEAD_CREATED, lead)
+
+        with pytest.raises(ValueError):
+            event.save()
+        with pytest.raises(ValueError):
+            event.delete()
+        with pytest.raises(DatabaseError), transaction.atomic():
+            DomainEvent.objects.filter(id=event.id).update(event_type='lead.converted')
+
+    def test_as_of_replays_from_nearest_checkpoint(self, lead):
+        """Test point-in-time counters combine a checkpoint with later events only."""
+        now = timezone.now()
+        for days_ago, amount in [(10, '100'), (6, '200'), (2, '300')]:
+            EventLogService.record(
+                EventLogService.RESERVATION_CREATED, lead, {'amount': Decimal(amount)},
+                now - timedelta(days=days_ago)
+            )
+        EventLogService.record(EventLogService.LEAD_CREATED, lead, occurred_at=now - timedelta(days=1))
+
+        checkpoint = EventLogService.create_checkpoint(now - timedelta(days=5))
+        assert checkpoint.events_count == 2
+
+        counters, used, replayed = EventLogService.counters_as_of(now - timedelta(days=2))
+        assert used == checkpoint
+        assert replayed == 1
+        assert counters['pending_reservations_count'] == 3
+        assert counters['pending_reservations_amount'] == Decimal('600')
+        assert counters['total_leads'] == 0
+
+        counters, used, _ = EventLogService.counters_as_of(now - timedelta(days=8))
+        assert used is None
+        assert counters['pending_reservations_amount'] == Decimal('100')
+
+        with pytest.raises(ValueError):
+            EventLogService.create_checkpoint(now)
+
+    def test_checkpoint_command_and_as_of_endpoint(self, admin_client, lead):
+        """Test the checkpoint job and the admin as-of endpoint."""
+        EventLogService.record(
+            EventLogService.LEAD_CREATED, lead, occurred_at=timezone.now() - timedelta(days=3)
+        )
+
+        call_command('create_statistics_checkpoints', interval_hours=24)
+        assert StatisticsCheckpoint.objects.count() == 3
+
+        day = timezone.localdate() - timedelta(days=1)
+        response = admin_client.get('/api/statistics/as-of/', {'date': day.isoformat()})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['statistics']['total_leads'] == 1
+        assert response.data['checkpoint'] is not None
+
+        future = admin_client.get('/api/statistics/as-of/', {'date': (day + timedelta(days=5)).isoformat()})
+        assert future.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_backfill_synthesizes_history_once(self, lead, verified_investor):
+        """Test the backfill command builds events from stored timestamps."""
+        from apps.users.models import User
+
+        Lead.objects.create(email='old@test.com')
+        LeadService.convert_lead_to_investor(lead, verified_investor)
+
+        call_command('backfill_domain_events')
+
+        counters, _, _ = EventLogService.counters_as_of(timezone.now())
+        assert counters['total_leads'] == 2
+        assert counters['converted_leads'] == 1
+        assert counters['verified_investors'] == User.objects.filter(is_kyc_verified=True).count()
+        with pytest.raises(CommandError):
+            call_command('backfill_domain_events')
+
+    def test_backfill_rebuilds_existing_checkpoints(self, lead):
+        """Test checkpoints taken before the backfill include the synthesized history."""
+        now = timezone.now()
+        EventLogService.record(EventLogService.LEAD_CREATED, lead, occurred_at=now - timedelta(days=3))
+        checkpoint = EventLogService.create_checkpoint(now - timedelta(days=1))
+        assert checkpoint.counters['total_leads'] == 1
+
+        Lead.objects.create(email='old@test.com')
+        Lead.objects.filter(email='old@test.com').update(created_at=now - timedelta(days=20))
+        call_command('backfill_domain_events')
+
+        rebuilt = StatisticsCheckpoint.objects.get()
+        assert rebuilt.as_of == checkpoint.as_of
+        counters, used, _ = EventLogService.counters_as_of(now)
+        assert used == rebuilt
+        assert counters['total_leads'] == rebuilt.counters['total_leads'] == 2
@@ -1,20 +1,98 @@
 """
 Webhook Service - Simulador de leads externos
 Este servicio es COMPLETAMENTE INDEPENDIENTE de Django/Next.js/PostgreSQL.
-Usa solo Python puro con requests.
+Usa solo Python puro con requests (y aiohttp para el modo async).
+
+Modos (SENDER_MODE):
+- simple (por defecto): un lead cada INTERVAL_SECONDS, un request a la vez.
+- async: envio de alto volumen con asyncio, un pool de conexiones
+  keep-alive, hasta CONCURRENCY requests en vuelo y TARGET_RATE leads por
+  segundo (0 = sin limite). Con TOTAL_LEADS > 0 termina tras ese total.
+  Con BATCH_SIZE > 1 los leads se acumulan y se envian en lote a BATCH_URL
+  al juntar BATCH_SIZE o cuando el mas antiguo lleva BATCH_FLUSH_SECONDS
+  esperando (BATCH_SIZE se limita a BATCH_MAX_SIZE, el maximo del
+  backend); si el backend no tiene endpoint de lotes se envian de a uno.
+- replay: reenvia un archivo NDJSON grabado con RECORD_FILE (REPLAY_FILE)
+  respetando sus tiempos a REPLAY_SPEED x (0 = lo mas rapido posible),
+  con la misma concurrencia, lotes y spool que el modo async.
+- loadtest: prueba de capacidad de LOAD_DURATION segundos hasta LOAD_RPS
+  requests/s con rampa LOAD_RAMP; al terminar imprime (y guarda en
+  LOAD_REPORT) un reporte JSON con percentiles de latencia, throughput,
+  conteo de 201/202/409/errores y los puntos de saturacion del backend.
+
+Con RECORD_FILE los modos simple y async graban cada lead generado, con su
+instante relativo al inicio, en NDJSON; con SEED la generacion es
+reproducible. Asi dos versiones del backend reciben exactamente el mismo
+trafico.
+
+En los modos simple, async y replay los leads que no llegan (API caida, timeout,
+5xx o 429) se guardan en un spool SQLite (SPOOL_PATH, ver spool.py) y un
+worker los reintenta con backoff exponencial con jitter y a lo sumo
+SPOOL_CONCURRENCY reintentos en vuelo. Con METRICS_PORT se exponen la
+profundidad y el ritmo de vaciado del spool en /metrics (formato Prometheus).
 """
 
 import os
+import json
+import math
 import time
 import random
+import asyncio
 import logging
+import threading
 import requests
+import aiohttp
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from spool import RetrySpool
 
 # Configuracion
 API_URL = os.getenv('API_URL', 'http://localhost:8000/api/leads/webhook/')
 API_KEY = os.getenv('API_KEY', 'webhook-secret-key')
 INTERVAL_SECONDS = int(os.getenv('INTERVAL_SECONDS', '30'))
+SENDER_MODE = os.getenv('SENDER_MODE', 'simple')
+STARTUP_DELAY = int(os.getenv('STARTUP_DELAY', '15'))
+REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '10'))
+
+# Modo async
+CONCURRENCY = int(os.getenv('CONCURRENCY', '50'))
+TARGET_RATE = float(os.getenv('TARGET_RATE', '100'))
+TOTAL_LEADS = int(os.getenv('TOTAL_LEADS', '0'))
+PROGRESS_SECONDS = int(os.getenv('PROGRESS_SECONDS', '10'))
+# Lotes (BATCH_SIZE 0 o 1 = un request por lead; el backend acepta hasta
+# BATCH_MAX_SIZE, su WEBHOOK_BATCH_MAX_SIZE, y rechaza el lote entero si se pasa)
+BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', '500'))
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', '0'))
+BATCH_FLUSH_SECONDS = float(os.getenv('BATCH_FLUSH_SECONDS', '1'))
+BATCH_URL = os.getenv('BATCH_URL', '') or API_URL.rstrip('/') + '/batch/'
+
+# Grabacion y replay
+RECORD_FILE = os.getenv('RECORD_FILE', '')
+REPLAY_FILE = os.getenv('REPLAY_FILE', '')
+REPLAY_SPEED = float(os.getenv('REPLAY_SPEED', '1'))
+SEED = os.getenv('SEED', '')
+
+# Modo loadtest (usa tambien CONCURRENCY)
+LOAD_RPS = float(os.getenv('LOAD_RPS', '100'))
+LOAD_DURATION = int(os.getenv('LOAD_DURATION', '60'))
+LOAD_RAMP = os.getenv('LOAD_RAMP', 'constant')
+LOAD_RAMP_SECONDS = int(os.getenv('LOAD_RAMP_SECONDS', '0')) or LOAD_DURATION
+LOAD_STEPS = int(os.getenv('LOAD_STEPS', '5'))
+LOAD_REPORT = os.getenv('LOAD_REPORT', '')
+
+# Spool de reintentos (SPOOL_PATH vacio = desactivado)
+SPOOL_PATH = os.getenv('SPOOL_PATH', 'spool.db')
+SPOOL_CONCURRENCY = int(os.getenv('SPOOL_CONCURRENCY', '4'))
+SPOOL_BASE_DELAY = float(os.getenv('SPOOL_BASE_DELAY', '1'))
+SPOOL_MAX_DELAY = float(os.getenv('SPOOL_MAX_DELAY', '300'))
+SPOOL_MAX_ATTEMPTS = int(os.getenv('SPOOL_MAX_ATTEMPTS', '12'))
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+HEADERS = {
+    'Content-Type': 'application/json',
+    'X-API-Key': API_KEY
+}
 
 # Logging
 logging.basicConfig(
@@ -48,90 +126,784 @@ SOURCES = [
 ]
 
 
-def generate_random_lead():
+# Generador de los leads y de los tiempos del modo simple (SEED lo fija en
+# main). Es propio del simulador: otros usos de `random` no alteran la secuencia
+lead_random = random.Random()
+
+
+def generate_random_lead(rng=lead_random):
     """Genera un lead aleatorio."""
-    first_name = random.choice(FIRST_NAMES)
-    last_name = random.choice(LAST_NAMES)
-    domain = random.choice(EMAIL_DOMAINS)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    domain = rng.choice(EMAIL_DOMAINS)
 
     # Generar email unico
-    email = f"{first_name.lower()}.{last_name.lower()}.{random.randint(100, 9999)}@{domain}"
+    email = f"{first_name.lower()}.{last_name.lower()}.{rng.randint(100, 9999)}@{domain}"
 
     return {
         'email': email,
         'name': f"{first_name} {last_name}",
-        'phone': f"+56 9 {random.randint(1000, 9999)} {random.randint(1000, 9999)}",
-        'source': random.choice(SOURCES),
+        'phone': f"+56 9 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}",
+        'source': rng.choice(SOURCES),
         'source_detail': f"Campaña {datetime.now().strftime('%Y%m')}",
         'notes': f"Lead generado automaticamente - {datetime.now().isoformat()}"
     }
 
 
+class LeadRecorder:
+    """
+    Graba leads en NDJSON: una primera linea {"meta": {...}} y luego una
+    linea {"t": segundos desde el inicio, "lead": {...}} por lead.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.started = time.monotonic()
+        self.count = 0
+        self.file.write(json.dumps({'meta': {
+            'mode': SENDER_MODE,
+            'seed': SEED or None,
+            'recorded_at': datetime.now().isoformat(),
+        }}) + '\n')
+
+    def write(self, lead_data):
+        entry = {'t': round(time.monotonic() - self.started, 6), 'lead': lead_data}
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.count += 1
+        # Un archivo legible aunque el proceso se detenga con Ctrl+C
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        logger.info(f"{self.count} leads grabados en {RECORD_FILE}")
+
+
+def read_recording(path):
+    """
+    Lee un archivo grabado por LeadRecorder.
+
+    Returns:
+        tuple: (meta, lista de (t, lead_data) en orden)
+    """
+    meta = {}
+    entries = []
+    with open(path, encoding='utf-8') as recording:
+        for line in recording:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if 'meta' in item:
+                meta = item['meta']
+            else:
+                entries.append((item['t'], item['lead']))
+    return meta, entries
+
+
+# Spool de reintentos del proceso (se abre en main)
+spool = None
+
+
+def is_retryable(status):
+    """True si un envio fallido con este status (None = sin respuesta) vale reintentarlo."""
+    return status is None or status == 429 or status >= 500
+
+
+def spool_failed(lead_data, error):
+    """Guarda en el spool un lead que no llego a la API."""
+    if spool is not None:
+        spool.push(lead_data, error)
+        logger.debug(f"Lead guardado en el spool: {lead_data['email']}")
+
+
 def send_lead_to_api(lead_data):
     """Envia un lead a la API de Django."""
-    headers = {
-        'Content-Type': 'application/json',
-        'X-API-Key': API_KEY
-    }
-
     try:
         response = requests.post(
             API_URL,
             json=lead_data,
-            headers=headers,
-            timeout=10
+            headers=HEADERS,
+            timeout=REQUEST_TIMEOUT
         )
 
         if response.status_code == 201:
             logger.info(f"Lead enviado exitosamente: {lead_data['email']}")
             return True
+        elif response.status_code == 202:
+            # Backend con WEBHOOK_ASYNC_INTAKE: la entrega quedo encolada
+            logger.info(f"Lead aceptado para procesar: {lead_data['email']}")
+            return True
         elif response.status_code == 409:
             logger.warning(f"Lead ya existe: {lead_data['email']}")
             return False
         else:
             logger.error(f"Error enviando lead: {response.status_code} - {response.text}")
+            if is_retryable(response.status_code):
+                spool_failed(lead_data, f"{response.status_code} - {response.text[:200]}")
             return False
 
     except requests.exceptions.ConnectionError:
         logger.error("No se pudo conectar con la API")
+        spool_failed(lead_data, 'No se pudo conectar con la API')
         return False
     except requests.exceptions.Timeout:
         logger.error("Timeout al conectar con la API")
+        spool_failed(lead_data, 'Timeout al conectar con la API')
         return False
     except Exception as e:
         logger.error(f"Error inesperado: {str(e)}")
         return False
 
 
+class SendStats:
+    """Contadores de envios para los reportes de progreso."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = {'created': 0, 'accepted': 0, 'duplicate': 0, 'error': 0}
+        self.requests = 0
+        self.last_error = None
+
+    def record(self, outcome, error=None):
+        self.counts[outcome] += 1
+        if error:
+            self.last_error = error
+
+    def summary(self):
+        total = sum(self.counts.values())
+        elapsed = time.monotonic() - self.started
+        rate = total / elapsed if elapsed else 0
+        text = (
+            f"{total} enviados en {self.requests} requests ({rate:.0f}/s): "
+            f"{self.counts['created']} creados, {self.counts['accepted']} encolados, "
+            f"{self.counts['duplicate']} duplicados, {self.counts['error']} errores"
+        )
+        if self.last_error:
+            text += f" - ultimo error: {self.last_error}"
+        return text
+
+
+async def send_lead_async(session, lead_data):
+    """
+    Envia un lead con la sesion aiohttp compartida.
+    Retorna (resultado, status HTTP o None, error) con resultado 'created',
+    'accepted' (202: el backend encolo la entrega), 'duplicate' o 'error'.
+    """
+    try:
+        async with session.post(API_URL, json=lead_data) as response:
+            body = await response.text()
+    except asyncio.TimeoutError:
+        return 'error', None, 'Timeout al conectar con la API'
+    except aiohttp.ClientError as e:
+        return 'error', None, f"No se pudo conectar con la API: {e}"
+
+    if response.status == 201:
+        logger.debug(f"Lead enviado exitosamente: {lead_data['email']}")
+        return 'created', 201, None
+    if response.status == 202:
+        logger.debug(f"Lead aceptado para procesar: {lead_data['email']}")
+        return 'accepted', 202, None
+    if response.status == 409:
+        logger.debug(f"Lead ya existe: {lead_data['email']}")
+        return 'duplicate', 409, None
+    return 'error', response.status, f"{response.status} - {body[:200]}"
+
+
+# Resultado de cada item de /batch/ -> (resultado, status equivalente del envio individual)
+BATCH_OUTCOMES = {
+    'created': ('created', 201),
+    'duplicate': ('duplicate', 409),
+    'invalid': ('error', 400),
+}
+
+
+async def send_batch_async(session, leads):
+    """
+    Envia un lote de leads a BATCH_URL.
+    Retorna (resultado, status, error) por lead, en el mismo orden, como
+    send_lead_async, o None si el backend no tiene endpoint de lotes.
+    """
+    try:
+        async with session.post(BATCH_URL, json={'leads': leads}) as response:
+            body = await response.text()
+    except asyncio.TimeoutError:
+        return [('error', None, 'Timeout al conectar con la API')] * len(leads)
+    except aiohttp.ClientError as e:
+        return [('error', None, f"No se pudo conectar con la API: {e}")] * len(leads)
+
+    if response.status in (404, 405):
+        return None
+    if response.status != 200:
+        return [('error', response.status, f"{response.status} - {body[:200]}")] * len(leads)
+
+    try:
+        items = [BATCH_OUTCOMES[item['status']] + (item,) for item in json.loads(body)['results']]
+    except (ValueError, KeyError, TypeError):
+        # Sin status (reintentable): reenviar un lead ya creado solo da 409
+        return [('error', None, f"Respuesta invalida de {BATCH_URL}: {body[:200]}")] * len(leads)
+
+    results = []
+    for outcome, status, item in items:
+        error = f"Lead invalido: {item.get('errors')}" if outcome == 'error' else None
+        results.append((outcome, status, error))
+    return results
+
+
+def record_result(stats, lead_data, outcome, status, error):
+    """Registra el resultado de un envio y manda al spool los fallos reintentables."""
+    stats.record(outcome, error)
+    if outcome == 'error' and is_retryable(status):
+        spool_failed(lead_data, error)
+
+
+class LeadBatcher:
+    """
+    Acumula leads y los envia en lote cuando se juntan BATCH_SIZE o el mas
+    antiguo lleva BATCH_FLUSH_SECONDS esperando. Cada lote en vuelo ocupa
+    un lugar del semaforo de concurrencia. Si el backend responde 404/405
+    a /batch/ se pasa a enviar de a uno (sin volver a intentar lotes).
+    """
+
+    def __init__(self, session, semaphore, stats):
+        self.session = session
+        self.semaphore = semaphore
+        self.stats = stats
+        self.buffer = []
+        self.first_at = None
+        self.filled = asyncio.Event()
+        self.batch_supported = True
+        self.tasks = set()
+
+    async def add(self, lead_data):
+        if not self.buffer:
+            self.first_at = time.monotonic()
+            self.filled.set()
+        self.buffer.append(lead_data)
+        if len(self.buffer) >= BATCH_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        """Envia lo acumulado (espera un lugar libre si hay CONCURRENCY lotes en vuelo)."""
+        if not self.buffer:
+            return
+        leads, self.buffer = self.buffer, []
+        self.filled.clear()
+        await self.semaphore.acquire()
+        task = asyncio.create_task(self.deliver(leads))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush_on_time(self):
+        """Envia el lote pendiente cuando su lead mas antiguo cumple BATCH_FLUSH_SECONDS."""
+        while True:
+            await self.filled.wait()
+            wait = self.first_at + BATCH_FLUSH_SECONDS - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif self.buffer:
+                await self.flush()
+
+    async def close(self):
+        """Envia lo pendiente y espera los lotes en vuelo."""
+        await self.flush()
+        await asyncio.gather(*self.tasks)
+
+    async def deliver(self, leads):
+        try:
+            results = None
+            if self.batch_supported:
+                results = await send_batch_async(self.session, leads)
+                self.stats.requests += 1
+                if results is None:
+                    self.batch_supported = False
+                    logger.warning(f"{BATCH_URL} no disponible, se envia de a un lead")
+            if results is None:
+                # En serie: el lote sigue ocupando un solo lugar de concurrencia
+                results = []
+                for lead_data in leads:
+                    results.append(await send_lead_async(self.session, lead_data))
+                    self.stats.requests += 1
+            for lead_data, result in zip(leads, results):
+                record_result(self.stats, lead_data, *result)
+        finally:
+            self.semaphore.release()
+
+
+def open_session(limit=CONCURRENCY):
+    """Sesion aiohttp con un pool de hasta `limit` conexiones keep-alive."""
+    return aiohttp.ClientSession(
+        headers=HEADERS,
+        connector=aiohttp.TCPConnector(limit=limit),
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    )
+
+
+async def report_progress(stats):
+    """Loguea el avance cada PROGRESS_SECONDS (los envios no se loguean uno a uno)."""
+    while True:
+        await asyncio.sleep(PROGRESS_SECONDS)
+        logger.info(stats.summary())
+
+
+async def generated_leads(recorder=None):
+    """Leads aleatorios a TARGET_RATE por segundo, TOTAL_LEADS o sin fin."""
+    interval = 1 / TARGET_RATE if TARGET_RATE > 0 else 0
+    next_at = time.monotonic()
+    sent = 0
+    while not TOTAL_LEADS or sent < TOTAL_LEADS:
+        if interval:
+            # Sin recuperar mas de un segundo de atraso de golpe
+            next_at = max(next_at + interval, time.monotonic() - 1)
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        lead_data = generate_random_lead()
+        if recorder is not None:
+            recorder.write(lead_data)
+        yield lead_data
+        sent += 1
+
+
+async def replayed_leads(entries, speed):
+    """
+    Leads grabados, cada uno en su instante original dividido por `speed`
+    (0 = sin esperas). Si el envio se atrasa (CONCURRENCY copada) los
+    siguientes salen de inmediato hasta recuperar el horario.
+    """
+    started = time.monotonic()
+    for offset, lead_data in entries:
+        if speed > 0:
+            delay = started + offset / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield lead_data
+
+
+async def run_async(leads):
+    """
+    Modos async y replay: envia los leads de `leads` (generated_leads o
+    replayed_leads, que marcan el ritmo) con a lo sumo CONCURRENCY
+    requests en vuelo sobre conexiones keep-alive.
+    Si la API responde mas lento de lo necesario para sostener la tasa, la
+    concurrencia es la que limita (no se acumulan requests sin respuesta).
+    Con BATCH_SIZE > 1 los leads se envian en lote con LeadBatcher.
+    """
+    stats = SendStats()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    pending = set()
+
+    async def deliver(session, lead_data):
+        try:
+            result = await send_lead_async(session, lead_data)
+            stats.requests += 1
+            record_result(stats, lead_data, *result)
+        finally:
+            semaphore.release()
+
+    async with open_session() as session:
+        reporter = asyncio.create_task(report_progress(stats))
+        # Los pendientes quedan en disco si el modo termina (TOTAL_LEADS)
+        spool_worker = asyncio.create_task(run_spool_worker()) if spool is not None else None
+        batcher = LeadBatcher(session, semaphore, stats) if BATCH_SIZE > 1 else None
+        flusher = asyncio.create_task(batcher.flush_on_time()) if batcher is not None else None
+        try:
+            while True:
+                if batcher is None:
+                    await semaphore.acquire()
+                lead_data = await anext(leads, None)
+                if lead_data is None:
+                    if batcher is None:
+                        semaphore.release()
+                    break
+                if batcher is not None:
+                    await batcher.add(lead_data)
+                else:
+                    task = asyncio.create_task(deliver(session, lead_data))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if batcher is not None:
+                flusher.cancel()
+                await batcher.close()
+            await asyncio.gather(*pending)
+        finally:
+            reporter.cancel()
+            if spool_worker is not None:
+                spool_worker.cancel()
+            logger.info(f"Resumen: {stats.summary()}")
+
+
+async def retry_spooled(session, entry):
+    """Reintenta un lead del spool y registra el resultado."""
+    entry_id, lead_data, attempts = entry
+    outcome, status, error = await send_lead_async(session, lead_data)
+    if outcome != 'error':
+        spool.delivered_ok(entry_id)
+    elif is_retryable(status):
+        spool.retry_later(entry_id, attempts, error)
+    else:
+        logger.error(f"Lead del spool rechazado por la API: {lead_data['email']} - {error}")
+        spool.give_up(entry_id, error)
+
+
+def log_spool_status(drain_rate):
+    pending, dead = spool.depth()
+    logger.info(
+        f"Spool: {pending} pendientes, {dead} muertos, "
+        f"{spool.delivered} entregados ({drain_rate:.1f}/s), {spool.retried} reintentos fallidos"
+    )
+
+
+async def run_spool_worker():
+    """
+    Vacia el spool: toma los leads cuyo reintento corresponde, de a
+    SPOOL_CONCURRENCY en paralelo (sin estampida sobre un backend que se
+    recupera), y cada PROGRESS_SECONDS loguea profundidad y ritmo de vaciado.
+    """
+    async with open_session(SPOOL_CONCURRENCY) as session:
+        last_report = time.monotonic()
+        delivered_before = spool.delivered
+        while True:
+            entries = spool.lease_due(SPOOL_CONCURRENCY, lease_seconds=REQUEST_TIMEOUT * 2)
+            if entries:
+                await asyncio.gather(*[retry_spooled(session, entry) for entry in entries])
+            else:
+                await asyncio.sleep(1)
+
+            elapsed = time.monotonic() - last_report
+            if elapsed >= PROGRESS_SECONDS:
+                spool.drain_rate = (spool.delivered - delivered_before) / elapsed
+                if spool.drain_rate or spool.depth() != (0, 0):
+                    log_spool_status(spool.drain_rate)
+                last_report = time.monotonic()
+                delivered_before = spool.delivered
+
+
+def serve_metrics():
+    """Expone GET /metrics del spool (formato Prometheus) en METRICS_PORT."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            pending, dead = spool.depth()
+            body = '\n'.join([
+                f'webhook_spool_depth {pending}',
+                f'webhook_spool_dead {dead}',
+                f'webhook_spool_drain_rate {spool.drain_rate:.3f}',
+                f'webhook_spool_spooled_total {spool.spooled}',
+                f'webhook_spool_delivered_total {spool.delivered}',
+                f'webhook_spool_retries_total {spool.retried}',
+                '',
+            ]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', METRICS_PORT), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Metricas del spool en :{METRICS_PORT}/metrics")
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con buckets logaritmicos: cada bucket es un 2%
+    mas ancho que el anterior, por lo que los percentiles tienen ~2% de
+    error con memoria constante sin importar la cantidad de requests.
+    """
+
+    GROWTH = 1.02
+    MIN_MS = 0.01
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds):
+        ms = max(seconds * 1000, self.MIN_MS)
+        bucket = int(math.log(ms / self.MIN_MS, self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Latencia (ms) bajo la cual queda el p% de los requests."""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return round(min(self.MIN_MS * self.GROWTH ** (bucket + 1), self.max_ms), 2)
+
+    def summary(self):
+        if not self.count:
+            return None
+        return {
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'mean': round(self.total_ms / self.count, 2),
+            'max': round(self.max_ms, 2),
+        }
+
+
+def load_rate_at(elapsed):
+    """Requests/s objetivo a los `elapsed` segundos segun LOAD_RAMP."""
+    if LOAD_RAMP == 'linear':
+        rate = LOAD_RPS * min(1, (elapsed + 1) / LOAD_RAMP_SECONDS)
+    elif LOAD_RAMP == 'step':
+        step = min(LOAD_STEPS, math.floor(elapsed / LOAD_RAMP_SECONDS * LOAD_STEPS) + 1)
+        rate = LOAD_RPS * step / LOAD_STEPS
+    else:
+        rate = LOAD_RPS
+    return max(rate, 1)
+
+
+class LoadWindow:
+    """Metricas de un segundo de la prueba."""
+
+    def __init__(self):
+        self.scheduled = 0
+        self.completed = 0
+        self.errors = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+
+
+def find_saturation(timeline):
+    """
+    Primer segundo en que el backend deja de seguir la carga, por criterio:
+    - throughput: completa menos del 90% de lo programado
+    - errors: mas del 1% de errores (o requests descartados)
+    - latency: p95 mas de 3 veces el p95 de los primeros segundos
+    Se ignoran segundos con menos de 10 requests.
+    """
+    windows = [window for window in timeline if window['target_rps'] >= 10]
+    baseline = sorted(window['p95_ms'] for window in windows[:3] if window['p95_ms'])
+    baseline_p95 = baseline[len(baseline) // 2] if baseline else None
+
+    saturation = {}
+    for window in windows:
+        failures = window['errors'] + window['dropped']
+        checks = {
+            'throughput': window['achieved_rps'] < 0.9 * window['target_rps'],
+            'errors': failures > 0.01 * window['target_rps'],
+            'latency': bool(
+                baseline_p95 and window['p95_ms'] and window['p95_ms'] > 3 * baseline_p95
+            ),
+        }
+        for reason, saturated in checks.items():
+            if saturated and reason not in saturation:
+                saturation[reason] = {
+                    'second': window['second'],
+                    'target_rps': window['target_rps'],
+                    'achieved_rps': window['achieved_rps'],
+                    'p95_ms': window['p95_ms'],
+                }
+    return saturation
+
+
+async def run_loadtest():
+    """
+    Modo loadtest: carga abierta (los envios se programan segun la rampa
+    aunque el backend tarde en responder), con a lo sumo CONCURRENCY
+    requests en vuelo; los que esperan turno cuentan su espera en la
+    latencia, que se mide desde el instante programado y no desde el envio
+    (asi un backend lento no esconde su propia demora). Si la cola supera
+    10 x CONCURRENCY el request se descarta y cuenta como saturacion.
+
+    Returns:
+        dict: Reporte de la prueba
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    max_queue = CONCURRENCY * 10
+    latency = LatencyHistogram()
+    service_latency = LatencyHistogram()
+    statuses = {}
+    timeline = {}
+    pending = set()
+    started = time.monotonic()
+
+    def window(at):
+        return timeline.setdefault(int(at - started), LoadWindow())
+
+    async def deliver(session, scheduled_at):
+        async with semaphore:
+            sent_at = time.monotonic()
+            outcome, status, _ = await send_lead_async(session, generate_random_lead())
+        done_at = time.monotonic()
+        # 201 creado, 202 encolado (WEBHOOK_ASYNC_INTAKE) y 409 duplicado no son errores
+        key = 'error' if outcome == 'error' else str(status)
+        statuses[key] = statuses.get(key, 0) + 1
+        latency.record(done_at - scheduled_at)
+        service_latency.record(done_at - sent_at)
+        completed = window(done_at)
+        completed.completed += 1
+        completed.errors += key == 'error'
+        window(scheduled_at).latency.record(done_at - scheduled_at)
+
+    async with open_session() as session:
+        next_at = started
+        while next_at - started < LOAD_DURATION:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scheduled = window(next_at)
+            scheduled.scheduled += 1
+            if len(pending) >= max_queue:
+                scheduled.dropped += 1
+                statuses['dropped'] = statuses.get('dropped', 0) + 1
+            else:
+                task = asyncio.create_task(deliver(session, next_at))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            next_at += 1 / load_rate_at(next_at - started)
+        await asyncio.gather(*pending)
+
+    elapsed = time.monotonic() - started
+    report_timeline = [
+        {
+            'second': second,
+            'target_rps': timeline[second].scheduled,
+            'achieved_rps': timeline[second].completed,
+            'p95_ms': timeline[second].latency.percentile(95),
+            'errors': timeline[second].errors,
+            'dropped': timeline[second].dropped,
+        }
+        for second in sorted(timeline)
+    ]
+
+    requests_sent = sum(statuses.values())
+    return {
+        'config': {
+            'url': API_URL,
+            'rps': LOAD_RPS,
+            'duration': LOAD_DURATION,
+            'ramp': LOAD_RAMP,
+            'ramp_seconds': LOAD_RAMP_SECONDS,
+            'concurrency': CONCURRENCY,
+        },
+        'requests': requests_sent,
+        'elapsed_seconds': round(elapsed, 2),
+        'throughput_rps': round(latency.count / elapsed, 1) if elapsed else None,
+        'status': statuses,
+        'latency_ms': latency.summary(),
+        'service_latency_ms': service_latency.summary(),
+        'saturation': find_saturation(report_timeline),
+        'timeline': report_timeline,
+    }
+
+
 def main():
     """Loop principal del servicio."""
     logger.info("=" * 50)
     logger.info("Webhook Service iniciado")
     logger.info(f"API URL: {API_URL}")
-    logger.info(f"Intervalo: {INTERVAL_SECONDS} segundos")
+    logger.info(f"Modo: {SENDER_MODE}")
+    if SENDER_MODE == 'replay':
+        logger.info(f"Replay de {REPLAY_FILE} a {REPLAY_SPEED or 'maxima'} x, concurrencia {CONCURRENCY}")
+    elif SENDER_MODE == 'async':
+        logger.info(f"Concurrencia: {CONCURRENCY}, tasa objetivo: {TARGET_RATE or 'sin limite'} leads/s")
+    elif SENDER_MODE == 'loadtest':
+        logger.info(
+            f"Carga: {LOAD_RPS} req/s por {LOAD_DURATION} s, rampa {LOAD_RAMP}, "
+            f"concurrencia {CONCURRENCY}"
+        )
+    else:
+        logger.info(f"Intervalo: {INTERVAL_SECONDS} segundos")
     logger.info("=" * 50)
 
+    if SEED:
+        lead_random.seed(SEED)
+
+    global BATCH_SIZE
+    if BATCH_SIZE > BATCH_MAX_SIZE:
+        logger.warning(f"BATCH_SIZE {BATCH_SIZE} supera el maximo del backend, se usa {BATCH_MAX_SIZE}")
+        BATCH_SIZE = BATCH_MAX_SIZE
+
+    global spool
+    if SPOOL_PATH and SENDER_MODE != 'loadtest':
+        spool = RetrySpool(SPOOL_PATH, SPOOL_BASE_DELAY, SPOOL_MAX_DELAY, SPOOL_MAX_ATTEMPTS)
+        pending, dead = spool.depth()
+        logger.info(f"Spool de reintentos: {SPOOL_PATH} ({pending} pendientes, {dead} muertos)")
+        if METRICS_PORT:
+            serve_metrics()
+
     # Esperar a que la API este lista
     logger.info("Esperando a que la API este disponible...")
-    time.sleep(15)
+    time.sleep(STARTUP_DELAY)
+
+    if SENDER_MODE == 'replay':
+        meta, entries = read_recording(REPLAY_FILE)
+        logger.info(
+            f"{len(entries)} leads grabados el {meta.get('recorded_at')} "
+            f"(modo {meta.get('mode')}, seed {meta.get('seed')})"
+        )
+        try:
+            asyncio.run(run_async(replayed_leads(entries, REPLAY_SPEED)))
+        except KeyboardInterrupt:
+            logger.info("Servicio detenido por el usuario")
+        return
+
+    recorder = LeadRecorder(RECORD_FILE) if RECORD_FILE and SENDER_MODE != 'loadtest' else None
+
+    if SENDER_MODE == 'async':
+        try:
+            asyncio.run(run_async(generated_leads(recorder)))
+        except KeyboardInterrupt:
+            logger.info("Servicio detenido por el usuario")
+        finally:
+            if recorder is not None:
+                recorder.close()
+        return
+
+    if SENDER_MODE == 'loadtest':
+        report = asyncio.run(run_loadtest())
+        logger.info(
+            f"Prueba terminada: {report['requests']} requests, {report['throughput_rps']} req/s, "
+            f"latencia {report['latency_ms']}, saturacion {report['saturation'] or 'no detectada'}"
+        )
+        output = json.dumps(report, indent=2)
+        if LOAD_REPORT:
+            with open(LOAD_REPORT, 'w') as report_file:
+                report_file.write(output)
+            logger.info(f"Reporte guardado en {LOAD_REPORT}")
+        print(output)
+        return
+
+    if spool is not None:
+        threading.Thread(target=lambda: asyncio.run(run_spool_worker()), daemon=True).start()
 
     while True:
         try:
             # Decidir si enviar un lead (70% probabilidad)
-            if random.random() < 0.7:
+            if lead_random.random() < 0.7:
                 lead = generate_random_lead()
                 logger.info(f"Generando lead: {lead['email']}")
+                if recorder is not None:
+                    recorder.write(lead)
                 send_lead_to_api(lead)
             else:
                 logger.info("Saltando este ciclo (sin lead)")
 
             # Esperar intervalo con variacion aleatoria
-            wait_time = INTERVAL_SECONDS + random.randint(-5, 10)
+            wait_time = INTERVAL_SECONDS + lead_random.randint(-5, 10)
             logger.info(f"Esperando {wait_time} segundos...")
             time.sleep(wait_time)
 
         except KeyboardInterrupt:
             logger.info("Servicio detenido por el usuario")
+            if recorder is not None:
+                recorder.close()
             break
         except Exception as e:
             logger.error(f"Error en el loop principal: {str(e)}")
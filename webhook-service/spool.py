@@ -0,0 +1,137 @@
+"""
+Spool de reintentos en disco (SQLite) para leads cuyo envio fallo.
+
+Cuando la API no responde, responde 5xx o 429, el lead se guarda aqui en vez
+de perderse. Un worker lo reintenta con backoff exponencial con jitter:
+el intento n espera entre la mitad y el total de
+min(max_delay, base_delay * 2^(n-1)) segundos, para que los reintentos de
+muchos leads no lleguen todos juntos a un backend que se esta recuperando.
+
+Al tomar un lead para reintentarlo se le asigna un "lease" (se posterga su
+proximo intento): si el proceso muere en medio del envio, el lead vuelve a
+estar disponible al vencer el lease. Tras max_attempts intentos el lead
+queda marcado como muerto (dead = 1) para revision manual.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+
+
+class RetrySpool:
+    """Cola persistente de leads por reintentar."""
+
+    def __init__(self, path, base_delay=1.0, max_delay=300.0, max_attempts=12):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Generador propio para el jitter: no consume el de la generacion de
+        # leads (SEED), que debe dar la misma secuencia aunque haya fallos
+        self.random = random.SystemRandom()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS spool ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' payload TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' next_attempt_at REAL NOT NULL,'
+            ' last_error TEXT,'
+            ' dead INTEGER NOT NULL DEFAULT 0,'
+            ' created_at REAL NOT NULL)'
+        )
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS spool_due_idx ON spool (dead, next_attempt_at)'
+        )
+
+        # Contadores desde el inicio del proceso (para logs y /metrics)
+        self.spooled = 0
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+        # Entregados por segundo en el ultimo intervalo (lo actualiza el worker)
+        self.drain_rate = 0.0
+
+    def backoff(self, attempts):
+        """Segundos hasta el proximo intento tras `attempts` intentos fallidos."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay / 2 + self.random.uniform(0, delay / 2)
+
+    def push(self, lead_data, error=None):
+        """Guarda un lead cuyo primer envio fallo."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO spool (payload, attempts, next_attempt_at, last_error, created_at) '
+                'VALUES (?, 1, ?, ?, ?)',
+                (json.dumps(lead_data), now + self.backoff(1), error, now)
+            )
+            self.spooled += 1
+
+    def lease_due(self, limit, lease_seconds):
+        """
+        Toma hasta `limit` leads cuyo reintento ya corresponde y posterga
+        su proximo intento `lease_seconds`.
+
+        Returns:
+            list: (id, lead_data, attempts)
+        """
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, payload, attempts FROM spool '
+                'WHERE dead = 0 AND next_attempt_at <= ? '
+                'ORDER BY next_attempt_at LIMIT ?',
+                (now, limit)
+            ).fetchall()
+            if rows:
+                self.conn.executemany(
+                    'UPDATE spool SET next_attempt_at = ? WHERE id = ?',
+                    [(now + lease_seconds, row[0]) for row in rows]
+                )
+        return [(row_id, json.loads(payload), attempts) for row_id, payload, attempts in rows]
+
+    def delivered_ok(self, entry_id):
+        """El reintento llego a la API (creado o ya existente)."""
+        with self.lock:
+            self.conn.execute('DELETE FROM spool WHERE id = ?', (entry_id,))
+            self.delivered += 1
+
+    def retry_later(self, entry_id, attempts, error):
+        """
+        Registra un reintento fallido (`attempts` son los intentos previos)
+        y programa el siguiente, o marca el lead como muerto si se agotaron.
+        """
+        attempts += 1
+        with self.lock:
+            if attempts >= self.max_attempts:
+                self.conn.execute(
+                    'UPDATE spool SET dead = 1, attempts = ?, last_error = ? WHERE id = ?',
+                    (attempts, error, entry_id)
+                )
+                self.dead += 1
+                return
+            self.conn.execute(
+                'UPDATE spool SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?',
+                (attempts, time.time() + self.backoff(attempts), error, entry_id)
+            )
+            self.retried += 1
+
+    def give_up(self, entry_id, error):
+        """Marca como muerto un lead que la API rechazo (no reintentable)."""
+        with self.lock:
+            self.conn.execute(
+                'UPDATE spool SET dead = 1, last_error = ? WHERE id = ?', (error, entry_id)
+            )
+            self.dead += 1
+
+    def depth(self):
+        """(pendientes, muertos) en el spool."""
+        with self.lock:
+            pending, dead = self.conn.execute(
+                'SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead = 1), 0) FROM spool'
+            ).fetchone()
+        return pending, dead